@@ -0,0 +1,46 @@
+"""
+Performance measurements for Ophis.
+
+Each ``bench_*`` module can be run on its own, from the project root:
+
+    python -m benchmarks.bench_memory
+
+``benchmarks.suite`` times the tonus hot paths, and fails when one
+is slower than its stored baseline (``baselines.json``):
+
+    python -m benchmarks.suite
+    invoke benchmark
+    tox -e benchmarks
+"""
+
+import time
+
+
+def rate(func, items):
+    """Return the items per second of func(items)."""
+    start = time.perf_counter()
+    func(items)
+    return len(items) / (time.perf_counter() - start)
+
+
+def cold_warm(streams, run, clear):
+    """Return (kind, cold items/s, warm items/s) for each (kind, items) of streams.
+
+    run(kind, items) processes items. clear() empties the caches
+    before the cold run; the warm run follows it, with the caches full.
+    """
+    results = []
+    for kind, items in streams:
+        clear()
+        cold = rate(lambda items: run(kind, items), items)
+        warm = rate(lambda items: run(kind, items), items)
+        results.append((kind, cold, warm))
+    return results
+
+
+def report(columns, results, legacy):
+    """Print cold_warm results under three column titles, then a (label, rate) for comparison."""
+    print("%-16s %14s %14s" % columns)
+    for kind, cold, warm in results:
+        print("%-16s %14.0f %14.0f" % (kind, cold, warm))
+    print("%-16s %14.0f" % legacy)
@@ -0,0 +1,69 @@
+"""
+Chords identified per second by ophis.chorda.
+
+A stream of simultaneities (spelled chords, voiced chords with a
+bass, and unspelled pitch classes) is labelled with identify_many,
+once with an empty memo (cold) and once more (warm). For comparison,
+part of the stream is also labelled the old way: a loop over every
+root and quality, comparing spelled chromae.
+
+    python -m benchmarks.bench_chords
+"""
+
+import random
+
+import ophis
+from benchmarks import cold_warm, rate, report
+from ophis.chorda import chord
+
+
+def stream(size=100000, seed=0):
+    """Return (kind, simultaneities) pairs, each with size simultaneities."""
+    rng = random.Random(seed)
+    roots = sorted(ophis.western_chroma_set, key=lambda x: x.index)
+    spelled = []
+    while len(spelled) < 512:
+        root = rng.choice(roots)
+        members = rng.choice(ophis.qualities).on(root)
+        if members is not None:
+            spelled.append(list(members))
+    voiced = [[ophis.Pitch(x, rng.randrange(-2, 2)) for x in members] for members in spelled]
+    pcs = [[int(x) for x in members] for members in spelled]
+    return [
+        ("spelled", [rng.choice(spelled) for _ in range(size)]),
+        ("voiced", [rng.choice(voiced) for _ in range(size)]),
+        ("pitch classes", [rng.choice(pcs) for _ in range(size)]),
+    ]
+
+
+def label(kind, simultaneities):
+    return sum(1 for _ in chord.identify_many(simultaneities))
+
+
+def measure(size=100000):
+    """Return (kind, cold chords/s, warm chords/s) for each stream."""
+    return cold_warm(stream(size), label, chord._memo.clear)
+
+
+def legacy_identify(members):
+    members = set(members)
+    for root in members:
+        for quality in ophis.qualities:
+            spelled = quality.on(root)
+            if spelled is not None and set(spelled) == members:
+                return root, quality
+    return None
+
+
+def legacy_rate(size=2000):
+    """Chords per second with nested loops over roots and qualities."""
+    simultaneities = stream(size)[0][1]
+    return rate(lambda s: [legacy_identify(x) for x in s], simultaneities)
+
+
+def main():
+    report(("stream", "cold chords/s", "warm chords/s"), measure(), ("nested loops", legacy_rate()))
+
+
+if __name__ == '__main__':
+    main()
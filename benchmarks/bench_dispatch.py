@@ -0,0 +1,78 @@
+"""
+Per-call dispatch overhead of the methods behind ``Pitch + x`` and ``Chroma(x)``.
+
+The dispatch overhead is measured on the same registered types
+with no-op implementations, so that it is not lost in the noise
+of the arithmetic itself: once through oph_utils.method_dispatch,
+which caches the implementation for each argument type, and once
+through the previous wrapper, which asked singledispatch on every
+call. The full cost of each call is shown for scale.
+
+    python -m benchmarks.bench_dispatch
+"""
+
+import timeit
+from functools import singledispatch, update_wrapper
+
+import ophis
+from ophis import oph_utils
+
+
+def legacy_method_dispatch(func):
+    """method_dispatch as it was before implementations were cached."""
+    dispatcher = singledispatch(func)
+    def wrapper(*args, **kw):
+        return dispatcher.dispatch(args[1].__class__)(*args, **kw)
+    wrapper.register = dispatcher.register
+    update_wrapper(wrapper, func)
+    return wrapper
+
+
+def _noop(self, other):
+    return self
+
+
+def rebuild(method, decorator):
+    """Register no-op implementations for every type method dispatches on."""
+    wrapper = decorator(_noop)
+    for cls in method.registry:
+        if cls is not object:
+            wrapper.register(cls, _noop)
+    return wrapper
+
+
+def operations():
+    pitch = ophis.Pitch(ophis.C, 0)
+    return [
+        ("Pitch + int", ophis.Pitch.augmented, pitch, 7),
+        ("Pitch + Interval", ophis.Pitch.augmented, pitch, ophis.M3),
+        ("Chroma(int)", ophis.Chroma.__call__, ophis.C, 4),
+    ]
+
+
+def per_call(func, args, number):
+    return min(timeit.repeat(lambda: func(*args), number=number, repeat=7)) / number
+
+
+def measure(number=20000):
+    """Return (operation, full call, legacy overhead, cached overhead) for each operation, in seconds."""
+    results = []
+    for name, method, obj, arg in operations():
+        args = (obj, arg)
+        direct = per_call(_noop, args, number)
+        before = per_call(rebuild(method, legacy_method_dispatch), args, number) - direct
+        after = per_call(rebuild(method, oph_utils.method_dispatch), args, number) - direct
+        full = per_call(method, args, number)
+        results.append((name, full, before, after))
+    return results
+
+
+def main():
+    print("%-18s %10s %10s %10s %8s" % ("operation", "full call", "legacy", "cached", "saved"))
+    for name, full, before, after in measure():
+        print("%-18s %8.0fns %8.0fns %8.0fns %7.0f%%" % (
+            name, full * 1e9, before * 1e9, after * 1e9, 100.0 * (before - after) / before))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Memory used per object by the core tonus classes.
+
+Each class is compared with a __dict__-backed object holding
+the same attributes, which is how instances were stored before
+they moved to __slots__.
+
+    python -m benchmarks.bench_memory
+"""
+
+import sys
+
+import ophis
+
+
+class _DictBacked():
+    def __init__(self, attrs):
+        for key, value in attrs.items():
+            setattr(self, key, value)
+
+
+def object_size(obj):
+    """Return the bytes used by obj itself, including its __dict__."""
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size = size + sys.getsizeof(obj.__dict__)
+    return size
+
+
+def slot_values(obj):
+    values = {}
+    for cls in type(obj).__mro__:
+        for name in getattr(cls, "__slots__", ()):
+            if name != "__weakref__" and hasattr(obj, name):
+                values[name] = getattr(obj, name)
+    return values
+
+
+def samples():
+    return [
+        ("Chroma", ophis.CSHARP),
+        ("Quality", ophis.MAJOR),
+        ("Interval", ophis.M3),
+        ("Pitch", ophis.Pitch(ophis.C, 4)),
+        ("QualifiedInterval", ophis.QualifiedInterval(ophis.M3, 1)),
+    ]
+
+
+def measure():
+    """Return (name, bytes with __dict__, bytes with __slots__) for each class."""
+    results = []
+    for name, obj in samples():
+        before = object_size(_DictBacked(slot_values(obj)))
+        after = object_size(obj)
+        results.append((name, before, after))
+    return results
+
+
+def main():
+    print("%-18s %10s %10s %8s" % ("class", "__dict__", "__slots__", "saved"))
+    for name, before, after in measure():
+        print("%-18s %9dB %9dB %7.0f%%" % (name, before, after, 100.0 * (before - after) / before))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Tokens parsed per second by ophis.parse.
+
+A corpus of pitch, chroma and interval tokens is parsed with
+parse_many, once with empty memos (cold) and once more (warm).
+For comparison, the chroma tokens are also read the old way,
+with getattr on the ophis module.
+
+    python -m benchmarks.bench_parse
+"""
+
+import itertools
+import random
+
+import ophis
+from benchmarks import cold_warm, rate, report
+from ophis import parse
+
+
+def corpus(size=200000, seed=0):
+    """Return (kind, tokens) pairs, each with size tokens."""
+    rng = random.Random(seed)
+    chromae = sorted(ophis.western_chroma_set, key=lambda x: x.index)
+    intervals = sorted(ophis.Interval.instances, key=lambda x: x.index)
+    pitches = [rng.choice(chromae).ascii + str(rng.randrange(-3, 5)) for _ in range(size)]
+    names = [rng.choice(chromae).name for _ in range(size)]
+    interval_names = [rng.choice(intervals).name + rng.choice(["", "^1", "^2"]) for _ in range(size)]
+    words = [str(rng.choice(intervals)).lower() for _ in range(size)]
+    mixed = list(itertools.chain(pitches[:size // 2], interval_names[:size // 2]))
+    rng.shuffle(mixed)
+    return [
+        ("pitch", pitches),
+        ("chroma", names),
+        ("interval", interval_names),
+        ("interval words", words),
+        ("mixed", mixed),
+    ]
+
+
+def run(kind, tokens):
+    parser_kind = kind.split()[0] if kind != "mixed" else None
+    return sum(1 for _ in parse.parse_many(tokens, parser_kind))
+
+
+def clear():
+    parse._pitch_memo.clear()
+    parse._interval_memo.clear()
+    parse._any_memo.clear()
+
+
+def measure(size=200000):
+    """Return (corpus, cold tokens/s, warm tokens/s) for each corpus."""
+    return cold_warm(corpus(size), run, clear)
+
+
+def legacy_chroma_rate(size=200000):
+    """Tokens per second reading chroma names with getattr."""
+    tokens = corpus(size)[1][1]
+    return rate(lambda tokens: [getattr(ophis, x) for x in tokens], tokens)
+
+
+def main():
+    report(("tokens", "cold tok/s", "warm tok/s"), measure(), ("getattr chroma", legacy_chroma_rate()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Pickled size and round-trip time of a list of 100,000 pitches.
+
+Pitches pickle as (Pitch, (chroma, octave)), and each Chroma as the
+name of its module constant, so repeated chromae and pitches are
+written once and referred to by the pickle memo afterwards.
+For scale, the same pitches are also pickled as packed integer
+codes (Pitch.code).
+
+    python -m benchmarks.bench_pickle
+"""
+
+import pickle
+import random
+import time
+
+import ophis
+
+
+def pitches(size=100000, seed=0):
+    rng = random.Random(seed)
+    chromae = sorted(ophis.western_chroma_set, key=lambda x: x.index)
+    return [ophis.Pitch(rng.choice(chromae), rng.randrange(-3, 5)) for _ in range(size)]
+
+
+def round_trip(obj, protocol):
+    """Return (bytes, seconds to dump, seconds to load)."""
+    start = time.perf_counter()
+    data = pickle.dumps(obj, protocol)
+    dumped = time.perf_counter()
+    pickle.loads(data)
+    loaded = time.perf_counter()
+    return len(data), dumped - start, loaded - dumped
+
+
+def measure(size=100000):
+    """Return (what, protocol, bytes, dump seconds, load seconds) for each case."""
+    sample = pitches(size)
+    codes = [x.code for x in sample]
+    results = []
+    for protocol in (2, pickle.HIGHEST_PROTOCOL):
+        for name, obj in (("Pitch list", sample), ("Pitch.code list", codes)):
+            results.append((name, protocol) + round_trip(obj, protocol))
+    return results
+
+
+def main():
+    print("%-16s %8s %12s %10s %10s" % ("pickled", "protocol", "size", "dump", "load"))
+    for name, protocol, size, dump, load in measure():
+        print("%-16s %8d %11.0fK %8.1fms %8.1fms" % (name, protocol, size / 1024, dump * 1e3, load * 1e3))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Pitches processed per second, and peak memory, by ophis.stream pipelines.
+
+The same chain of operations (transpose, transpose back down,
+invert, clamp into a register) is applied to a melody two ways:
+eagerly, building a list per step (with Pitch arithmetic where it
+can), and lazily, with a fused ophis.stream Pipeline. Peak memory is traced with tracemalloc.
+
+    python -m benchmarks.bench_stream
+"""
+
+import random
+import time
+import tracemalloc
+
+import ophis
+from ophis import stream
+
+
+def melody(size, seed=0):
+    """Yield size random pitches, lazily."""
+    rng = random.Random(seed)
+    chromae = [ophis.C, ophis.D, ophis.E, ophis.F, ophis.G, ophis.A, ophis.B, ophis.FSHARP, ophis.BFLAT]
+    for _ in range(size):
+        yield ophis.Pitch(rng.choice(chromae), rng.randrange(-2, 2))
+
+
+def eager(pitches):
+    pitches = list(pitches)
+    pitches = [x + ophis.M3 for x in pitches]
+    pitches = [x - ophis.M2 for x in pitches]
+    pitches = list(stream.invert_around(ophis.C(0))(pitches))
+    pitches = list(stream.fold_octaves()(pitches))
+    return sum(1 for _ in pitches)
+
+
+def lazy(pitches):
+    pipeline = (stream.transpose(ophis.M3) | stream.transpose(ophis.M2, down=True)
+                | stream.invert_around(ophis.C(0)) | stream.fold_octaves())
+    return sum(1 for _ in pipeline(pitches))
+
+
+def measure(size=200000):
+    """Return (way, pitches/s, peak bytes) for the eager and lazy ways."""
+    results = []
+    for name, func in (("eager", eager), ("pipeline", lazy)):
+        tracemalloc.start()
+        start = time.perf_counter()
+        func(melody(size))
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        results.append((name, size / elapsed, peak))
+    return results
+
+
+def main():
+    print("%-10s %14s %14s" % ("way", "pitches/s", "peak KiB"))
+    for name, rate, peak in measure():
+        print("%-10s %14.0f %14.0f" % (name, rate, peak / 1024))
+
+
+if __name__ == '__main__':
+    main()
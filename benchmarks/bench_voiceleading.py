@@ -0,0 +1,62 @@
+"""
+Voice-leading distances computed per second by ophis.chorda.voiceleading.
+
+One source chord is compared with a stream of target chords (three to
+six pitch classes) with voice_leading_distances, once with an empty
+cache (cold) and once more (warm). For comparison, part of the stream
+is also compared the old way: trying every permutation of the voices.
+
+    python -m benchmarks.bench_voiceleading
+"""
+
+import itertools
+import random
+
+import ophis
+from benchmarks import cold_warm, rate, report
+from ophis.chorda import voiceleading
+
+
+def stream(size=200000, seed=0):
+    """Return (kind, targets) pairs, each with size targets."""
+    rng = random.Random(seed)
+    chords = [rng.sample(range(12), rng.randrange(3, 7)) for _ in range(size)]
+    return [
+        ("pitch classes", chords),
+        ("masks", [sum(1 << x for x in chord) for chord in chords]),
+    ]
+
+
+def measure(size=200000, source=(ophis.C, ophis.E, ophis.G, ophis.BFLAT)):
+    """Return (kind, cold comparisons/s, warm comparisons/s) for each stream."""
+    run = lambda kind, targets: voiceleading.voice_leading_distances(source, targets)
+    return cold_warm(stream(size), run, voiceleading._cache.clear)
+
+
+def legacy_distance(source, target):
+    source = sorted(set(int(x) % 12 for x in source))
+    target = sorted(set(int(x) % 12 for x in target))
+    if len(source) < len(target):
+        source, target = target, source
+    best = None
+    for voices in itertools.permutations(source):
+        # each target note gets one voice; the rest double their nearest
+        total = sum(voiceleading._pc_distance(s, t) for s, t in zip(voices, target))
+        total += sum(min(voiceleading._pc_distance(s, t) for t in target) for s in voices[len(target):])
+        if best is None or total < best:
+            best = total
+    return best
+
+
+def legacy_rate(size=2000, source=(ophis.C, ophis.E, ophis.G, ophis.BFLAT)):
+    """Comparisons per second trying every permutation."""
+    targets = stream(size)[0][1]
+    return rate(lambda targets: [legacy_distance(source, x) for x in targets], targets)
+
+
+def main():
+    report(("targets", "cold /s", "warm /s"), measure(), ("permutations", legacy_rate()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,274 @@
+"""
+Regression benchmarks for the tonus hot paths, against stored baselines.
+
+Each case times one operation, either on a single value (scalar) or
+over a list of 1000 values (batch), and reports the best time per
+operation, in nanoseconds. Import time is measured in a fresh
+interpreter.
+
+Timings are compared with the baselines stored in baselines.json.
+Machines differ in speed, so every timing is first divided by a
+calibration loop of plain Python, timed in the same run, and only
+these relative timings are compared. Import time is mostly spent
+reading files, not running Python code, so it is compared as it is.
+
+A case regresses when it is slower than its baseline by more than
+the threshold (25% unless given). Timings are noisy, so a case
+which seems to regress is measured again, up to ``--retries`` times,
+and keeps its best result; if it still regresses, the suite exits
+with status 1.
+
+baselines.json also keeps a reference import time, measured before
+the tonus tables and the modules built on them were added, so that
+the growth of import time is not hidden by newer baselines.
+
+    python -m benchmarks.suite                  compare with the baselines
+    python -m benchmarks.suite --save           store new baselines
+    python -m benchmarks.suite --threshold 0.1  fail beyond 10%
+    python -m benchmarks.suite Pitch            run only the cases matching "Pitch"
+    python -m benchmarks.suite --retries 0      fail on the first measurement
+
+The threshold can also be set with the OPHIS_BENCH_THRESHOLD
+environment variable.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import timeit
+
+import ophis
+
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+THRESHOLD = 0.25
+RETRIES = 2
+BATCH = 1000
+
+# compared without calibration
+UNCALIBRATED = ("import ophis",)
+
+
+def _calibration():
+    total = 0
+    for i in range(BATCH):
+        total += i * 3 % 7
+    return total
+
+
+def cases():
+    """Return (name, function, operations per call) for each case."""
+    rng = random.Random(0)
+    chromae = sorted(ophis.western_chroma_set, key=lambda x: x.index)
+    naturals = [ophis.C, ophis.D, ophis.E, ophis.F, ophis.G, ophis.A, ophis.B]
+    intervals = [ophis.m2, ophis.M2, ophis.m3, ophis.M3, ophis.P4, ophis.P5, ophis.m6, ophis.M6]
+    steps = [rng.randrange(1, 12) for _ in range(BATCH)]
+    chroma_batch = [rng.choice(naturals) for _ in range(BATCH)]
+    pairs = [(rng.choice(chromae), rng.choice(chromae)) for _ in range(BATCH)]
+    interval_batch = [rng.choice(intervals) for _ in range(BATCH)]
+    pitch_batch = [ophis.Pitch(rng.choice(naturals), rng.randrange(-3, 4)) for _ in range(BATCH)]
+    half_steps = [rng.randrange(0, 12) for _ in range(BATCH)]
+    qualities = [(ophis.MAJOR, 3), (ophis.MINOR, 6), (ophis.PERFECT, 5), (ophis.AUGMENTED, 4)]
+    quality_batch = [rng.choice(qualities) for _ in range(BATCH)]
+    # enharmonic sets, as ChromaSet.enharmonic_reduce takes
+    sets = [ophis.ChromaSet(ophis.western_chroma_set.chroma_by_value(rng.randrange(12)))
+            for _ in range(BATCH // 10)]
+    get_interval = ophis.Interval.get_interval
+    middle_c = ophis.Pitch(ophis.C, 0)
+
+    def enharmonic_reduce_batch():
+        for chroma_set in sets:
+            chroma_set.enharmonic_reduce("sharp")
+
+    return [
+        ("calibration", _calibration, BATCH),
+        ("Chroma.augment(int)", lambda: ophis.C.augment(4), 1),
+        ("Chroma.augment(int) batch", lambda: [x.augment(n) for x, n in zip(chroma_batch, steps)], BATCH),
+        ("Chroma.augment(Interval)", lambda: ophis.D.augment(ophis.M3), 1),
+        ("Chroma.augment(Interval) batch",
+         lambda: [x.augment(i) for x, i in zip(chroma_batch, interval_batch)], BATCH),
+        ("Chroma.__sub__", lambda: ophis.E - ophis.C, 1),
+        ("Chroma.__sub__ batch", lambda: [a - b for a, b in pairs], BATCH),
+        ("Interval.get_interval(half_steps)", lambda: get_interval(half_steps=4), 1),
+        ("Interval.get_interval(half_steps) batch", lambda: [get_interval(half_steps=n) for n in half_steps], BATCH),
+        ("Interval.get_interval(quality, number)", lambda: get_interval(ophis.MAJOR, 3), 1),
+        ("Interval.get_interval(quality, number) batch",
+         lambda: [get_interval(q, n) for q, n in quality_batch], BATCH),
+        ("Pitch.augmented(int)", lambda: middle_c.augmented(7), 1),
+        ("Pitch.augmented(int) batch", lambda: [p.augmented(n) for p, n in zip(pitch_batch, steps)], BATCH),
+        ("Pitch.augmented(Interval)", lambda: middle_c.augmented(ophis.M3), 1),
+        ("Pitch.augmented(Interval) batch",
+         lambda: [p.augmented(i) for p, i in zip(pitch_batch, interval_batch)], BATCH),
+        ("Pitch + int", lambda: middle_c + 7, 1),
+        ("Pitch + int batch", lambda: [p + n for p, n in zip(pitch_batch, steps)], BATCH),
+        ("Pitch + Interval", lambda: middle_c + ophis.M3, 1),
+        ("Pitch + Interval batch", lambda: [p + i for p, i in zip(pitch_batch, interval_batch)], BATCH),
+        ("ChromaSet.enharmonic_reduce", lambda: sets[0].enharmonic_reduce("sharp"), 1),
+        ("ChromaSet.enharmonic_reduce batch", enharmonic_reduce_batch, len(sets)),
+    ]
+
+
+def _timer(function, seconds):
+    """Return a Timer of function, and the number of calls timing about seconds."""
+    timer = timeit.Timer(function)
+    number, elapsed = timer.autorange()
+    return timer, max(1, int(number * seconds / max(elapsed, 1e-9)))
+
+
+def time_cases(cases, rounds=30, seconds=0.004):
+    """Return the best time of one operation of each case, in nanoseconds.
+
+    The cases are timed in turn, round after round, so that each
+    one gets its share of the moments the machine is least busy.
+    """
+    timers = [(name, _timer(function, seconds), operations) for name, function, operations in cases]
+    best = {}
+    for _ in range(rounds):
+        for name, (timer, number), operations in timers:
+            elapsed = timer.timeit(number) / number / operations * 1e9
+            best[name] = min(elapsed, best.get(name, elapsed))
+    return best
+
+
+def import_time(repeat=10, root=None):
+    """Return the best time of ``import ophis`` in a fresh interpreter, less its startup, in nanoseconds.
+
+    root is the directory ophis is imported from; by default, the one
+    of this ophis. Give another checkout to measure an older version.
+    """
+    if root is None:
+        root = os.path.dirname(os.path.dirname(ophis.__file__))
+
+    def best(code):
+        times = []
+        for _ in range(repeat):
+            output = subprocess.check_output([
+                sys.executable, "-W", "ignore", "-c",
+                "import time; start = time.perf_counter(); " + code +
+                "; print(time.perf_counter() - start)",
+            ], cwd=root)
+            times.append(float(output))
+        return min(times)
+    return (best("import ophis") - best("pass")) * 1e9
+
+
+def measure(only=()):
+    """Return {case: nanoseconds per operation}; the calibration is always measured."""
+    selected = [case for case in cases()
+                if case[0] == "calibration" or not only or any(x in case[0] for x in only)]
+    results = time_cases(selected)
+    if not only or any(x in "import ophis" for x in only):
+        results["import ophis"] = import_time()
+    return results
+
+
+def compare(results, baselines, threshold=THRESHOLD):
+    """Return (case, baseline ns, current ns, change, regressed) for each case in both.
+
+    change is the relative change of the timing, calibrated but for
+    UNCALIBRATED cases: 0.3 is 30% slower than the baseline.
+    """
+    scale = baselines["calibration"] / results["calibration"]
+    rows = []
+    for name, current in results.items():
+        if name == "calibration" or name not in baselines:
+            continue
+        baseline = baselines[name]
+        change = current * (1 if name in UNCALIBRATED else scale) / baseline - 1
+        rows.append((name, baseline, current, change, change > threshold))
+    return rows
+
+
+def confirm(rows, baselines, threshold=THRESHOLD, retries=RETRIES):
+    """Measure the regressed cases of rows again, up to retries times, keeping each case's best row."""
+    rows = list(rows)
+    for _ in range(retries):
+        regressed = [row[0] for row in rows if row[4]]
+        if not regressed:
+            break
+        again = {row[0]: row for row in compare(measure(regressed), baselines, threshold)}
+        rows = [again[row[0]] if row[0] in again and again[row[0]][3] < row[3] else row
+                for row in rows]
+    return rows
+
+
+def _load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def load_baselines(path=BASELINES):
+    return _load(path)["results"]
+
+
+def load_reference(path=BASELINES):
+    """Return the reference {case: nanoseconds}, measured before the tonus tables; empty if none."""
+    return _load(path).get("reference", {})
+
+
+def save_baselines(results, path=BASELINES, reference=None):
+    """Store results as the baselines. The reference already stored is kept, unless another is given."""
+    if reference is None and os.path.exists(path):
+        reference = _load(path).get("reference")
+    data = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": {name: round(value, 2) for name, value in sorted(results.items())},
+    }
+    if reference:
+        data["reference"] = reference
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+def get_parser():
+    parser = argparse.ArgumentParser("benchmarks.suite")
+    parser.add_argument("only", nargs="*", help="run only the cases whose names contain one of these")
+    parser.add_argument("--save", action="store_true", help="store the timings as the new baselines")
+    parser.add_argument("--baselines", default=BASELINES, help="baselines file (default: %(default)s)")
+    parser.add_argument("--threshold", type=float,
+                        default=float(os.environ.get("OPHIS_BENCH_THRESHOLD", THRESHOLD)),
+                        help="relative slowdown which fails (default: %(default)s)")
+    parser.add_argument("--retries", type=int, default=RETRIES,
+                        help="measurements again of a case which regressed (default: %(default)s)")
+    return parser
+
+
+def main(args=None):
+    args = get_parser().parse_args(args)
+    results = measure(args.only)
+    if args.save:
+        if args.only and os.path.exists(args.baselines):
+            results = dict(load_baselines(args.baselines), **results)
+        save_baselines(results, args.baselines)
+        for name, value in sorted(results.items()):
+            print("%-45s %12.1fns" % (name, value))
+        print("Saved baselines to " + args.baselines)
+        return 0
+
+    baselines = load_baselines(args.baselines)
+    rows = confirm(compare(results, baselines, args.threshold), baselines, args.threshold, args.retries)
+    print("%-45s %12s %12s %8s" % ("case", "baseline", "current", "change"))
+    for name, baseline, current, change, regressed in rows:
+        print("%-45s %10.1fns %10.1fns %+7.0f%%%s" % (
+            name, baseline, current, change * 100, "  REGRESSED" if regressed else ""))
+    reference = load_reference(args.baselines)
+    if "import ophis" in reference and "import ophis" in results:
+        print("import ophis: %.1fms, %.1f times the %.1fms it took before the tonus tables." % (
+            results["import ophis"] / 1e6, results["import ophis"] / reference["import ophis"],
+            reference["import ophis"] / 1e6))
+    regressions = [row[0] for row in rows if row[4]]
+    if regressions:
+        print("%d of %d cases regressed by more than %.0f%%." % (len(regressions), len(rows), args.threshold * 100))
+        return 1
+    print("No case regressed by more than %.0f%%." % (args.threshold * 100))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,3 +3,12 @@ from .tonus import *
 from .tonus.chroma import *
 from .tonus.interval import *
 from .tonus.pitch import *
+from .tonus.pcset import *
+from .tonus.spelling import *
+from .tonus.ranges import *
+from .tonus.tuning import *
+from .melodia.scale import *
+from .chorda.chord import *
+from .chorda.voiceleading import *
+from . import parse
+from . import stream
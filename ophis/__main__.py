@@ -1,4 +1,8 @@
 import argparse
+import csv
+import json
+import sys
+
 import ophis
 from ophis import __version__
 
@@ -10,8 +14,65 @@ def get_parser():
     parser = argparse.ArgumentParser('Ophis')
     version = '%(prog)s ' + __version__
     parser.add_argument('--version', '-v', action='version', version=version)
+
+    subparsers = parser.add_subparsers(dest='command')
+
+    analyze = subparsers.add_parser(
+        'analyze',
+        help='Count pitches, chromae and intervals in note files.',
+        description='Count pitches, chromae and intervals in note files, '
+                    'in parallel, and write the merged histograms.',
+    )
+    analyze.add_argument('paths', nargs='+',
+                         help='note files, or directories to search for them')
+    analyze.add_argument('--workers', '-w', type=int, default=None,
+                         help='number of worker processes (default: number of CPUs)')
+    analyze.add_argument('--chunk-size', '-c', type=int, default=None,
+                         help='files sent to a worker at a time')
+    analyze.add_argument('--format', '-f', choices=('json', 'csv'), default='json',
+                         help='output format (default: json)')
+    analyze.add_argument('--output', '-o', default='-',
+                         help='output file (default: standard output)')
     return parser
 
+
+def write_histograms(histograms, output, format='json'):
+    """Write Histograms to an open file, as JSON or CSV."""
+    if format == 'json':
+        json.dump(histograms.as_dict(), output, indent=2, sort_keys=False)
+        output.write('\n')
+    else:
+        writer = csv.writer(output)
+        writer.writerow(['histogram', 'key', 'count'])
+        writer.writerow(['totals', 'files', histograms.files])
+        writer.writerow(['totals', 'notes', histograms.notes])
+        writer.writerow(['totals', 'unparsed', histograms.unparsed])
+        writer.writerow(['totals', 'skipped', len(histograms.skipped)])
+        writer.writerows(histograms.rows())
+
+
+def analyze(args):
+    """
+    Write the histograms of the note files in args.paths.
+
+    Returns 1 if a file had to be skipped, after naming it on standard error.
+    """
+    from ophis.armonica import corpus
+    histograms = corpus.analyze_corpus(args.paths, workers=args.workers, chunk_size=args.chunk_size)
+    if args.output == '-':
+        write_histograms(histograms, sys.stdout, args.format)
+    else:
+        try:
+            with open(args.output, 'w', newline='') as output:
+                write_histograms(histograms, output, args.format)
+        except OSError as error:
+            print('Ophis: cannot write ' + args.output + ': ' + (error.strerror or str(error)), file=sys.stderr)
+            return 1
+    for path, reason in histograms.skipped.items():
+        print('Ophis: skipped ' + path + ': ' + reason, file=sys.stderr)
+    return 1 if histograms.skipped else 0
+
+
 def main(args=None):
     """
     Main entry point for your project.
@@ -20,14 +81,18 @@ def main(args=None):
         args : list
             A of arguments as if they were input in the command line. Leave it
             None to use sys.argv.
+
+    Returns the exit status.
     """
 
     parser = get_parser()
     args = parser.parse_args(args)
 
-    # Put your main script logic here
-    print('No action defined for ophis module!')
+    if args.command == 'analyze':
+        return analyze(args)
+    parser.print_help()
+    return 0
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    sys.exit(main())
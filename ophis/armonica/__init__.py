@@ -0,0 +1,5 @@
+"""
+Analysis of pieces and corpora, built on the tonus classes.
+"""
+
+from . import corpus
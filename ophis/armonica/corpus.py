@@ -0,0 +1,172 @@
+"""Pitch and interval histograms over corpora of note files.
+
+A note file is either
+
+    - a text file of pitch tokens separated by white space
+      (``C#4 E4 G#4``, anything ``ophis.parse.parse_pitch`` reads), or
+    - a binary pitch file (``.oph``, see ``ophis.tonus.pitchfile``),
+      which needs NumPy.
+
+For each file, three histograms are counted:
+
+    pitches: each pitch, by repr (``CSHARP(4)``)
+    chromae: each chroma, by name (``CSHARP``)
+    intervals: the ascending interval class from each note to the next,
+        by Interval name (``M3``)
+
+A file which cannot be read, or is not a note file, is skipped
+and listed with the reason, rather than stopping the analysis.
+
+``analyze_corpus`` spreads the files over a pool of processes, and
+merges their histograms. Workers send back one Histograms per file:
+a few counts and Counters keyed by short strings, which pickle small,
+so little time is spent moving results between processes.
+"""
+
+import collections
+import concurrent.futures
+import os
+
+from ophis import parse
+from ophis.tonus.chroma import western_chroma_set
+from ophis.tonus.pitch import Pitch
+
+__all__ = ["Histograms", "note_files", "analyze_file", "analyze_corpus"]
+
+
+NOTE_FILE_SUFFIXES = (".txt", ".notes", ".oph")
+
+HISTOGRAMS = ("pitches", "chromae", "intervals")
+
+_chromae = western_chroma_set.chromae_by_index()
+
+
+class Histograms():
+    """Counts of pitches, chromae and intervals, with the number of files and notes.
+
+    skipped maps the path of each file which could not be read to the reason.
+    """
+
+    def __init__(self):
+        self.files = 0
+        self.notes = 0
+        self.unparsed = 0
+        self.skipped = {}
+        self.pitches = collections.Counter()
+        self.chromae = collections.Counter()
+        self.intervals = collections.Counter()
+
+    def update(self, other):
+        """Add the counts of other to these."""
+        self.files += other.files
+        self.notes += other.notes
+        self.unparsed += other.unparsed
+        self.skipped.update(other.skipped)
+        for name in HISTOGRAMS:
+            getattr(self, name).update(getattr(other, name))
+        return self
+
+    def count(self, pitches):
+        """Count a sequence of Pitch, as one file."""
+        pitches = list(pitches)
+        self.files += 1
+        self.notes += len(pitches)
+        # Count integers, and name each distinct one once.
+        indexes = [x.chroma.index for x in pitches]
+        for code, n in collections.Counter(x.code for x in pitches).items():
+            pitch = Pitch.from_code(code)
+            self.pitches[repr(pitch)] += n
+            self.chromae[pitch.chroma.name] += n
+        for (lower, upper), n in collections.Counter(zip(indexes, indexes[1:])).items():
+            self.intervals[(_chromae[upper] - _chromae[lower]).name] += n
+        return self
+
+    def as_dict(self):
+        result = {"files": self.files, "notes": self.notes, "unparsed": self.unparsed,
+                  "skipped": dict(self.skipped)}
+        for name in HISTOGRAMS:
+            result[name] = dict(getattr(self, name).most_common())
+        return result
+
+    def rows(self):
+        """Yield (histogram, key, count) rows, most common first."""
+        for name in HISTOGRAMS:
+            for key, count in getattr(self, name).most_common():
+                yield name, key, count
+
+
+def note_files(paths, suffixes=NOTE_FILE_SUFFIXES):
+    """Yield the note files among paths, walking directories in sorted order.
+
+    Files named directly are always included;
+    files found in directories only if they end with one of suffixes.
+    """
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.endswith(tuple(suffixes)):
+                    yield os.path.join(root, name)
+
+
+def _read_pitches(path, histograms):
+    if path.endswith(".oph"):
+        from ophis.tonus.pitchfile import PitchFile
+        with PitchFile(path) as pitch_file:
+            return pitch_file.pitches.to_pitches()
+    pitches = []
+    parse_pitch = parse.parse_pitch
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            for token in line.split():
+                try:
+                    pitches.append(parse_pitch(token))
+                except ValueError:
+                    histograms.unparsed += 1
+    return pitches
+
+
+def analyze_file(path):
+    """Return the Histograms of one note file.
+
+    If the file cannot be read, the Histograms count nothing,
+    and list the file as skipped.
+    """
+    histograms = Histograms()
+    try:
+        pitches = _read_pitches(path, histograms)
+    except (OSError, ValueError) as error:
+        # A text file which is not UTF-8 raises UnicodeDecodeError,
+        # and a broken pitch file ValueError: neither is a bad token.
+        histograms = Histograms()
+        histograms.skipped[path] = getattr(error, "strerror", None) or str(error)
+        return histograms
+    return histograms.count(pitches)
+
+
+def analyze_corpus(paths, workers=None, chunk_size=None):
+    """Return the merged Histograms of every note file in paths.
+
+    Args:
+        paths: files and directories.
+        workers (int): number of processes. Defaults to the number of CPUs;
+            1 analyzes every file in this process.
+        chunk_size (int): files sent to a worker at a time. Defaults to
+            an even split into four chunks per worker.
+    """
+    files = list(note_files(paths))
+    workers = workers or os.cpu_count() or 1
+    total = Histograms()
+    if workers == 1 or len(files) <= 1:
+        for path in files:
+            total.update(analyze_file(path))
+        return total
+    if chunk_size is None:
+        chunk_size = max(1, len(files) // (workers * 4))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        for histograms in executor.map(analyze_file, files, chunksize=chunk_size):
+            total.update(histograms)
+    return total
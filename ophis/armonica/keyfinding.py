@@ -0,0 +1,284 @@
+"""Key finding, over whole pieces or as notes stream in.
+
+The key of a passage is estimated from its pitch-class histogram:
+how much of each of the 12 pitch classes it holds. The histogram
+is correlated with a profile of each of the 24 major and minor
+keys (by default the Krumhansl-Kessler profiles), and the best
+correlated key wins.
+
+    >>> find_key(PitchArray.from_pitches([C(0), E(0), G(0), F(0), D(0), B(-1), C(0)]))
+    Key(C, 'major')
+
+A KeyFinder tracks the local key of a performance. It keeps the
+histogram of the last ``window`` notes, or of every note with
+weights decaying by ``decay`` per note, and updates it in constant
+time per note. Estimating the key is one product of the 24x12
+profile matrix with the histogram.
+
+    >>> melody = [C(0), E(0), G(0), C(1), D(0), FSHARP(0), A(0), D(1)]
+    >>> finder = KeyFinder(window=4)
+    >>> for key in finder.stream(melody):
+    ...     print(key)
+    Key(C, 'major')
+    Key(C, 'major')
+    Key(C, 'major')
+    Key(C, 'major')
+    Key(C, 'major')
+    Key(G, 'major')
+    Key(D, 'major')
+    Key(D, 'major')
+
+``find_keys`` gives the same estimates for every note of a PitchArray
+at once, with NumPy.
+
+Keys are spelled with the fewest accidentals in their signature
+(sharps, where there are as many either way): DFLAT major, FSHARP major,
+DSHARP minor.
+
+NumPy is an optional dependency of Ophis, and is needed by this module.
+"""
+
+import collections
+import math
+
+import numpy as np
+
+from ophis.melodia.scale import Key
+from ophis.tonus import chroma as ch
+
+__all__ = ["KeyFinder", "find_key", "find_keys", "keys", "profiles", "profile_matrix"]
+
+
+_essential_set = ch.western_chroma_set
+_modulo = _essential_set.modulo_base
+
+# major and minor key profiles, from the tonic up, by half steps
+profiles = {
+    "krumhansl": (
+        (6.35, 2.23, 3.48, 2.33, 4.38, 4.09, 2.52, 5.19, 2.39, 3.66, 2.29, 2.88),
+        (6.33, 2.68, 3.52, 5.38, 2.60, 3.53, 2.54, 4.75, 3.98, 2.69, 3.34, 3.17),
+    ),
+    "temperley": (
+        (5.0, 2.0, 3.5, 2.0, 4.5, 4.0, 2.0, 4.5, 2.0, 3.5, 1.5, 4.0),
+        (5.0, 2.0, 3.5, 4.5, 2.0, 4.0, 2.0, 4.5, 3.5, 2.0, 1.5, 4.0),
+    ),
+}
+
+
+def _key_on(pc, mode):
+    candidates = []
+    for tonic in _essential_set.chroma_by_value(pc):
+        try:
+            key = Key(tonic, mode)
+        except ValueError:
+            continue
+        candidates.append((abs(key.signature), -key.signature, key))
+    return min(candidates, key=lambda x: x[:2])[2]
+
+
+# The 24 keys, in the rows of a profile matrix:
+# the major keys by pitch class of the tonic, then the minor keys.
+keys = tuple(_key_on(pc, mode) for mode in ("major", "minor") for pc in range(_modulo))
+
+# renormalize a decayed histogram when its scale passes this
+_rescale_limit = 1e150
+
+
+def profile_matrix(major, minor):
+    """Return the 24x12 matrix of standardized key profiles.
+
+    Each row has zero mean and unit norm, so the product of the
+    matrix with a centered, unit-norm histogram is the Pearson
+    correlation of the histogram with each key's profile. Since the
+    rows have zero mean, the histogram need not be centered.
+    """
+    rows = []
+    for profile in (major, minor):
+        profile = np.asarray(profile, dtype=float)
+        for pc in range(_modulo):
+            rows.append(np.roll(profile, pc))
+    matrix = np.array(rows)
+    matrix -= matrix.mean(axis=1, keepdims=True)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix
+
+
+_matrices = {}
+
+
+def _profile_matrix(name):
+    try:
+        return _matrices[name]
+    except KeyError:
+        pass
+    try:
+        major, minor = profiles[name]
+    except KeyError:
+        raise ValueError("Unknown key profiles: " + repr(name) + ".") from None
+    matrix = _matrices[name] = profile_matrix(major, minor)
+    return matrix
+
+
+def _correlations(matrix, histograms):
+    """Return the correlation of each histogram (rows) with each key (columns).
+
+    Histograms with every bin equal have no correlation: NaN.
+    """
+    centered = histograms - histograms.mean(axis=-1, keepdims=True)
+    norms = np.linalg.norm(centered, axis=-1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (histograms @ matrix.T) / norms
+
+
+def _best(correlations):
+    """Return the index of the best correlated key, or -1 where none is."""
+    best = np.argmax(np.nan_to_num(correlations, nan=-np.inf), axis=-1)
+    return np.where(np.isnan(correlations[..., 0]), -1, best)
+
+
+class KeyFinder():
+    """
+    A key estimate, updated note by note.
+
+    Args:
+        window (int): estimate from the last window notes only.
+        decay (float): or weight each earlier note by decay (0 < decay <= 1)
+            per later note. By default, every note counts equally.
+        profiles (str): a key of ``profiles``. Defaults to "krumhansl".
+
+    Attributes:
+        matrix (numpy.ndarray): the 24x12 profile matrix; rows follow ``keys``.
+    """
+
+    def __init__(self, window=None, decay=None, profiles="krumhansl"):
+        if window is not None and decay is not None:
+            raise ValueError("Give a window or a decay, not both.")
+        if window is not None and window < 1:
+            raise ValueError("window must be at least 1.")
+        if decay is not None and not 0 < decay <= 1:
+            raise ValueError("decay must be greater than 0, and at most 1.")
+        self.window = window
+        self.decay = decay
+        self.matrix = _profile_matrix(profiles)
+        self.reset()
+
+    def reset(self):
+        """Forget every note."""
+        # A decayed histogram is kept multiplied by _scale, which grows
+        # by 1/decay per note; every later weight is multiplied by it too.
+        self._histogram = [0.0] * _modulo
+        self._scale = 1.0
+        self._notes = collections.deque()
+        self.count = 0
+
+    def add(self, note, weight=1.0):
+        """Add a Pitch, Chroma or pitch class (an integer), with a weight (its duration, say)."""
+        pc = int(note) % _modulo
+        histogram = self._histogram
+        if self.decay is not None:
+            self._scale /= self.decay
+            if self._scale > _rescale_limit:
+                self._histogram = histogram = [x / self._scale for x in histogram]
+                self._scale = 1.0
+            histogram[pc] += weight * self._scale
+        else:
+            histogram[pc] += weight
+            if self.window is not None:
+                notes = self._notes
+                notes.append((pc, weight))
+                if len(notes) > self.window:
+                    old_pc, old_weight = notes.popleft()
+                    histogram[old_pc] -= old_weight
+        self.count += 1
+
+    @property
+    def histogram(self):
+        """The current pitch-class histogram, as a NumPy array."""
+        return np.array(self._histogram) / self._scale
+
+    def correlations(self):
+        """Return the correlation of the histogram with each of ``keys``."""
+        return _correlations(self.matrix, np.array(self._histogram))
+
+    def key(self):
+        """Return the best correlated Key, or None before the histogram has a shape."""
+        histogram = self._histogram
+        if max(histogram) == min(histogram):
+            return None
+        # correlations, without their positive normalization
+        return keys[int(np.argmax(self.matrix @ np.array(histogram)))]
+
+    def stream(self, notes):
+        """Add each note of an iterable, yielding the key estimate after each."""
+        for note in notes:
+            self.add(note)
+            yield self.key()
+
+
+def _pitch_classes(pitches):
+    semitones = getattr(pitches, "semitones", None)
+    if semitones is None:
+        semitones = np.fromiter((int(x) for x in pitches), dtype=np.int64)
+    return np.asarray(semitones) % _modulo
+
+
+def find_key(pitches, profiles="krumhansl"):
+    """Return the Key of a whole PitchArray (or iterable of Pitch), or None."""
+    histogram = np.bincount(_pitch_classes(pitches), minlength=_modulo).astype(float)
+    best = _best(_correlations(_profile_matrix(profiles), histogram))
+    return None if best < 0 else keys[best]
+
+
+def _running(onehot, decay, carry):
+    """Return the histogram after each row of onehot, following the histogram carry."""
+    if decay is None:
+        return np.cumsum(onehot, axis=0) + carry
+    # h[i] = decay**i * (decay * carry + sum(x[j] * decay**-j, j <= i))
+    powers = decay ** np.arange(len(onehot), dtype=float)
+    return (np.cumsum(onehot / powers[:, None], axis=0) + decay * carry) * powers[:, None]
+
+
+def _windowed(eye, pcs, start, stop, window):
+    """Return the histogram of the last window notes after each note from start to stop."""
+    low = max(0, start - window + 1)
+    sums = np.zeros((stop - low + 1, _modulo))
+    np.cumsum(eye[pcs[low:stop]], axis=0, out=sums[1:])
+    ends = np.arange(start, stop)
+    begins = np.maximum(ends - window + 1, low)
+    return sums[ends + 1 - low] - sums[begins - low]
+
+
+def find_keys(pitches, window=None, decay=None, profiles="krumhansl", return_type="key", chunk_size=1 << 16):
+    """Return the key estimate after each note of a PitchArray.
+
+    The estimates are those a KeyFinder with the same arguments
+    streams for the same notes.
+
+    Args:
+        return_type (str): "key" for a list of Key (None where there is no
+            estimate), or "index" for a NumPy array of indexes into ``keys``
+            (-1 where there is no estimate).
+        chunk_size (int): notes processed at a time, bounding memory use.
+    """
+    if return_type not in ("key", "index"):
+        raise ValueError("return_type must be 'key' or 'index'.")
+    KeyFinder(window, decay)    # checks the arguments
+    matrix = _profile_matrix(profiles)
+    pcs = _pitch_classes(pitches)
+    if decay is not None and decay < 1:
+        # decay**-chunk_size must stay finite
+        chunk_size = max(1, min(chunk_size, int(600 / -math.log(decay))))
+    indexes = np.empty(len(pcs), dtype=np.intp)
+    eye = np.eye(_modulo)
+    carry = np.zeros(_modulo)
+    for start in range(0, len(pcs), chunk_size):
+        stop = min(start + chunk_size, len(pcs))
+        if window is None:
+            histograms = _running(eye[pcs[start:stop]], decay, carry)
+            carry = histograms[-1]
+        else:
+            histograms = _windowed(eye, pcs, start, stop, window)
+        indexes[start:stop] = _best(_correlations(matrix, histograms))
+    if return_type == "index":
+        return indexes
+    return [None if i < 0 else keys[i] for i in indexes.tolist()]
@@ -0,0 +1,6 @@
+"""
+Chords, built on the tonus classes.
+"""
+
+from . import chord
+from . import voiceleading
@@ -0,0 +1,261 @@
+"""Chord recognition.
+
+    >>> identify({C, E, G, B})
+    Chord(C, 'major seventh')
+    >>> str(identify([FSHARP, A, C, E]))
+    'F#ø7'
+    >>> str(identify([AFLAT, C, E]))
+    'Ab+'
+    >>> str(identify([E(-1), G(-1), C(0)]))
+    'C/E'
+
+Every chord quality in ``qualities`` is transposed to all twelve
+pitch classes, and the results are put in a table keyed by
+pitch-class bit mask (as in ``PitchClassSet.pc_mask``). Identifying
+a chord is a lookup of its pitch classes in this table, which gives
+every (root, quality) reading of them. The spelled chromae then
+choose between the readings: the reading whose spelling matches the
+most members wins, then one whose root is in the bass, then the
+first quality in ``qualities``. So {C, E, G, A} is Am7, and
+{C(0), E(0), G(0), A(0)} is C6.
+
+Unspelled pitch classes (integers) are read with the root spelled
+with the fewest accidentals.
+
+``identify_many`` labels a stream of simultaneities. Results are
+remembered by mask, so a repeated chord costs one lookup.
+"""
+
+from ophis import oph_utils
+from ophis.tonus import chroma as ch
+from ophis.tonus import interval as nt
+from ophis.tonus import pcset
+
+__all__ = ["Chord", "ChordQuality", "qualities", "identify", "identify_many"]
+
+
+_essential_set = ch.western_chroma_set
+_chromae = _essential_set.chromae_by_index()
+_modulo = _essential_set.modulo_base
+
+
+class ChordQuality(oph_utils.FrozenSlotsMixin):
+    """
+    A kind of chord: intervals above a root.
+
+    Attributes:
+        name (str): as "major seventh".
+        symbol (str): written after the root, as "maj7".
+        intervals (tuple): Intervals above the root, the root (P1) first.
+        pc_mask (int): the pitch classes of the chord on C.
+    """
+
+    __slots__ = ("name", "symbol", "intervals", "pc_mask")
+
+    def __init__(self, name, symbol, intervals):
+        self.name = name
+        self.symbol = symbol
+        self.intervals = tuple(intervals)
+        self.pc_mask = sum(1 << (int(x) % _modulo) for x in set(int(x) for x in self.intervals))
+
+    def on(self, root):
+        """Return the chromae of this quality on root, or None if they cannot be spelled."""
+        chromae = []
+        for interval in self.intervals:
+            chroma = root.augment(interval)
+            if (chroma.base_num - root.base_num) % 7 != interval.distance % 7:
+                return None
+            chromae.append(chroma)
+        return tuple(chromae)
+
+    def __reduce__(self):
+        return (_restore_quality, (self.name,))
+
+    def __repr__(self):
+        return "ChordQuality(%r, %r)" % (self.name, self.symbol)
+
+
+# In order of preference, where two qualities are spelled alike.
+qualities = tuple(ChordQuality(*args) for args in (
+    ("major", "", (nt.P1, nt.M3, nt.P5)),
+    ("minor", "m", (nt.P1, nt.m3, nt.P5)),
+    ("diminished", "°", (nt.P1, nt.m3, nt.d5)),
+    ("augmented", "+", (nt.P1, nt.M3, nt.A5)),
+    ("dominant seventh", "7", (nt.P1, nt.M3, nt.P5, nt.m7)),
+    ("major seventh", "maj7", (nt.P1, nt.M3, nt.P5, nt.M7)),
+    ("minor seventh", "m7", (nt.P1, nt.m3, nt.P5, nt.m7)),
+    ("half-diminished seventh", "ø7", (nt.P1, nt.m3, nt.d5, nt.m7)),
+    ("diminished seventh", "°7", (nt.P1, nt.m3, nt.d5, nt.d7)),
+    ("minor major seventh", "m(maj7)", (nt.P1, nt.m3, nt.P5, nt.M7)),
+    ("augmented seventh", "+7", (nt.P1, nt.M3, nt.A5, nt.m7)),
+    ("augmented major seventh", "+maj7", (nt.P1, nt.M3, nt.A5, nt.M7)),
+    ("major sixth", "6", (nt.P1, nt.M3, nt.P5, nt.M6)),
+    ("minor sixth", "m6", (nt.P1, nt.m3, nt.P5, nt.M6)),
+    ("suspended fourth", "sus4", (nt.P1, nt.P4, nt.P5)),
+    ("suspended second", "sus2", (nt.P1, nt.M2, nt.P5)),
+    ("dominant seventh suspended fourth", "7sus4", (nt.P1, nt.P4, nt.P5, nt.m7)),
+    ("dominant ninth", "9", (nt.P1, nt.M3, nt.P5, nt.m7, nt.M2)),
+    ("major ninth", "maj9", (nt.P1, nt.M3, nt.P5, nt.M7, nt.M2)),
+    ("minor ninth", "m9", (nt.P1, nt.m3, nt.P5, nt.m7, nt.M2)),
+    ("added ninth", "add9", (nt.P1, nt.M3, nt.P5, nt.M2)),
+    ("power chord", "5", (nt.P1, nt.P5)),
+))
+
+_quality_by_name = {quality.name: quality for quality in qualities}
+
+
+def _restore_quality(name):
+    return _quality_by_name[name]
+
+
+class Chord(oph_utils.FrozenSlotsMixin):
+    """
+    A chord: a root, a quality, and the chroma in the bass.
+
+    Attributes:
+        root (Chroma)
+        quality (ChordQuality)
+        bass (Chroma): the root, unless the chord is inverted.
+        chromae (tuple): the members, from the root up.
+    """
+
+    __slots__ = ("root", "quality", "bass", "chromae")
+
+    def __init__(self, root, quality, bass=None):
+        if isinstance(quality, str):
+            quality = _quality_by_name[quality]
+        chromae = quality.on(root)
+        if chromae is None:
+            raise ValueError("Cannot spell a " + quality.name + " chord on " + repr(root) + ".")
+        self.root = root
+        self.quality = quality
+        self.bass = root if bass is None else bass
+        self.chromae = chromae
+
+    @property
+    def symbol(self):
+        """The chord symbol, as "Cmaj7" or "C/E"."""
+        symbol = self.root.ascii + self.quality.symbol
+        if self.is_inverted():
+            symbol = symbol + "/" + self.bass.ascii
+        return symbol
+
+    def is_inverted(self):
+        # by spelling: C major over BSHARP is inverted
+        return self.bass.index != self.root.index
+
+    def __iter__(self):
+        return iter(self.chromae)
+
+    def __len__(self):
+        return len(self.chromae)
+
+    def __eq__(self, other):
+        if not isinstance(other, Chord):
+            return NotImplemented
+        return ((self.root.index, self.quality.name, self.bass.index) ==
+                (other.root.index, other.quality.name, other.bass.index))
+
+    def __hash__(self):
+        return hash((self.root.index, self.quality.name, self.bass.index))
+
+    def __str__(self):
+        return self.symbol
+
+    def __repr__(self):
+        if self.is_inverted():
+            return "Chord(%r, %r, %r)" % (self.root, self.quality.name, self.bass)
+        return "Chord(%r, %r)" % (self.root, self.quality.name)
+
+
+def _spelling_preference(chroma):
+    # fewest accidentals, then sharps
+    return (abs(chroma.fifths), -chroma.fifths)
+
+
+# pitch-class mask -> readings, built on first use.
+# A reading is (spelling mask, root pitch class, root, quality).
+_readings = {}
+
+# (pc mask, spelling mask, bass index) -> Chord or None
+_memo = {}
+_memo_size = 1 << 16
+
+
+def _build_readings():
+    roots = sorted(_chromae, key=_spelling_preference)
+    readings = {}
+    for quality in qualities:
+        for root in roots:
+            chromae = quality.on(root)
+            if chromae is None:
+                continue
+            pc = int(root) % _modulo
+            mask = ((quality.pc_mask << pc) | (quality.pc_mask >> (_modulo - pc))) & pcset._all_pcs
+            spelling = sum(1 << x.index for x in chromae)
+            readings.setdefault(mask, []).append((spelling, pc, root, quality))
+    _readings.update((mask, tuple(entries)) for mask, entries in readings.items())
+
+
+def _masks(members):
+    """Return (pc mask, spelling mask, bass) of a simultaneity."""
+    if isinstance(members, pcset.PitchClassSet):
+        return members.pc_mask, members.spelling_mask, None
+    pcs = spellings = 0
+    bass = low = None
+    for x in members:
+        if type(x) is ch.Chroma:
+            spellings |= 1 << x.index
+            pcs |= 1 << int(x)
+            continue
+        chroma = getattr(x, "chroma", None)
+        if chroma is None:
+            pcs |= 1 << (int(x) % _modulo)
+            continue
+        spellings |= 1 << chroma.index
+        pcs |= 1 << int(chroma)
+        if low is None or int(x) < low:
+            bass, low = chroma, int(x)
+    return pcs, spellings, bass
+
+
+def _identify(pcs, spellings, bass):
+    if not _readings:
+        _build_readings()
+    best = None
+    best_score = -1
+    bass_pc = None if bass is None else int(bass)
+    for spelling, pc, root, quality in _readings.get(pcs, ()):
+        score = 2 * bin(spelling & spellings).count("1") + (pc == bass_pc)
+        if score > best_score:
+            best, best_score = (root, quality), score
+    if best is None:
+        return None
+    return Chord(best[0], best[1], bass)
+
+
+def identify(members):
+    """Return the Chord formed by members, or None if it is not a known chord.
+
+    members can be Chroma, Pitch (the lowest is the bass), pitch
+    classes (integers), a ChromaSet or a PitchClassSet.
+    """
+    pcs, spellings, bass = _masks(members)
+    key = (pcs, spellings, None if bass is None else bass.index)
+    try:
+        return _memo[key]
+    except KeyError:
+        pass
+    if len(_memo) >= _memo_size:
+        _memo.clear()
+    chord = _memo[key] = _identify(pcs, spellings, bass)
+    return chord
+
+
+def identify_many(simultaneities):
+    """Identify each simultaneity of an iterable, lazily.
+
+    Yields a Chord, or None, for each.
+    """
+    for members in simultaneities:
+        yield identify(members)
@@ -0,0 +1,295 @@
+"""Voice leading between chords.
+
+The voice-leading distance between two chords is the smallest total
+number of half steps their voices move, going from one to the other.
+
+    >>> voice_leading({C, E, G}, {C, F, A})
+    VoiceLeading(3, [(C, C), (E, F), (G, A)])
+    >>> voice_leading_distance({C, E, G}, {B, D, G})
+    3
+
+Chromae and integers are pitch classes: each voice moves up or down,
+whichever is shorter, so no voice moves more than 6 half steps.
+Pitches move by the half steps between them.
+
+When one chord has more voices than the other, every note of the
+smaller chord is reached by a voice of the larger one, and the other
+voices of the larger chord move to their nearest note (a doubling).
+The voices of a chord are its distinct pitch classes (or pitches).
+
+The best mapping of voices is found with the Hungarian algorithm,
+in time cubic in the number of voices, never by trying every
+permutation. Pitch-class voice leadings are remembered by the bit
+masks of the two chords (as in ``PitchClassSet.pc_mask``), after
+transposing the first to start on C, so the distance between
+transpositions of a pair of chords is computed once.
+
+``voice_leadings`` and ``voice_leading_distances`` compare one chord
+with many others.
+"""
+
+from ophis import oph_utils
+from ophis.tonus import chroma as ch
+from ophis.tonus import pcset
+from ophis.tonus.pitch import Pitch
+
+__all__ = [
+    "VoiceLeading", "voice_leading", "voice_leading_distance",
+    "voice_leadings", "voice_leading_distances",
+]
+
+
+_modulo = ch.western_chroma_set.modulo_base
+_all_pcs = pcset._all_pcs
+
+# (source pc mask, target pc mask), the source starting on C
+#   -> (distance, pairs of pitch classes)
+_cache = {}
+_cache_size = 1 << 16
+
+_inf = float("inf")
+
+
+def assignment(costs):
+    """Return the column assigned to each row of a square cost matrix, at least total cost.
+
+    The Hungarian algorithm, with row and column potentials.
+    """
+    n = len(costs)
+    # potentials, and the row matched to each column; index 0 is a sentinel
+    u = [0] * (n + 1)
+    v = [0] * (n + 1)
+    matched = [0] * (n + 1)
+    way = [0] * (n + 1)
+    for row in range(1, n + 1):
+        matched[0] = row
+        column = 0
+        slack = [_inf] * (n + 1)
+        used = [False] * (n + 1)
+        while True:
+            used[column] = True
+            r = matched[column]
+            delta = _inf
+            next_column = 0
+            cost_row = costs[r - 1]
+            ur = u[r]
+            for j in range(1, n + 1):
+                if not used[j]:
+                    reduced = cost_row[j - 1] - ur - v[j]
+                    if reduced < slack[j]:
+                        slack[j] = reduced
+                        way[j] = column
+                    if slack[j] < delta:
+                        delta = slack[j]
+                        next_column = j
+            for j in range(n + 1):
+                if used[j]:
+                    u[matched[j]] += delta
+                    v[j] -= delta
+                else:
+                    slack[j] -= delta
+            column = next_column
+            if matched[column] == 0:
+                break
+        while column:
+            previous = way[column]
+            matched[column] = matched[previous]
+            column = previous
+    result = [0] * n
+    for j in range(1, n + 1):
+        result[matched[j] - 1] = j - 1
+    return result
+
+
+def _pair_up(source, target, distance):
+    """Return (total distance, [(source index, target index)]) of the best voice leading."""
+    flipped = len(source) < len(target)
+    if flipped:
+        source, target = target, source
+    costs = [[distance(s, t) for t in target] for s in source]
+    # extra voices of the larger chord double their nearest note
+    for row in costs:
+        nearest = min(row)
+        row.extend([nearest] * (len(source) - len(target)))
+    columns = assignment(costs)
+    pairs = []
+    total = 0
+    for i, j in enumerate(columns):
+        if j >= len(target):
+            j = costs[i].index(costs[i][j])
+        total += costs[i][j]
+        pairs.append((j, i) if flipped else (i, j))
+    return total, sorted(pairs)
+
+
+def _pc_distance(a, b):
+    d = (b - a) % _modulo
+    return min(d, _modulo - d)
+
+
+def _semitone_distance(a, b):
+    return abs(b - a)
+
+
+def _bits(mask):
+    return [i for i in range(_modulo) if mask >> i & 1]
+
+
+def _rotated(mask, n):
+    n %= _modulo
+    return ((mask >> n) | (mask << (_modulo - n))) & _all_pcs
+
+
+def _pc_voice_leading(source, target):
+    """Return (distance, pairs of pitch classes) between two pitch-class masks."""
+    if not source or not target:
+        if source or target:
+            raise ValueError("Cannot lead voices to or from nothing.")
+        return 0, ()
+    low = (source & -source).bit_length() - 1
+    key = (_rotated(source, low), _rotated(target, low))
+    try:
+        distance, pairs = _cache[key]
+    except KeyError:
+        sources, targets = _bits(key[0]), _bits(key[1])
+        distance, indexes = _pair_up(sources, targets, _pc_distance)
+        pairs = tuple((sources[i], targets[j]) for i, j in indexes)
+        if len(_cache) >= _cache_size:
+            _cache.clear()
+        _cache[key] = distance, pairs
+    if low:
+        pairs = tuple(((s + low) % _modulo, (t + low) % _modulo) for s, t in pairs)
+    return distance, pairs
+
+
+class VoiceLeading(oph_utils.FrozenSlotsMixin):
+    """
+    The best voice leading from one chord to another.
+
+    Attributes:
+        distance (int): total half steps moved.
+        pairs (tuple): (source, target) of each voice,
+            by the source's pitch class (or pitch) from low to high.
+    """
+
+    __slots__ = ("distance", "pairs")
+
+    def __init__(self, distance, pairs):
+        self.distance = distance
+        self.pairs = tuple(pairs)
+
+    def motions(self):
+        """Return the signed half steps each voice moves, by pairs."""
+        if self.pairs and isinstance(self.pairs[0][0], Pitch):
+            return [int(t) - int(s) for s, t in self.pairs]
+        motions = []
+        for s, t in self.pairs:
+            d = (int(t) - int(s)) % _modulo
+            motions.append(d - _modulo if d > _modulo // 2 else d)
+        return motions
+
+    def __iter__(self):
+        return iter(self.pairs)
+
+    def __len__(self):
+        return len(self.pairs)
+
+    def __eq__(self, other):
+        if not isinstance(other, VoiceLeading):
+            return NotImplemented
+        return (self.distance, self.pairs) == (other.distance, other.pairs)
+
+    def __hash__(self):
+        return hash((self.distance, self.pairs))
+
+    def __repr__(self):
+        return "VoiceLeading(%r, %r)" % (self.distance, list(self.pairs))
+
+
+def _chord(members):
+    """Return ('pcs', pc mask, {pc: member}) or ('pitches', sorted distinct pitches, None)."""
+    if isinstance(members, pcset.PitchClassSet):
+        return "pcs", members.pc_mask, None
+    members = list(members)
+    if members and all(isinstance(x, Pitch) for x in members):
+        pitches = {}
+        for x in members:
+            pitches.setdefault(int(x), x)
+        return "pitches", [pitches[k] for k in sorted(pitches)], None
+    mask = 0
+    spelled = {}
+    for x in members:
+        if isinstance(x, Pitch):
+            raise TypeError("Cannot mix pitches with chromae or pitch classes.")
+        pc = int(x) % _modulo
+        mask |= 1 << pc
+        if type(x) is ch.Chroma:
+            spelled.setdefault(pc, x)
+    return "pcs", mask, spelled
+
+
+def _respell(pc, spelled):
+    if spelled:
+        return spelled.get(pc, pc)
+    return pc
+
+
+def _leading(source, target):
+    kind, source, source_spelled = source
+    target_kind, target, target_spelled = target
+    if not source or not target:
+        if source or target:
+            raise ValueError("Cannot lead voices to or from nothing.")
+        return VoiceLeading(0, ())
+    if kind != target_kind:
+        raise TypeError("Cannot lead voices between pitches and pitch classes.")
+    if kind == "pitches":
+        distance, indexes = _pair_up([int(x) for x in source], [int(x) for x in target], _semitone_distance)
+        return VoiceLeading(distance, [(source[i], target[j]) for i, j in indexes])
+    distance, pairs = _pc_voice_leading(source, target)
+    return VoiceLeading(distance, [
+        (_respell(s, source_spelled), _respell(t, target_spelled)) for s, t in pairs
+    ])
+
+
+def voice_leading(source, target):
+    """Return the best VoiceLeading from one chord to another.
+
+    Chords are ChromaSets, PitchClassSets, or iterables of Chroma,
+    pitch classes (integers) or Pitch.
+    """
+    return _leading(_chord(source), _chord(target))
+
+
+def voice_leading_distance(source, target):
+    """Return the least total half steps moved by the voices going from source to target."""
+    source, target = _chord(source), _chord(target)
+    if source[0] == target[0] == "pcs":
+        return _pc_voice_leading(source[1], target[1])[0]
+    return _leading(source, target).distance
+
+
+def voice_leadings(source, targets):
+    """Return the best VoiceLeading from source to each of targets."""
+    source = _chord(source)
+    return [_leading(source, _chord(target)) for target in targets]
+
+
+def voice_leading_distances(source, targets):
+    """Return the voice-leading distance from source to each of targets.
+
+    targets may also be pitch-class masks (integers), which skips
+    reading them as chords.
+    """
+    source = _chord(source)
+    if source[0] != "pcs":
+        return [_leading(source, _chord(target)).distance for target in targets]
+    mask = source[1]
+    distances = []
+    for target in targets:
+        if type(target) is not int:
+            kind, target, spelled = _chord(target)
+            if kind != "pcs":
+                raise TypeError("Cannot lead voices between pitches and pitch classes.")
+        distances.append(_pc_voice_leading(mask, target)[0])
+    return distances
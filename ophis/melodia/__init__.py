@@ -0,0 +1,5 @@
+"""
+Scales and keys, built on the tonus classes.
+"""
+
+from . import scale
@@ -0,0 +1,257 @@
+"""Scales and keys.
+
+A Scale is a tonic and a mode: the seven spelled chromae built by
+stacking the mode's intervals on the tonic.
+
+    >>> Scale(D, "dorian")
+    Scale(D, 'dorian')
+    >>> list(Scale(D, "dorian"))
+    [D, E, F, G, A, B, C]
+    >>> Scale(A, "harmonic minor").degree(GSHARP)
+    7
+
+Scales are built once per tonic and mode, with their members
+as chroma index and pitch-class bit masks, so membership and
+scale-degree queries are table lookups. ``Scale.containing``
+finds every scale holding a set of chromae with one dictionary
+lookup, once its index has been built (on first use).
+
+    >>> Key.containing({FSHARP, CSHARP, GSHARP, DSHARP})[:4]
+    (Key(CSHARP, 'major'), Key(CSHARP, 'minor'), Key(DSHARP, 'minor'), Key(E, 'major'))
+
+A scale needing triple sharps or flats (GDUBSHARP major)
+cannot be spelled, and raises a ValueError.
+"""
+
+from ophis import oph_utils
+from ophis.tonus import chroma as ch
+from ophis.tonus import interval as nt
+from ophis.tonus import pcset
+
+__all__ = ["Scale", "Key", "modes"]
+
+
+_essential_set = ch.western_chroma_set
+_chromae = _essential_set.chromae_by_index()
+
+# mode -> intervals above the tonic
+modes = {
+    "major": (nt.P1, nt.M2, nt.M3, nt.P4, nt.P5, nt.M6, nt.M7),
+    "minor": (nt.P1, nt.M2, nt.m3, nt.P4, nt.P5, nt.m6, nt.m7),
+    "harmonic minor": (nt.P1, nt.M2, nt.m3, nt.P4, nt.P5, nt.m6, nt.M7),
+    "melodic minor": (nt.P1, nt.M2, nt.m3, nt.P4, nt.P5, nt.M6, nt.M7),
+    "dorian": (nt.P1, nt.M2, nt.m3, nt.P4, nt.P5, nt.M6, nt.m7),
+    "phrygian": (nt.P1, nt.m2, nt.m3, nt.P4, nt.P5, nt.m6, nt.m7),
+    "lydian": (nt.P1, nt.M2, nt.M3, nt.A4, nt.P5, nt.M6, nt.M7),
+    "mixolydian": (nt.P1, nt.M2, nt.M3, nt.P4, nt.P5, nt.M6, nt.m7),
+    "locrian": (nt.P1, nt.m2, nt.m3, nt.P4, nt.d5, nt.m6, nt.m7),
+}
+
+# other names -> mode
+mode_aliases = {
+    "ionian": "major",
+    "aeolian": "minor",
+    "natural minor": "minor",
+}
+
+
+def _mode_name(mode):
+    mode = mode_aliases.get(mode, mode)
+    if mode not in modes:
+        raise ValueError("Unknown mode: " + repr(mode) + ".")
+    return mode
+
+
+class Scale(oph_utils.FrozenSlotsMixin):
+    """
+    The seven chromae of a mode on a tonic.
+
+    Scales are built once: Scale(D, "dorian") is Scale(D, "dorian").
+
+    Attributes:
+        tonic (Chroma)
+        mode (str): a key of ``modes``.
+        chromae (tuple): the members, from the tonic up.
+        spelling_mask (int): one bit per member, by Chroma.index.
+        pc_mask (int): one bit per pitch class of the members.
+    """
+
+    __slots__ = ("tonic", "mode", "chromae", "spelling_mask", "pc_mask", "_degrees")
+
+    _instances = {}
+    # class -> (spelling mask -> scales, pc mask -> scales), built on first use
+    _indexes = {}
+
+    def __new__(cls, tonic, mode="major"):
+        mode = _mode_name(mode)
+        key = (cls, tonic.index, mode)
+        try:
+            return cls._instances[key]
+        except KeyError:
+            pass
+        chromae = []
+        for interval in modes[mode]:
+            chroma = tonic.augment(interval)
+            if (chroma.base_num - tonic.base_num) % 7 != interval.distance:
+                raise ValueError("Cannot spell " + mode + " on " + repr(tonic) + ".")
+            chromae.append(chroma)
+        scale = super().__new__(cls)
+        scale.tonic = tonic
+        scale.mode = mode
+        scale.chromae = tuple(chromae)
+        scale.spelling_mask = sum(1 << x.index for x in chromae)
+        scale.pc_mask = sum(1 << int(x) for x in set(int(x) for x in chromae))
+        # chroma index -> degree
+        scale._degrees = {x.index: i for i, x in enumerate(chromae, 1)}
+        cls._instances[key] = scale
+        return scale
+
+    @classmethod
+    def all(cls):
+        """Return every spellable scale, by tonic index then mode."""
+        scales = []
+        for tonic in _chromae:
+            for mode in cls._modes():
+                try:
+                    scales.append(cls(tonic, mode))
+                except ValueError:
+                    pass
+        return tuple(scales)
+
+    @staticmethod
+    def _modes():
+        return tuple(modes)
+
+    def degree(self, chroma):
+        """Return the scale degree of chroma (the tonic is 1), or None."""
+        return self._degrees.get(chroma.index)
+
+    def chroma(self, degree):
+        """Return the chroma of a scale degree (the tonic is 1, 8 is the tonic again)."""
+        return self.chromae[(degree - 1) % 7]
+
+    def pitch_class_set(self):
+        return pcset.PitchClassSet.from_masks(self.pc_mask, self.spelling_mask)
+
+    def chroma_set(self):
+        return ch.ChromaSet(self.chromae)
+
+    def __contains__(self, x):
+        if type(x) is not ch.Chroma:
+            chroma = getattr(x, "chroma", None)
+            if chroma is None:
+                return bool(self.pc_mask >> (int(x) % 12) & 1)
+            x = chroma
+        return bool(self.spelling_mask >> x.index & 1)
+
+    def contains(self, chromae):
+        """True if every chroma is a member (spelled as in the scale)."""
+        return _spelling_mask(chromae) & ~self.spelling_mask == 0
+
+    def __getitem__(self, i):
+        return self.chromae[i]
+
+    def __len__(self):
+        return len(self.chromae)
+
+    def __iter__(self):
+        return iter(self.chromae)
+
+    @classmethod
+    def containing(cls, chromae, spelled=True):
+        """Return every scale of this class containing all of chromae.
+
+        With spelled=False, enharmonic spellings match
+        (DFLAT major contains CSHARP).
+        """
+        try:
+            by_spelling, by_pitch_classes = cls._indexes[cls]
+        except KeyError:
+            by_spelling, by_pitch_classes = cls._indexes[cls] = cls._build_index()
+        if spelled:
+            return by_spelling.get(_spelling_mask(chromae), ())
+        return by_pitch_classes.get(_pc_mask(chromae), ())
+
+    @classmethod
+    def _build_index(cls):
+        indexes = ({}, {})
+        for scale in cls.all():
+            for table, mask in zip(indexes, (scale.spelling_mask, scale.pc_mask)):
+                for submask in _submasks(mask):
+                    table.setdefault(submask, []).append(scale)
+        return tuple({mask: tuple(scales) for mask, scales in table.items()} for table in indexes)
+
+    def __reduce__(self):
+        return (self.__class__, (self.tonic, self.mode))
+
+    def __repr__(self):
+        return "%s(%r, %r)" % (self.__class__.__name__, self.tonic, self.mode)
+
+
+class Key(Scale):
+    """
+    A major or minor key.
+
+    The scale of a minor key is the natural minor.
+
+        >>> Key(A, "minor").signature
+        0
+        >>> Key(EFLAT).relative
+        Key(C, 'minor')
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, tonic, mode="major"):
+        if _mode_name(mode) not in ("major", "minor"):
+            raise ValueError("A key is major or minor.")
+        return super().__new__(cls, tonic, mode)
+
+    @staticmethod
+    def _modes():
+        return ("major", "minor")
+
+    @property
+    def signature(self):
+        """Sharps (positive) or flats (negative) in the key signature."""
+        return self.tonic.fifths - (3 if self.mode == "minor" else 0)
+
+    @property
+    def relative(self):
+        if self.mode == "major":
+            return Key(self.chromae[5], "minor")
+        return Key(self.chromae[2], "major")
+
+    @property
+    def parallel(self):
+        return Key(self.tonic, "minor" if self.mode == "major" else "major")
+
+
+def _spelling_mask(chromae):
+    if isinstance(chromae, (Scale, pcset.PitchClassSet)):
+        return chromae.spelling_mask
+    return sum(1 << x.index for x in set(_as_chroma(x) for x in chromae))
+
+
+def _pc_mask(chromae):
+    if isinstance(chromae, (Scale, pcset.PitchClassSet)):
+        return chromae.pc_mask
+    mask = 0
+    for x in chromae:
+        mask |= 1 << (int(_as_chroma(x)) % 12)
+    return mask
+
+
+def _as_chroma(x):
+    return getattr(x, "chroma", x)
+
+
+def _submasks(mask):
+    """Yield every mask whose bits are all in mask, including 0 and mask."""
+    submask = mask
+    while True:
+        yield submask
+        if not submask:
+            return
+        submask = (submask - 1) & mask
+
@@ -1,11 +1,37 @@
+import collections
+import numbers
+import weakref
 from functools import singledispatch, update_wrapper
 
+class FrozenSlotsMixin():
+    """
+    Attributes which can be assigned once, and never reassigned.
+
+    Meant for classes with __slots__, whose instances are shared.
+    """
+
+    __slots__ = ()
+
+    def __setattr__(self, attr, value):
+        try:
+            # bypasses any __getattr__ fallback of the class
+            object.__getattribute__(self, attr)
+        except AttributeError:
+            object.__setattr__(self, attr, value)
+        else:
+            raise AttributeError("You cannot reassign attributes of a " + self.__class__.__name__ + ".")
+
+    def __delattr__(self, attr):
+        raise AttributeError("You cannot delete attributes of a " + self.__class__.__name__ + ".")
+
 class IntegerComparisonMixin():
     """
     Implements all comparison operators as
     comparisons of int(self), int(other).
     """
 
+    __slots__ = ()
+
     def __eq__(self, other):
         return int(self) == int(other)
 
@@ -25,6 +51,8 @@ class IntegerComparisonMixin():
         return int(self) >= int(other)
 
 class ArithmeticMixin():
+    __slots__ = ()
+
     def __add__(self, other):
         return self.augmented(other)
 
@@ -32,15 +60,136 @@ class ArithmeticMixin():
         return self.diminished(other)
 
 
+RegistryInfo = collections.namedtuple(
+    "RegistryInfo", ["hits", "misses", "evictions", "maxsize", "currsize", "held"]
+)
+
+class InternRegistry():
+    """
+    A registry of canonical instances, by key.
+
+    Instances are held by weak reference, so that an instance is
+    only kept while something else refers to it, and every live
+    instance stays unique. The ``maxsize`` most recently used
+    instances are also held strongly, so that values which come
+    and go are not rebuilt on every use.
+
+    maxsize=None holds every instance strongly, and never evicts.
+    maxsize=0 holds no instance strongly.
+
+    hold, if given, is a function of a key: instances whose key it
+    accepts are held strongly until clear(), and found without the
+    bookkeeping of recent use. Use it for small sets of instances
+    which are needed all the time.
+    """
+
+    def __init__(self, maxsize=1024, hold=None):
+        self.maxsize = maxsize
+        self.hold = hold
+        self._instances = weakref.WeakValueDictionary()
+        self._recent = collections.OrderedDict()
+        self._held = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """Return the instance registered under key, or default."""
+        instance = self._held.get(key)
+        if instance is not None:
+            self.hits += 1
+            return instance
+        try:
+            # recent instances are also in _instances
+            instance = self._recent[key]
+        except KeyError:
+            instance = self._instances.get(key)
+            if instance is None:
+                self.misses += 1
+                return default
+            self._keep(key, instance)
+        else:
+            if self.maxsize is not None:
+                self._recent.move_to_end(key)
+        self.hits += 1
+        return instance
+
+    def add(self, key, instance):
+        """Register instance under key, and return it."""
+        self._instances[key] = instance
+        if self.hold is not None and self.hold(key):
+            self._held[key] = instance
+        else:
+            self._keep(key, instance)
+        return instance
+
+    def _keep(self, key, instance):
+        if self.maxsize == 0:
+            return
+        self._recent[key] = instance
+        if self.maxsize is not None:
+            self._recent.move_to_end(key)
+            if len(self._recent) > self.maxsize:
+                self._recent.popitem(last=False)
+                self.evictions += 1
+
+    def info(self):
+        return RegistryInfo(self.hits, self.misses, self.evictions,
+                            self.maxsize, len(self._instances), len(self._held))
+
+    def clear(self):
+        """Forget every instance and reset the counters."""
+        self._instances.clear()
+        self._recent.clear()
+        self._held.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def __contains__(self, key):
+        return key in self._instances
+
+    def __len__(self):
+        return len(self._instances)
+
+
 def method_dispatch(func):
     """
     An extension of functools.singledispatch,
     which looks at the argument after self.
+
+    The implementation for each argument type is resolved once,
+    and cached until another implementation is registered.
+    ``calls()`` returns a Counter of the calls made with each
+    argument type.
     """
     dispatcher = singledispatch(func)
+    cache = {}      # type -> (implementation, call count)
+    counts = {}     # type -> call count, a one-item list
+
     def wrapper(*args, **kw):
-        return dispatcher.dispatch(args[1].__class__)(*args, **kw)
-    wrapper.register = dispatcher.register
+        try:
+            impl, count = cache[args[1].__class__]
+        except KeyError:
+            cls = args[1].__class__
+            impl, count = cache[cls] = (dispatcher.dispatch(cls), counts.setdefault(cls, [0]))
+        count[0] += 1
+        return impl(*args, **kw)
+
+    def register(cls, func=None):
+        if func is None and isinstance(cls, type):
+            return lambda f: register(cls, f)
+        try:
+            return dispatcher.register(cls, func)
+        finally:
+            cache.clear()
+
+    def calls():
+        return collections.Counter({cls: count[0] for cls, count in counts.items()})
+
+    wrapper.register = register
+    wrapper.dispatch = dispatcher.dispatch
+    wrapper.registry = dispatcher.registry
+    wrapper.cache_clear = cache.clear
+    wrapper.calls = calls
     update_wrapper(wrapper, func)
     return wrapper
 
@@ -73,13 +222,25 @@ def oph_int(n):
             raise err
 
 @singledispatch
-def octave_reduce():
-    pass
+def octave_reduce(x, octv_size=12):
+    """
+    Split x into (remainder, octaves), where
+    x == remainder + octaves * octv_size and
+    0 <= remainder < octv_size.
+
+    Negative values reduce downward:
+    octave_reduce(-1) is (11, -1).
+
+    Anything which supports divmod is reduced in one step,
+    so a NumPy array returns a pair of arrays.
+    Spelled intervals register their own overloads, which reduce
+    by number instead: octave_reduce(d8) is (d1, 1), although d1
+    is below zero half steps (see ophis.tonus.interval).
+    """
+    octaves, remainder = divmod(x, octv_size)
+    return remainder, octaves
 
-@octave_reduce.register(int)
+@octave_reduce.register(numbers.Integral)
 def _(x, octv_size=12):
-    octaves = 0
-    while x >= octv_size:
-        x = x - 12
-        octaves = octaves + 1
-    return x, octaves
+    octaves, remainder = divmod(int(x), octv_size)
+    return remainder, octaves
@@ -0,0 +1,218 @@
+"""Parse chromae, pitches and intervals from text.
+
+Every spelling of every Chroma, Interval and Quality is put into
+lookup tables when this module is imported, so parsing a token is
+usually a single dictionary lookup.
+
+    >>> parse_chroma("C#")
+    CSHARP
+    >>> parse_pitch("Ebb-1")
+    EDUBFLAT(-1)
+    >>> parse_interval("major third")
+    Major(3)
+    >>> parse_interval("P5^2")
+    Perfect(5)^2
+    >>> list(parse_many(["C4", "C#4", "M3"]))
+    [C(4), CSHARP(4), Major(3)]
+
+Chromae are accepted by name (``CSHARP``), and in their unicode (``C♯``),
+ascii (``C#``), verbose (``C SHARP``) and lilypond (``Cis``) forms.
+A pitch is a chroma followed by its octave, as ``C#4`` or ``C(4)``.
+Remember that Middle C is ``C(0)``.
+
+Intervals are accepted by name (``M3``, ``dubdim4``), in their repr
+(``Major(3)``) and as words (``Major third``, ``major third``).
+Compound intervals up to a thirteenth (``M10``, ``major tenth``)
+and ``^octaves`` (``P5^2``) give a QualifiedInterval.
+
+Some tokens can be read either way: ``A4`` is a pitch, or an
+augmented fourth. ``parse`` and ``parse_many`` read such tokens as
+pitches, unless ``kind="interval"`` is given.
+"""
+
+import re
+
+from . import oph_utils
+from .tonus import chroma as ch
+from .tonus import interval as nt
+from .tonus import pitch as pt
+
+__all__ = ["parse", "parse_chroma", "parse_pitch", "parse_interval", "parse_many"]
+
+
+# text -> Chroma
+chroma_table = {}
+
+# text -> Interval or QualifiedInterval
+interval_table = {}
+
+_pitch_pattern = re.compile(r"^(.+?)\s*\(?([+-]?\d+)\)?$")
+
+# Parsed tokens are remembered, up to _memo_size tokens each.
+_pitch_memo = {}
+_interval_memo = {}
+_any_memo = {}
+_memo_size = 1 << 16
+
+
+def _add(table, text, obj):
+    # The first meaning of a text wins.
+    table.setdefault(text, obj)
+
+
+def _remember(memo, text, result):
+    if len(memo) >= _memo_size:
+        memo.clear()
+    memo[text] = result
+    return result
+
+
+def _build_chroma_table():
+    for chroma in ch.western_chroma_set:
+        for text in (chroma.name, chroma.unicode, chroma.ascii, chroma.verbose, chroma.lilypond):
+            _add(chroma_table, text, chroma)
+        # lower case, except single letters, which would hide
+        # intervals such as d5
+        for text in (chroma.name, chroma.verbose, chroma.lilypond):
+            if len(text) > 1:
+                _add(chroma_table, text.lower(), chroma)
+
+
+def _quality_names(quality):
+    names = {quality.name, quality.name.lower(), quality.name.capitalize(), quality.name.upper()}
+    return sorted(names)
+
+
+def _build_interval_table():
+    number_names = oph_utils.number_names
+    for interval in sorted(nt.Interval.instances, key=lambda x: x.index):
+        quality = interval.quality
+        for text in (interval.name, repr(interval), str(interval), str(interval).lower()):
+            _add(interval_table, text, interval)
+        # compound intervals: ninth to thirteenth
+        compound = None
+        if 2 <= interval.number <= 6:
+            compound = nt.QualifiedInterval(interval, 1)
+        forms = [(interval.number, interval)]
+        if compound is not None:
+            forms.append((interval.number + 7, compound))
+        for number, obj in forms:
+            _add(interval_table, quality.short_name + str(number), obj)
+            for name in _quality_names(quality):
+                _add(interval_table, name + "(" + str(number) + ")", obj)
+                _add(interval_table, name + " " + number_names[number], obj)
+                _add(interval_table, name + " " + number_names[number].capitalize(), obj)
+
+
+_build_chroma_table()
+_build_interval_table()
+
+
+def parse_chroma(text):
+    """Return the Chroma spelled by text."""
+    try:
+        return chroma_table[text]
+    except KeyError:
+        pass
+    try:
+        return chroma_table[text.strip()]
+    except (KeyError, AttributeError):
+        raise ValueError("Cannot parse a chroma from " + repr(text) + ".") from None
+
+
+def parse_pitch(text):
+    """Return the Pitch spelled by text, such as ``C#4``."""
+    try:
+        return _pitch_memo[text]
+    except KeyError:
+        pass
+    try:
+        match = _pitch_pattern.match(text.strip())
+        chroma = chroma_table[match.group(1)]
+    except (KeyError, AttributeError, TypeError):
+        raise ValueError("Cannot parse a pitch from " + repr(text) + ".") from None
+    return _remember(_pitch_memo, text, pt.Pitch(chroma, int(match.group(2))))
+
+
+def parse_interval(text):
+    """Return the Interval, or QualifiedInterval, spelled by text."""
+    try:
+        return interval_table[text]
+    except KeyError:
+        pass
+    try:
+        return _interval_memo[text]
+    except KeyError:
+        pass
+    try:
+        stripped = text.strip()
+    except AttributeError:
+        raise ValueError("Cannot parse an interval from " + repr(text) + ".") from None
+    if stripped in interval_table:
+        return interval_table[stripped]
+    interval, caret, octaves = stripped.rpartition("^")
+    if caret:
+        try:
+            interval = parse_interval(interval)
+            octaves = int(octaves)
+        except ValueError:
+            pass
+        else:
+            if isinstance(interval, nt.QualifiedInterval):
+                interval, octaves = interval.interval, interval.octaves + octaves
+            return _remember(_interval_memo, text, nt.QualifiedInterval(interval, octaves))
+    raise ValueError("Cannot parse an interval from " + repr(text) + ".")
+
+
+def _parse_any(text):
+    try:
+        return _any_memo[text]
+    except KeyError:
+        pass
+    try:
+        result = chroma_table[text]
+    except KeyError:
+        result = None
+    if result is None:
+        for parser in (parse_pitch, parse_interval, parse_chroma):
+            try:
+                result = parser(text)
+                break
+            except ValueError:
+                pass
+        else:
+            raise ValueError("Cannot parse " + repr(text) + ".")
+    return _remember(_any_memo, text, result)
+
+
+_parsers = {
+    None: _parse_any,
+    "chroma": parse_chroma,
+    "pitch": parse_pitch,
+    "interval": parse_interval,
+}
+
+
+def _parser(kind):
+    try:
+        return _parsers[kind]
+    except KeyError:
+        raise ValueError("kind must be one of 'chroma', 'pitch', 'interval' or None.") from None
+
+
+def parse(text, kind=None):
+    """Return the Chroma, Pitch, Interval or QualifiedInterval spelled by text.
+
+    kind ("chroma", "pitch" or "interval") restricts what text is read as.
+    """
+    return _parser(kind)(text)
+
+
+def parse_many(tokens, kind=None):
+    """Parse each token of an iterable, lazily.
+
+    Raises ValueError on the first token which cannot be parsed.
+    """
+    parser = _parser(kind)
+    for token in tokens:
+        yield parser(token)
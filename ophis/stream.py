@@ -0,0 +1,443 @@
+"""Lazy pipelines over streams of pitches.
+
+Stages are joined with ``|`` into a Pipeline, which is applied to
+any iterable of Pitch, and yields its results one at a time:
+
+    >>> pipeline = transpose(M3) | invert_around(E(0)) | clamp_register(C(0), B(0))
+    >>> list(pipeline([C(0), D(0), G(-1)]))
+    [E(0), D(0), A(0)]
+    >>> list(window(2)([C(0), D(0), E(0)]))
+    [(C(0), D(0)), (D(0), E(0))]
+
+Nothing is computed until the results are iterated, and no stage
+holds more than a fixed number of pitches, so a pipeline can read
+note files of any size (``read_notes``) in constant memory.
+
+Adjacent note-by-note stages (transposition, inversion, respelling,
+octave folding and range filters) run together in one loop. Each
+pitch is read once into two integers, its position on the line of
+fifths (``Chroma.fifths``) and its half steps from Middle C, goes
+through every stage as integers, and becomes a Pitch again at the
+end. Transpositions by Interval and inversions are affine maps of
+those two integers, so any run of them is fused into a single map:
+``transpose(M3) | transpose(m3)`` costs as much as ``transpose(P5)``.
+
+Every stage spells its results as the matching Pitch arithmetic does:
+``transpose(M3)`` gives ``pitch + M3``, ``transpose(-2)`` gives
+``pitch - 2``. Where a transposition by Interval would leave the line
+of fifths of the western_chroma_set, that pitch goes through the Pitch
+arithmetic itself, which spells it by half steps
+(``DDUBSHARP(0) + M3`` is ``GSHARP(0)``) or raises ValueError.
+An inversion raises ValueError for a pitch no Chroma can spell.
+"""
+
+import collections
+import numbers
+
+from . import parse
+from .tonus import chroma as ch
+from .tonus import pitch as pt
+
+__all__ = [
+    "Pipeline", "Stage", "transpose", "invert_around", "respell", "fold_octaves",
+    "clamp_register", "in_range", "window", "read_notes",
+]
+
+
+_essential_set = ch.western_chroma_set
+_chromae = _essential_set.chromae_by_index()
+_modulo = _essential_set.modulo_base
+
+# Chroma.fifths by chroma index, and chroma index by fifths + _fifths_offset
+_fifths = tuple(x.fifths for x in _chromae)
+_fifths_offset = -min(_fifths)
+_by_fifths = [None] * (max(_fifths) + _fifths_offset + 1)
+for _chroma in _chromae:
+    _by_fifths[_chroma.fifths + _fifths_offset] = _chroma
+_by_fifths = tuple(_by_fifths)
+_lowest_fifths = min(_fifths)
+_highest_fifths = max(_fifths)
+
+# fifths and half steps of the major and perfect intervals, by Interval.distance % 7
+_natural_fifths = (0, 2, 4, -1, 1, 3, 5)
+_natural_half_steps = (0, 2, 4, 5, 7, 9, 11)
+
+
+def interval_fifths(interval):
+    """Return the size of an Interval (or QualifiedInterval) on the line of fifths."""
+    interval = getattr(interval, "interval", interval)
+    octaves, distance = divmod(interval.distance, 7)
+    alteration = interval.half_steps - _natural_half_steps[distance] - octaves * _modulo
+    return _natural_fifths[distance] + 7 * alteration
+
+
+def _pitch(fifths, half_steps):
+    index = fifths + _fifths_offset
+    chroma = _by_fifths[index] if 0 <= index < len(_by_fifths) else None
+    if chroma is None:
+        raise ValueError("No chroma spells a pitch " + str(fifths) + " fifths from C.")
+    return pt.Pitch._interned(chroma, (half_steps - chroma.value) // _modulo)
+
+
+def _spelled_fifths(modifier_preference, key=None):
+    """Return the fifths of the chroma spelling each pitch class."""
+    return tuple(x.fifths for x in _essential_set.spelling(modifier_preference, key))
+
+
+class Stage():
+    """
+    One step of a pipeline.
+
+    Join stages with ``|``; call a stage or a pipeline with an
+    iterable of Pitch to apply it.
+    """
+
+    description = "stage"
+
+    def __or__(self, other):
+        return Pipeline([self]) | other
+
+    def __call__(self, pitches):
+        return Pipeline([self])(pitches)
+
+    def apply(self, pitches):
+        """Return an iterator over the results for an iterable of Pitch."""
+        raise NotImplementedError
+
+    def __repr__(self):
+        return self.description
+
+
+class _NoteStage(Stage):
+    """A stage mapping each pitch, as (fifths, half steps), to one or no pitch.
+
+    ``function()`` returns a function of (fifths, half_steps) which
+    returns the new (fifths, half_steps), or None to drop the pitch.
+    """
+
+    def __init__(self, description, function=None):
+        self.description = description
+        self._function = function
+
+    def function(self):
+        return self._function
+
+    def apply(self, pitches):
+        return _fused([self.function()], pitches)
+
+
+class _Affine(_NoteStage):
+    """
+    (fifths, half steps) -> (sign * fifths + fifths_shift, sign * half steps + half_step_shift).
+
+    sign is 1 (a transposition) or -1 (an inversion).
+
+    parts are the maps fused into this one, each with its fallback:
+    a function of a Pitch spelling the step when the map would leave
+    the line of fifths, or None to raise ValueError. Pitches which
+    stay on the line through every part are mapped in one step; the
+    others go through the parts one by one.
+    """
+
+    def __init__(self, description, sign, fifths_shift, half_step_shift, fallback=None, parts=None):
+        self.description = description
+        self.sign = sign
+        self.fifths_shift = fifths_shift
+        self.half_step_shift = half_step_shift
+        if parts is None:
+            parts = ((sign, fifths_shift, half_step_shift, fallback),)
+        self.parts = parts
+
+    def then(self, other):
+        """Return the single map doing self, then other."""
+        return _Affine(
+            self.description + " | " + other.description,
+            self.sign * other.sign,
+            other.sign * self.fifths_shift + other.fifths_shift,
+            other.sign * self.half_step_shift + other.half_step_shift,
+            parts=self.parts + other.parts,
+        )
+
+    def domain(self):
+        """Return the lowest and highest fifths which stay on the line through every part."""
+        low, high = _lowest_fifths, _highest_fifths
+        # after each part, fifths becomes sign * fifths + shift
+        sign, shift = 1, 0
+        for part_sign, fifths_shift, _, _ in self.parts:
+            sign, shift = part_sign * sign, part_sign * shift + fifths_shift
+            if sign == 1:
+                low, high = max(low, _lowest_fifths - shift), min(high, _highest_fifths - shift)
+            else:
+                low, high = max(low, shift - _highest_fifths), min(high, shift - _lowest_fifths)
+        return low, high
+
+    def _by_parts(self, fifths, half_steps):
+        for sign, fifths_shift, half_step_shift, fallback in self.parts:
+            moved = sign * fifths + fifths_shift
+            if _lowest_fifths <= moved <= _highest_fifths:
+                fifths, half_steps = moved, sign * half_steps + half_step_shift
+            elif fallback is None:
+                raise ValueError("No chroma spells a pitch " + str(moved) + " fifths from C.")
+            else:
+                pitch = fallback(_pitch(fifths, half_steps))
+                fifths, half_steps = pitch.chroma.fifths, int(pitch)
+        return fifths, half_steps
+
+    def function(self):
+        sign, fifths_shift, half_step_shift = self.sign, self.fifths_shift, self.half_step_shift
+        low, high = self.domain()
+        by_parts = self._by_parts
+        if sign == 1:
+            def mapped(fifths, half_steps):
+                if low <= fifths <= high:
+                    return fifths + fifths_shift, half_steps + half_step_shift
+                return by_parts(fifths, half_steps)
+        else:
+            def mapped(fifths, half_steps):
+                if low <= fifths <= high:
+                    return fifths_shift - fifths, half_step_shift - half_steps
+                return by_parts(fifths, half_steps)
+        return mapped
+
+
+def _step_function(steps):
+    """Return the function moving (fifths, half steps) by steps, spelled as Pitch + int."""
+    if steps == 0:
+        # Pitch + 0 is the pitch, as spelled
+        return lambda fifths, half_steps: (fifths, half_steps)
+    table = pt._sharp_steps if steps >= 0 else pt._flat_steps
+    n = abs(steps) % _modulo
+    # fifths -> fifths after moving
+    moved = {x.fifths: _fifths[table[x.index * _modulo + n]] for x in _chromae}
+
+    def stepped(fifths, half_steps):
+        try:
+            return moved[fifths], half_steps + steps
+        except KeyError:
+            raise ValueError("No chroma spells a pitch " + str(fifths) + " fifths from C.") from None
+    return stepped
+
+
+def transpose(magnitude, down=False):
+    """
+    Move every pitch by an Interval, a QualifiedInterval or a number of half steps.
+
+    Args:
+        down (bool): move down instead of up.
+
+    Moving by half steps is spelled as ``Pitch + int``:
+    with sharps going up, and with flats going down.
+    """
+    description = "transpose(%r%s)" % (magnitude, ", down=True" if down else "")
+    sign = -1 if down else 1
+    if isinstance(magnitude, numbers.Integral):
+        return _NoteStage(description, _step_function(sign * int(magnitude)))
+    if down:
+        fallback = lambda pitch: pitch - magnitude
+    else:
+        fallback = lambda pitch: pitch + magnitude
+    return _Affine(description, 1, sign * interval_fifths(magnitude), sign * int(magnitude), fallback)
+
+
+def invert_around(axis):
+    """Reflect every pitch around an axis Pitch: a M3 above the axis becomes a M3 below it."""
+    return _Affine("invert_around(%r)" % (axis,), -1, 2 * axis.chroma.fifths, 2 * int(axis))
+
+
+def respell(modifier_preference="sharp", key=None):
+    """
+    Spell every pitch again, by its pitch class.
+
+    Args:
+        modifier_preference (str): ``'sharp'`` or ``'flat'``, as in
+            ``Chroma.enharmonic_reduce``.
+        key (Scale): if given, pitch classes in the scale are spelled as in the scale.
+    """
+    table = _spelled_fifths(modifier_preference, key)
+    return _NoteStage(
+        "respell(%r, key=%r)" % (modifier_preference, key),
+        lambda fifths, half_steps: (table[half_steps % _modulo], half_steps),
+    )
+
+
+def fold_octaves(low=None):
+    """Move every pitch by octaves into the octave starting at low (Middle C by default)."""
+    if low is None:
+        low = pt.Pitch(ch.C, 0)
+    bottom = int(low)
+    return _NoteStage(
+        "fold_octaves(%r)" % (low,),
+        lambda fifths, half_steps: (fifths, bottom + (half_steps - bottom) % _modulo),
+    )
+
+
+def clamp_register(low, high):
+    """
+    Move pitches below low up, and pitches above high down, by octaves,
+    into the register from low to high (inclusive).
+
+    The register must span at least eleven half steps.
+    """
+    bottom, top = int(low), int(high)
+    if top - bottom < _modulo - 1:
+        raise ValueError("The register must span at least eleven half steps.")
+
+    def clamped(fifths, half_steps):
+        if half_steps < bottom:
+            half_steps += -((half_steps - bottom) // _modulo) * _modulo
+        elif half_steps > top:
+            half_steps -= -((top - half_steps) // _modulo) * _modulo
+        return fifths, half_steps
+    return _NoteStage("clamp_register(%r, %r)" % (low, high), clamped)
+
+
+def in_range(low, high):
+    """Keep only the pitches from low to high (inclusive); drop the rest."""
+    bottom, top = int(low), int(high)
+    return _NoteStage(
+        "in_range(%r, %r)" % (low, high),
+        lambda fifths, half_steps: (fifths, half_steps) if bottom <= half_steps <= top else None,
+    )
+
+
+class _Window(Stage):
+
+    def __init__(self, n, step):
+        self.n = n
+        self.step = step
+        self.description = "window(%r, step=%r)" % (n, step)
+
+    def apply(self, pitches):
+        n, step = self.n, self.step
+        recent = collections.deque(maxlen=n)
+        skip = 0
+        for pitch in pitches:
+            recent.append(pitch)
+            if len(recent) == n:
+                if skip == 0:
+                    yield tuple(recent)
+                    skip = step
+                skip -= 1
+
+
+def window(n, step=1):
+    """
+    Yield tuples of n consecutive pitches, moving step pitches at a time.
+
+    Only the last n pitches are kept.
+    """
+    if n < 1 or step < 1:
+        raise ValueError("n and step must be at least 1.")
+    return _Window(n, step)
+
+
+def _fused(functions, pitches):
+    """Apply note-by-note functions to every pitch, in one loop."""
+    if len(functions) == 1:
+        function = functions[0]
+        for pitch in pitches:
+            chroma = pitch.chroma
+            result = function(chroma.fifths, pitch.octave * _modulo + chroma.value)
+            if result is not None:
+                yield _pitch(*result)
+        return
+    for pitch in pitches:
+        chroma = pitch.chroma
+        result = (chroma.fifths, pitch.octave * _modulo + chroma.value)
+        for function in functions:
+            result = function(*result)
+            if result is None:
+                break
+        else:
+            yield _pitch(*result)
+
+
+class _FusedStage(Stage):
+    """Consecutive note-by-note stages, applied in one loop."""
+
+    def __init__(self, stages):
+        self.stages = tuple(stages)
+        self.functions = tuple(stage.function() for stage in self.stages)
+        self.description = " | ".join(repr(stage) for stage in self.stages)
+
+    def apply(self, pitches):
+        return _fused(self.functions, pitches)
+
+
+class Pipeline(Stage):
+    """
+    Stages applied one after the other, lazily.
+
+    Attributes:
+        stages (tuple): the stages, as given.
+        steps (tuple): the stages as run: runs of note-by-note
+            stages are fused, and adjacent transpositions by
+            interval and inversions become one map.
+    """
+
+    def __init__(self, stages=()):
+        self.stages = tuple(stages)
+        self.steps = self._fuse(self.stages)
+
+    @staticmethod
+    def _fuse(stages):
+        steps = []
+        run = []
+        for stage in stages:
+            if not isinstance(stage, _NoteStage):
+                if run:
+                    steps.append(_FusedStage(run))
+                    run = []
+                steps.append(stage)
+            elif run and isinstance(stage, _Affine) and isinstance(run[-1], _Affine):
+                run[-1] = run[-1].then(stage)
+            else:
+                run.append(stage)
+        if run:
+            steps.append(_FusedStage(run))
+        return tuple(steps)
+
+    def __or__(self, other):
+        if isinstance(other, Pipeline):
+            return Pipeline(self.stages + other.stages)
+        if isinstance(other, Stage):
+            return Pipeline(self.stages + (other,))
+        return NotImplemented
+
+    def apply(self, pitches):
+        iterator = iter(pitches)
+        for step in self.steps:
+            iterator = step.apply(iterator)
+        return iterator
+
+    def __call__(self, pitches):
+        return self.apply(pitches)
+
+    def __repr__(self):
+        return "Pipeline(%r)" % (list(self.stages),)
+
+
+def read_notes(path, chunk_size=1 << 16):
+    """Yield the pitches of a note file, one at a time.
+
+    Text files hold pitch tokens separated by white space (``C#4 E4``),
+    and are read a line at a time; tokens which are not pitches are
+    skipped. Binary pitch files (``.oph``, see ``ophis.tonus.pitchfile``)
+    are memory-mapped, and read chunk_size pitches at a time.
+    """
+    if str(path).endswith(".oph"):
+        from .tonus.pitchfile import PitchFile
+        with PitchFile(path) as pitch_file:
+            pitches = pitch_file.pitches
+            for start in range(0, len(pitch_file), chunk_size):
+                yield from pitches[start:start + chunk_size].to_pitches()
+        return
+    parse_pitch = parse.parse_pitch
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            for token in line.split():
+                try:
+                    pitch = parse_pitch(token)
+                except ValueError:
+                    continue
+                yield pitch
@@ -1,3 +1,7 @@
 from . import chroma
 from . import interval
 from . import pitch
+from . import pcset
+from . import spelling
+from . import ranges
+from . import tuning
@@ -7,7 +7,7 @@ from ophis import oph_utils
 from . import interval
 
 
-class Chroma():
+class Chroma(oph_utils.FrozenSlotsMixin):
     """Octave-agnostic pitch within a music system.
 
     Chroma is the idea of a note (C, BFLAT),
@@ -27,6 +27,11 @@ class Chroma():
     own chroma-like class.
     """
 
+    __slots__ = (
+        "essential_set", "name", "base", "base_num", "base_value", "value",
+        "mod_val", "unicode", "ascii", "verbose", "lilypond", "index", "fifths",
+    )
+
     def __init__(self, attrs):
         """Build and return a Chroma.
 
@@ -158,6 +163,31 @@ class Chroma():
                 >>> DSHARP.s9n
                 'ri'
                 
+            index (int): the position of the chroma within its essential set,
+                ordered by letter and then by modifier. Stable, so it can be 
+                stored in place of the chroma itself.
+            
+                >>> CDUBFLAT.index
+                0
+                
+                >>> C.index
+                2
+                
+                >>> BDUBSHARP.index
+                34
+                
+            fifths (int): the position of the chroma on the line of fifths,
+                in perfect fifths above C. Enharmonic spellings are 12 apart.
+            
+                >>> G.fifths
+                1
+                
+                >>> BFLAT.fifths
+                -2
+                
+                >>> FSHARP.fifths
+                6
+                
             essential_set (ChromaSet): a set of all Chroma in this musical system.
             
                 >>> D.essential_set is DSHARP.essential_set
@@ -166,15 +196,9 @@ class Chroma():
        """
         
         for key, value in attrs.items():
-            setattr(self, key, value)
+            object.__setattr__(self, key, value)
         self.essential_set.add(self)
 
-    def __setattr__(self, attr, value):
-        if hasattr(self, attr):
-            raise AttributeError("You cannot reassign attributes of a Chroma.")
-        else:
-            self.__dict__[attr] = value
-
     def enharmonics(self, include_original=True, return_type="set"):
         """Return a Chromaset containing chroma enharmonic with self.
         
@@ -198,7 +222,7 @@ class Chroma():
             >>> DSHARP.enharmonics(False)
             ChromaSet(EFLAT, FDOUBLEFLAT)     
         """
-        enharmonics = self.essential_set.chroma_by_value(self)
+        enharmonics = ChromaSet(self.essential_set.chroma_by_value(self))
         if include_original == False:
             enharmonics.discard(self)
         if return_type == "chroma":
@@ -239,14 +263,17 @@ class Chroma():
             >>> E.augment(2, 'flat')
             GFLAT
         """
-        
-        value_candidates =  self.essential_set.chroma_by_value(int(self) + int(magnitude))
+        if type(magnitude) is interval.Interval:
+            solution = _augmentations.get((self.index, magnitude), _untabulated)
+            if solution is _untabulated:
+                solution = _tabulate_augment(self, magnitude, modifier_preference)
+            if solution is not None:
+                return solution
+        key = (self.index, int(magnitude) % self.essential_set.modulo_base, modifier_preference)
         try:
-            letter_candidates = self.essential_set.chroma_by_letter( self.base_num + magnitude.distance)
-            solution, = value_candidates & letter_candidates
-            return solution
-        except:
-            return value_candidates.enharmonic_reduce(modifier_preference)
+            return _augmentations[key]
+        except KeyError:
+            return _tabulate_augment(self, key[1], modifier_preference)
 
     def diminish(self, magnitude=1, modifier_preference="flat"):
         """ Return a chroma lower than the one given.
@@ -256,46 +283,39 @@ class Chroma():
         >>> D.diminish()
         DFLAT
         """
+        if type(magnitude) is interval.Interval:
+            try:
+                return _diminutions[self.index, magnitude]
+            except KeyError:
+                return _tabulate_diminish(self, magnitude)
         try:
             return self.augment(-magnitude, "flat")
         except TypeError:
-            value_candidates =  self.essential_set.chroma_by_value(int(self) - int(magnitude))
-            letter_candidates = self.essential_set.chroma_by_letter( self.base_num - magnitude.distance)
-            solution, = value_candidates & letter_candidates
-            return solution
+            return _tabulate_diminish(self, magnitude)
 
     def delta(self, other):
         return min(self - other, other - self)
 
     def __add__(self, other):
-        try:
+        # chroma plus chroma = ChromaSet
+        if type(other) is Chroma:
             chromaset = ChromaSet()
             chromaset.add(self)
             chromaset.add(other)
             return chromaset
+        try:
+            return self.augment(other)
         except TypeError:
-            try:
-                return self.augment(other)
-            except TypeError:
-                return NotImplemented
+            return NotImplemented
 
     def __radd__(self, other):
         return self + other
 
     def __sub__(self, other):
-        # chroma minus chroma = integer, the distance (in half-steps) between them
+        # chroma minus chroma = Interval, from other up to self
         # chroma must belong to the same essential_set
         if type(other) is Chroma:
-            if self.base_num >= other.base_num:
-                distance = self.base_num - other.base_num
-                half_steps = int(self) - int(other) % self.essential_set.modulo_base
-            else:
-                half_steps = (int(self) + self.essential_set.modulo_base) - int(other)
-                distance = self.base_num + 7 - other.base_num
-            number = distance + 1
-            return interval.Interval.get_interval(half_steps=half_steps, number=number)
-
-
+            return self.essential_set.interval_matrix()[self.index][other.index]
 
         # chroma minus integer = chroma
         try:
@@ -342,6 +362,11 @@ class Chroma():
     def __hash__(self):
         return hash((self.name, self.base_num, self.base_value, self.mod_val))
 
+    def __reduce__(self):
+        # Pickled as the name of the module constant,
+        # so that unpickling returns the same instance.
+        return self.name
+
     #
     @oph_utils.method_dispatch
     def __call__(self, x):
@@ -359,6 +384,84 @@ class Chroma():
 
 # end class Chroma
 
+# Transposition tables.
+#
+# Spelling a transposition means intersecting the chromae with the
+# right value with the chromae on the right letter. The results only
+# depend on the chroma and the magnitude, so each is worked out once,
+# the first time it is asked for, and looked up afterwards.
+#
+#   (chroma index, Interval) -> Chroma, or None if no chroma spells it
+#   (chroma index, half steps, modifier_preference) -> Chroma
+
+_augmentations = {}
+_diminutions = {}
+_untabulated = object()
+
+
+def _spell_by_letter(chroma, value, letter):
+    """Return the one chroma with the given value and letter, or None."""
+    solutions = [x for x in chroma.essential_set.chroma_by_value(value) if x.base_num == letter % 7]
+    if len(solutions) == 1:
+        return solutions[0]
+    return None
+
+
+def _tabulate_augment(chroma, magnitude, modifier_preference):
+    """Spell an augmentation and store it in the transposition table."""
+    essential_set = chroma.essential_set
+    if type(magnitude) is interval.Interval:
+        solution = _augmentations[chroma.index, magnitude] = _spell_by_letter(
+            chroma, int(chroma) + int(magnitude), chroma.base_num + magnitude.distance)
+        return solution
+    half_steps = int(magnitude) % essential_set.modulo_base
+    value = (int(chroma) + half_steps) % essential_set.modulo_base
+    solution = _augmentations[chroma.index, half_steps, modifier_preference] = \
+        essential_set.chroma_by_value(value).enharmonic_reduce(modifier_preference)
+    return solution
+
+
+def _tabulate_diminish(chroma, magnitude):
+    """Spell a diminution by an Interval and store it in the transposition table.
+
+    Raises ValueError, as Chroma.diminish does, if no chroma spells it.
+    """
+    solution = _spell_by_letter(chroma, int(chroma) - int(magnitude), chroma.base_num - magnitude.distance)
+    if solution is None:
+        raise ValueError("No chroma spells " + repr(chroma) + " diminished by " + repr(magnitude) + ".")
+    _diminutions[chroma.index, magnitude] = solution
+    return solution
+
+
+def _interval_between(upper, lower):
+    """Work out the Interval from lower up to upper."""
+    if upper.base_num >= lower.base_num:
+        distance = upper.base_num - lower.base_num
+        half_steps = int(upper) - int(lower) % upper.essential_set.modulo_base
+    else:
+        half_steps = (int(upper) + upper.essential_set.modulo_base) - int(lower)
+        distance = upper.base_num + 7 - lower.base_num
+    number = distance + 1
+    return interval.Interval.get_interval(half_steps=half_steps, number=number)
+
+
+# Without any other context, spellings are centred between G and D
+# on the line of fifths, which gives the usual C#, Eb, F#, Ab, Bb.
+_default_fifths_centre = 1.5
+
+
+def _fifths_centre(context):
+    """Return the mean line of fifths position of a Chroma or iterable of Chroma."""
+    if context is None:
+        return _default_fifths_centre
+    if type(context) is Chroma:
+        return context.fifths
+    positions = [x.fifths for x in context]
+    if not positions:
+        return _default_fifths_centre
+    return sum(positions) / len(positions)
+
+
 class ChromaSet(set):
 
     def __init__(self, chromae={}):
@@ -368,12 +471,32 @@ class ChromaSet(set):
         except:
             self.max_val = 0
         self.modulo_base = self._modulo_base()
+        self._by_value = None
+        self._by_letter = None
+        self._by_index = None
+        self._interval_matrix = None
+        self._chromae_by_index = None
+        self._spellings = {}
+
+    def __reduce__(self):
+        # The indexes are rebuilt on demand, and not pickled.
+        if self is western_chroma_set:
+            return "western_chroma_set"
+        return (self.__class__, (list(self),))
 
     def add(self, arg):
         if type(arg) is Chroma:
+            if arg in self:
+                return
             super().add(arg)
-            self.max_val = self._max_val()
-            self.modulo_base = self._modulo_base()
+            if int(arg) > self.max_val:
+                self.max_val = int(arg)
+                self.modulo_base = self._modulo_base()
+            if self._by_value is not None:
+                self._index(arg)
+            self._interval_matrix = None
+            self._chromae_by_index = None
+            self._spellings = {}
         else:
             raise TypeError("Unsupported member type for ChromaSet: members must be of type Chroma.")
 
@@ -383,10 +506,46 @@ class ChromaSet(set):
     def _modulo_base(self):
         return self.max_val + 1
 
+    def _reindex(self):
+        """Rebuild the value and letter indexes from the members of the set."""
+        self._by_value = {}
+        self._by_letter = {}
+        self._letter_nums = {}
+        self._by_index = {}
+        for chroma in self:
+            self._index(chroma)
+
+    def _index(self, chroma):
+        """Add a single chroma to the value and letter indexes.
+
+        Index entries are read-only ChromaSets, replaced (not mutated)
+        when a member is added, so lookups can hand them out directly.
+        """
+        for index, key in (
+            (self._by_value, int(chroma)),
+            (self._by_letter, chroma.base_num),
+        ):
+            index[key] = _FrozenChromaSet(itertools.chain(index.get(key, ()), (chroma,)))
+        self._letter_nums[chroma.base] = chroma.base_num
+        self._by_index[chroma.index] = chroma
+
+    def _invalidate(self):
+        self._by_value = None
+        self._by_letter = None
+        self._by_index = None
+        self._interval_matrix = None
+        self._chromae_by_index = None
+        self._spellings = {}
+
     def chroma_by_value(self, value):
-        """return ChromaSet of enharmonic chromae"""
-        value = int(value) % self.modulo_base
-        return ChromaSet(x for x in self if x == value)
+        """return ChromaSet of enharmonic chromae
+
+        The returned set is read-only and shared between callers;
+        copy it with ``ChromaSet(...)`` before modifying it.
+        """
+        if self._by_value is None:
+            self._reindex()
+        return self._by_value.get(int(value) % self.modulo_base, _empty_chroma_set)
 
     def chroma_by_letter(self, letter):
         """return ChromaSet of all chromae with given letter or letter num
@@ -398,13 +557,118 @@ class ChromaSet(set):
         4:G
         5:A
         6:B
+
+        The returned set is read-only and shared between callers.
         """
+        if self._by_letter is None:
+            self._reindex()
         try:
-            return ChromaSet(x for x in self if x.base_num == int(letter)%7)
+            key = int(letter) % 7
         except ValueError:
-            return ChromaSet(x for x in self is x.base == letter)
+            key = self._letter_nums.get(letter)
+        return self._by_letter.get(key, _empty_chroma_set)
+
+    def chroma_by_index(self, index):
+        """return the chroma with the given index
+
+        >>> western_chroma_set.chroma_by_index(2)
+        C
+        """
+        if self._by_index is None:
+            self._reindex()
+        return self._by_index[index]
+
+    def chromae_by_index(self):
+        """return a tuple of the members, each at its index
 
-    def enharmonic_reduce(self, modifier_preference="contextual"):
+        Positions no member has are None.
+
+        >>> western_chroma_set.chromae_by_index()[:3]
+        (CDUBFLAT, CFLAT, C)
+        """
+        if self._chromae_by_index is None:
+            chromae = [None] * (max(x.index for x in self) + 1)
+            for chroma in self:
+                chromae[chroma.index] = chroma
+            self._chromae_by_index = tuple(chromae)
+        return self._chromae_by_index
+
+    def spelling(self, modifier_preference="sharp", key=None):
+        """return a tuple of the chroma spelling each value, from 0
+
+        Values are spelled by ``enharmonic_reduce``, except those of
+        the chromae of key (a Scale, or any iterable of Chroma), which
+        are spelled as in key.
+
+        >>> western_chroma_set.spelling("flat")[:4]
+        (C, DFLAT, D, EFLAT)
+        """
+        cached = key is None
+        if cached:
+            try:
+                return self._spellings[modifier_preference]
+            except KeyError:
+                pass
+        table = [self.chroma_by_value(value).enharmonic_reduce(modifier_preference)
+                 for value in range(self.modulo_base)]
+        if key is not None:
+            for chroma in key:
+                table[int(chroma) % self.modulo_base] = chroma
+        table = tuple(table)
+        if cached:
+            self._spellings[modifier_preference] = table
+        return table
+
+    def interval_matrix(self):
+        """return the Intervals between every pair of members
+
+        The matrix is indexed by ``Chroma.index``:
+        ``matrix[x.index][y.index]`` is ``x - y``.
+        It is built on first use and kept until the set changes.
+
+        >>> m = western_chroma_set.interval_matrix()
+        >>> m[E.index][C.index]
+        Major(3)
+        """
+        if self._interval_matrix is None:
+            size = max(x.index for x in self) + 1
+            matrix = [[None] * size for _ in range(size)]
+            for upper in self:
+                for lower in self:
+                    matrix[upper.index][lower.index] = _interval_between(upper, lower)
+            self._interval_matrix = tuple(tuple(row) for row in matrix)
+        return self._interval_matrix
+
+    def interval_sequence(self, chromae):
+        """return the Intervals between consecutive chromae of a sequence
+
+        Each Interval is measured up from one chroma to the next,
+        as ``chromae[i + 1] - chromae[i]``.
+
+        >>> western_chroma_set.interval_sequence([C, E, G, C])
+        [Major(3), minor(3), Perfect(4)]
+        """
+        matrix = self.interval_matrix()
+        indexes = [x.index for x in chromae]
+        return [matrix[upper][lower] for lower, upper in zip(indexes, indexes[1:])]
+
+    def enharmonic_reduce(self, modifier_preference="contextual", context=None):
+        """return a single chroma from a set of enharmonic chromae
+
+        Natural chromae are preferred, then single sharps or flats.
+        ``modifier_preference`` chooses between a sharp and a flat:
+        ``"sharp"``, ``"flat"`` or ``"contextual"``.
+
+        Contextual spelling picks the chroma closest on the line of fifths
+        to ``context``, a Chroma or an iterable of nearby Chroma (such as
+        the tonic, or neighbouring notes). Given a context, it may return
+        a double sharp or flat, or a sharp over a natural. Without one,
+        it only breaks ties, with the common spellings around C:
+        C#, Eb, F#, Ab, Bb.
+
+        >>> western_chroma_set.chroma_by_value(5).enharmonic_reduce("contextual", FSHARP)
+        ESHARP
+        """
         # if there are no chroma in the set, raise value error
         if len(self) == 0:
             raise ValueError("No chromae in the provided set.")
@@ -416,6 +680,11 @@ class ChromaSet(set):
         if not self.is_enharmonic():
             raise ValueError("The chromae in the provided set are not enharmonic.")
 
+        if modifier_preference == "contextual":
+            centre = _fifths_centre(context)
+            if context is not None:
+                return min(self, key=lambda x: (abs(x.fifths - centre), x.index))
+
         for mod_val, chroma_set in self.modifier_groups(True).items():
             if len(chroma_set) == 1:
                 chroma, = chroma_set
@@ -427,12 +696,14 @@ class ChromaSet(set):
         for chroma in sorted_mod_group:
             if chroma.mod_val == 0:
                 return chroma
-            if chroma.mod_val > 0 and modifier_preference is "sharp":
+            if chroma.mod_val > 0 and modifier_preference == "sharp":
                 return chroma
-            if chroma.mod_val < 0 and modifier_preference is "flat":
+            if chroma.mod_val < 0 and modifier_preference == "flat":
                 return chroma
             ##if chroma.customary_modifier():
             ##    return chroma
+        if modifier_preference == "contextual":
+            return min(sorted_mod_group, key=lambda x: (abs(x.fifths - centre), x.index))
         return sorted_mod_group[0]
 
     def is_enharmonic(self):
@@ -505,6 +776,41 @@ class ChromaSet(set):
         return ChromaSet(set(self) - set(other))
 
 
+def _invalidating(method):
+    """Wrap an in-place set method so it drops the ChromaSet indexes."""
+    def wrapper(self, *args):
+        result = method(self, *args)
+        self._invalidate()
+        return result
+    wrapper.__name__ = method.__name__
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+for _name in ("discard", "remove", "pop", "clear", "update",
+              "intersection_update", "difference_update",
+              "symmetric_difference_update",
+              "__ior__", "__iand__", "__isub__", "__ixor__"):
+    setattr(ChromaSet, _name, _invalidating(getattr(set, _name)))
+
+
+class _FrozenChromaSet(ChromaSet):
+    """A read-only ChromaSet.
+
+    Returned by the indexed lookups of a ChromaSet
+    (``chroma_by_value``, ``chroma_by_letter``),
+    so that a single instance can be shared by every caller.
+    """
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("This ChromaSet is read-only. Copy it with ChromaSet(...) to modify it.")
+
+    add = discard = remove = pop = clear = update = _read_only
+    intersection_update = difference_update = symmetric_difference_update = _read_only
+    __ior__ = __iand__ = __isub__ = __ixor__ = _read_only
+
+_empty_chroma_set = _FrozenChromaSet()
+
+
 
 #class Modifier():
 #    """ Sharps and flats.
@@ -524,13 +830,13 @@ class ChromaSet(set):
 wcs = western_chroma_set = ChromaSet()
 
 white_notes = {
- "C" : (0, 0, "do"),
- "D" : (1, 2, "re"),
- "E" : (2, 4, "mi"),
- "F" : (3, 5, "fa"),
- "G" : (4, 7, "sol"),
- "A" : (5, 9, "la"),
- "B" : (6, 11, "ti")
+ "C" : (0, 0, "do", 0),
+ "D" : (1, 2, "re", 2),
+ "E" : (2, 4, "mi", 4),
+ "F" : (3, 5, "fa", -1),
+ "G" : (4, 7, "sol", 1),
+ "A" : (5, 9, "la", 3),
+ "B" : (6, 11, "ti", 5)
 }
 
 mods = {
@@ -589,6 +895,8 @@ for letter, letter_vals in white_notes.items():
         "unicode" : letter + mod_val["unicode"],
         "ascii" : letter + mod_val["ascii"],
         "verbose" : letter + " " + mod_val["verbose"],
-        "lilypond" : letter + mod_val["lilypond"]
+        "lilypond" : letter + mod_val["lilypond"],
+        "index" : letter_vals[0] * len(mods) + mod_val["value"] + 2,
+        "fifths" : letter_vals[3] + 7 * mod_val["value"]
         }
         setattr(module, chroma_name, Chroma(chroma_attrs))
@@ -1,6 +1,5 @@
 import collections
 import sys
-from functools import lru_cache
 
 from ophis import oph_utils
 
@@ -21,13 +20,18 @@ None,
 "thirteenth"
 ]
 
-class Quality():
+class Quality(oph_utils.FrozenSlotsMixin):
 
     instances = set()
 
+    __slots__ = (
+        "name", "short_name", "priority", "inverse",
+        "from_major", "from_minor", "from_augmented", "from_diminished", "from_perfect",
+    )
+
     def __init__(self, **kwargs):
         for key, value in kwargs.items():
-            setattr(self, key, value)
+            object.__setattr__(self, key, value)
 
         # instances.add(self)
 
@@ -42,6 +46,10 @@ class Quality():
     def __repr__(self):
         return self.name.upper()
 
+    def __reduce__(self):
+        # Pickled as the name of the module constant: MAJOR, DOUBLE_AUGMENTED...
+        return self.name.upper().replace(" ", "_")
+
     def __call__(self, number, octaves=None):
         """
         Returns an interval.
@@ -171,27 +179,55 @@ DOUBLE_AUGMENTED.inverse = DOUBLE_DIMINISHED
 
 
 
-class Interval(oph_utils.IntegerComparisonMixin, oph_utils.ArithmeticMixin):
+class Interval(oph_utils.FrozenSlotsMixin, oph_utils.IntegerComparisonMixin, oph_utils.ArithmeticMixin):
 
     instances = set()
 
+    __slots__ = ("name", "quality", "number", "half_steps", "distance", "index")
+
+    # Indexes over instances, kept up to date by _register.
+    _by_quality_number = {}
+    _by_quality = collections.defaultdict(set)
+    _by_number = collections.defaultdict(set)
+    _by_half_steps = collections.defaultdict(set)
+    # half_steps -> candidates sorted by quality priority
+    _by_priority = {}
+    # (quality, number, half_steps) -> result, cleared by _register
+    _candidates = {}
+    _lookups = {}
+
     def __new__(cls, **kwargs):
 
         try:
-            interval, = [x for x in cls.instances
-                if x.quality == kwargs["quality"] and
-                x.number == kwargs["number"]]
-        except:
+            interval = cls._by_quality_number[kwargs["quality"], kwargs["number"]]
+        except KeyError:
             interval = super().__new__(cls)
             for key, value in kwargs.items():
-                setattr(interval, key, value)
+                object.__setattr__(interval, key, value)
 
-            interval.distance = interval.number - 1
+            object.__setattr__(interval, "distance", interval.number - 1)
+            # position in order of creation, for integer-indexed tables
+            object.__setattr__(interval, "index", len(cls._by_quality_number))
 
-            cls.instances.add(interval)
+            cls._register(interval)
 
         return interval
 
+    @classmethod
+    def _register(cls, interval):
+        cls.instances.add(interval)
+        cls._by_quality_number[interval.quality, interval.number] = interval
+        cls._by_quality[interval.quality].add(interval)
+        cls._by_number[interval.number].add(interval)
+        if hasattr(interval, "half_steps"):
+            cls._by_half_steps[interval.half_steps].add(interval)
+            cls._by_priority[interval.half_steps] = sorted(
+                cls._by_half_steps[interval.half_steps],
+                key=lambda x: x.quality.priority
+            )
+        cls._candidates.clear()
+        cls._lookups.clear()
+
     ## def __init__(self, **kwargs):
 
 
@@ -246,6 +282,9 @@ class Interval(oph_utils.IntegerComparisonMixin, oph_utils.ArithmeticMixin):
     def __hash__(self):
         return hash((self.quality, self.number, self.half_steps))
 
+    def __reduce__(self):
+        return (_restore_interval, (self.quality, self.number))
+
     def __abs__(self):
         while int(self) > 12:
             self = self.DIMINISHED(P8)
@@ -259,37 +298,54 @@ class Interval(oph_utils.IntegerComparisonMixin, oph_utils.ArithmeticMixin):
 
         try:
              half_steps = half_steps%12
-        except:
+        except TypeError:
+            pass
+
+        key = (quality, number, half_steps)
+        try:
+            return cls._lookups[key]
+        except KeyError:
             pass
 
         try:
             interval, = cls.get_intervals(quality=quality, number=number, half_steps=half_steps)
 
         except ValueError:
-            candidates = [x for x in cls.instances if half_steps == x.half_steps]
-            interval, *_ = sorted(candidates, key=lambda x: x.quality.priority)
+            interval, *_ = cls._by_priority.get(half_steps, ())
 
+        cls._lookups[key] = interval
         return interval
 
 
 
     @classmethod
     def get_intervals(cls, *, quality=None, number=None, half_steps=None):
+        """Return a frozenset of the instances matching every given attribute.
+
+        Attributes which match no instance at all are ignored.
+        """
+
+        key = (quality, number, half_steps)
+        try:
+            return cls._candidates[key]
+        except KeyError:
+            pass
 
         candidate_sets = []
 
         if quality is not None:
-            candidate_sets.append({x for x in cls.instances if x.quality == quality})
+            candidate_sets.append(cls._by_quality.get(quality, ()))
 
         if number is not None:
-            candidate_sets.append({x for x in cls.instances if x.number == number})
+            candidate_sets.append(cls._by_number.get(number, ()))
 
         if half_steps is not None:
-            candidate_sets.append({x for x in cls.instances if x.half_steps == half_steps})
+            candidate_sets.append(cls._by_half_steps.get(half_steps, ()))
 
         candidate_sets = [x for x in candidate_sets if len(x) > 0]
 
-        return set.intersection(*candidate_sets)
+        candidates = cls._candidates[key] = frozenset(set.intersection(*candidate_sets))
+        return candidates
 
 
     @staticmethod
@@ -348,17 +404,35 @@ for q, n, s in base_intervals:
 
 
 
+def _restore_interval(quality, number):
+    """Return the Interval registered for quality and number, when unpickling."""
+    return Interval._by_quality_number[quality, number]
+
+
+
 ## Intervals of more than one octave
 
-@lru_cache(maxsize=None, typed=True)
-class QualifiedInterval(oph_utils.IntegerComparisonMixin, oph_utils.ArithmeticMixin):
+class QualifiedInterval(oph_utils.FrozenSlotsMixin, oph_utils.IntegerComparisonMixin, oph_utils.ArithmeticMixin):
     """
     An interval with an octave.
+
+    QualifiedIntervals are interned: while one is alive,
+    building it again returns the same instance.
     """
 
-    def __init__(self, interval, octaves=0):
-        self.interval = interval
-        self.octaves = octaves
+    instances = oph_utils.InternRegistry()
+
+    __slots__ = ("interval", "octaves", "__weakref__")
+
+    def __new__(cls, interval, octaves=0):
+        key = (interval, octaves)
+        qualified = cls.instances.get(key)
+        if qualified is None:
+            qualified = super().__new__(cls)
+            object.__setattr__(qualified, "interval", interval)
+            object.__setattr__(qualified, "octaves", octaves)
+            cls.instances.add(key, qualified)
+        return qualified
 
     def augmented(self, distance=1):
         if int(distance) == 0:
@@ -405,5 +479,33 @@ class QualifiedInterval(oph_utils.IntegerComparisonMixin, oph_utils.ArithmeticMi
     def __repr__(self):
         return self.interval.__repr__() + "^" + str(self.octaves)
 
+    def __reduce__(self):
+        return (self.__class__, (self.interval, self.octaves))
+
     def __int__(self):
         return int(self.interval) + self.octaves*int(P8)
+
+
+# Spelled intervals reduce by number rather than by half steps:
+# an octave is seven steps, so the remainder is the simple interval
+# a whole number of octaves away, with the same quality. Its number
+# lies between 1 and 7, but its half steps may not lie between 0 and 11:
+# d8 reduces to (d1, 1), and d1 is one half step below the unison.
+# Only twelve-half-step octaves can be reduced this way.
+
+def _check_octave_size(octv_size):
+    if octv_size != int(P8):
+        raise ValueError("Spelled intervals only reduce by octaves of " + str(int(P8)) + " half steps.")
+
+@oph_utils.octave_reduce.register(Interval)
+def _(x, octv_size=12):
+    _check_octave_size(octv_size)
+    octaves, distance = divmod(x.distance, 7)
+    if not octaves:
+        return x, 0
+    return Interval._by_quality_number[x.quality, distance + 1], octaves
+
+@oph_utils.octave_reduce.register(QualifiedInterval)
+def _(x, octv_size=12):
+    reduced, octaves = oph_utils.octave_reduce(x.interval, octv_size)
+    return reduced, x.octaves + octaves
@@ -0,0 +1,258 @@
+"""Compact, immutable pitch-class sets.
+
+A PitchClassSet holds the same information as a ChromaSet,
+packed into two integers:
+
+    pc_mask: 12 bits, one per pitch class (bit 0 is C).
+    spelling_mask: 35 bits, one per Chroma of the
+        western_chroma_set, by ``Chroma.index``.
+
+Every set operation is a handful of integer operations,
+so the cost does not depend on the number of members.
+"""
+
+from . import chroma as ch
+from . import interval
+
+__all__ = ["PitchClassSet"]
+
+
+_essential_set = ch.western_chroma_set
+_chromae = _essential_set.chromae_by_index()
+_modifiers = len(_chromae) // 7   # spellings per letter
+_letter_bits = (1 << _modifiers) - 1
+_all_pcs = (1 << _essential_set.modulo_base) - 1
+
+
+def _letter_table(letter, chroma_bits):
+    """Map each combination of one letter's spelling bits
+    to the union of ``chroma_bits(chroma)``."""
+    table = []
+    for chunk in range(1 << _modifiers):
+        bits = 0
+        for offset in range(_modifiers):
+            if chunk >> offset & 1:
+                bits |= chroma_bits(_chromae[letter * _modifiers + offset])
+        table.append(bits)
+    return tuple(table)
+
+
+# spelling mask -> pitch-class mask, one table per letter
+_pcs_by_letter = tuple(
+    _letter_table(letter, lambda chroma: 1 << int(chroma)) for letter in range(7)
+)
+
+# pitch-class mask -> mask of every spelling of those pitch classes,
+# built on first use
+_spellings_by_pcs = []
+
+# magnitude -> spelling-mask tables, built on first use
+_transpositions = {}
+
+
+def _build_spellings_by_pcs():
+    table = [0]
+    for mask in range(1, _all_pcs + 1):
+        low = mask & -mask
+        table.append(
+            table[mask ^ low] |
+            sum(1 << c.index for c in _essential_set.chroma_by_value(low.bit_length() - 1))
+        )
+    _spellings_by_pcs.extend(table)
+
+
+def _spelling_pcs(spelling_mask):
+    pcs = 0
+    for table in _pcs_by_letter:
+        pcs |= table[spelling_mask & _letter_bits]
+        spelling_mask >>= _modifiers
+    return pcs
+
+
+def _transposition_tables(magnitude):
+    try:
+        return _transpositions[magnitude]
+    except KeyError:
+        tables = tuple(
+            _letter_table(letter, lambda chroma: 1 << chroma.augment(magnitude).index)
+            for letter in range(7)
+        )
+        _transpositions[magnitude] = tables
+        return tables
+
+
+class PitchClassSet():
+    """An immutable set of pitch classes, with optional spellings.
+
+    Build one from Chroma (spelled) or integers (unspelled pitch classes):
+
+        >>> PitchClassSet({C, E, G})
+        PitchClassSet({C, E, G})
+
+        >>> PitchClassSet({0, 4, 7}) == PitchClassSet({C, E, G})
+        False
+
+    Length, iteration and integer membership are by pitch class.
+    Chroma membership is by spelling, as in a ChromaSet.
+
+        >>> 4 in PitchClassSet({C, E, G})
+        True
+
+        >>> FFLAT in PitchClassSet({C, E, G})
+        False
+    """
+
+    __slots__ = ("pc_mask", "spelling_mask")
+
+    def __init__(self, members=()):
+        if isinstance(members, PitchClassSet):
+            pcs, spellings = members.pc_mask, members.spelling_mask
+        else:
+            pcs = spellings = 0
+            for x in members:
+                if type(x) is ch.Chroma:
+                    spellings |= 1 << x.index
+                    pcs |= 1 << int(x)
+                else:
+                    pcs |= 1 << (int(x) % 12)
+        object.__setattr__(self, "pc_mask", pcs)
+        object.__setattr__(self, "spelling_mask", spellings)
+
+    @classmethod
+    def from_masks(cls, pc_mask=0, spelling_mask=0):
+        """Build a PitchClassSet directly from its bit masks.
+
+        The pitch classes of every spelling are always included.
+        """
+        pcset = cls.__new__(cls)
+        object.__setattr__(pcset, "pc_mask", (pc_mask & _all_pcs) | _spelling_pcs(spelling_mask))
+        object.__setattr__(pcset, "spelling_mask", spelling_mask)
+        return pcset
+
+    @classmethod
+    def from_chroma_set(cls, chroma_set):
+        return cls(chroma_set)
+
+    def to_chroma_set(self, modifier_preference="sharp"):
+        """Return a ChromaSet of the members.
+
+        Spelled members are returned as they are.
+        Unspelled pitch classes are spelled with ``modifier_preference``.
+        """
+        chroma_set = ch.ChromaSet(self.chromae())
+        unspelled = self.pc_mask & ~_spelling_pcs(self.spelling_mask)
+        for pc in _bits(unspelled):
+            chroma_set.add(_essential_set.chroma_by_value(pc).enharmonic_reduce(modifier_preference))
+        return chroma_set
+
+    def chromae(self):
+        """Iterate over the spelled members, as Chroma."""
+        return (_chromae[i] for i in _bits(self.spelling_mask))
+
+    def transpose(self, magnitude=1):
+        """Return a new set, with every member augmented by ``magnitude``.
+
+        Integers are half steps and rotate the pitch classes;
+        spellings follow ``Chroma.augment``.
+
+            >>> PitchClassSet({C, E, G}).transpose(M3)
+            PitchClassSet({E, GSHARP, B})
+        """
+        shift = int(magnitude) % 12
+        pcs = self.pc_mask
+        pcs = ((pcs << shift) | (pcs >> (12 - shift))) & _all_pcs
+        spellings = 0
+        if self.spelling_mask:
+            if type(magnitude) is not interval.Interval:
+                magnitude = shift
+            mask = self.spelling_mask
+            for table in _transposition_tables(magnitude):
+                spellings |= table[mask & _letter_bits]
+                mask >>= _modifiers
+        return self.from_masks(pcs, spellings)
+
+    def is_enharmonic(self):
+        """True if every member shares a single pitch class."""
+        return self.pc_mask & (self.pc_mask - 1) == 0
+
+    def pitch_classes(self):
+        return tuple(_bits(self.pc_mask))
+
+    def _coerce(self, other):
+        if isinstance(other, PitchClassSet):
+            return other
+        return PitchClassSet(other)
+
+    def __or__(self, other):
+        other = self._coerce(other)
+        return self.from_masks(self.pc_mask | other.pc_mask,
+                               self.spelling_mask | other.spelling_mask)
+
+    def __and__(self, other):
+        other = self._coerce(other)
+        return self.from_masks(self.pc_mask & other.pc_mask,
+                               self.spelling_mask & other.spelling_mask)
+
+    def __sub__(self, other):
+        other = self._coerce(other)
+        pcs = self.pc_mask & ~other.pc_mask
+        if not _spellings_by_pcs:
+            _build_spellings_by_pcs()
+        spellings = self.spelling_mask & ~other.spelling_mask & _spellings_by_pcs[pcs]
+        return self.from_masks(pcs, spellings)
+
+    __ror__ = __or__
+    __rand__ = __and__
+
+    def __le__(self, other):
+        other = self._coerce(other)
+        return (self.pc_mask & ~other.pc_mask == 0 and
+                self.spelling_mask & ~other.spelling_mask == 0)
+
+    def __ge__(self, other):
+        return self._coerce(other) <= self
+
+    def __contains__(self, x):
+        if type(x) is ch.Chroma:
+            return bool(self.spelling_mask >> x.index & 1)
+        return bool(self.pc_mask >> (int(x) % 12) & 1)
+
+    def __len__(self):
+        return bin(self.pc_mask).count("1")
+
+    def __iter__(self):
+        return _bits(self.pc_mask)
+
+    def __bool__(self):
+        return self.pc_mask != 0
+
+    def __eq__(self, other):
+        if not isinstance(other, PitchClassSet):
+            return NotImplemented
+        return self.pc_mask == other.pc_mask and self.spelling_mask == other.spelling_mask
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __hash__(self):
+        return hash((self.pc_mask, self.spelling_mask))
+
+    def __setattr__(self, attr, value):
+        raise AttributeError("You cannot reassign attributes of a PitchClassSet.")
+
+    def __reduce__(self):
+        return (self.__class__.from_masks, (self.pc_mask, self.spelling_mask))
+
+    def __repr__(self):
+        unspelled = self.pc_mask & ~_spelling_pcs(self.spelling_mask)
+        members = [repr(x) for x in self.chromae()] + [str(x) for x in _bits(unspelled)]
+        return "PitchClassSet({" + ", ".join(members) + "})"
+
+
+def _bits(mask):
+    """Yield the positions of the set bits of mask, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
@@ -1,4 +1,3 @@
-from functools import lru_cache
 import itertools
 
 from ophis import oph_utils
@@ -6,8 +5,7 @@ from ophis import oph_utils
 from . import interval as nt
 from . import chroma as ch
 
-@lru_cache(maxsize=None, typed=False)
-class Pitch(oph_utils.ArithmeticMixin, oph_utils.IntegerComparisonMixin):
+class Pitch(oph_utils.FrozenSlotsMixin, oph_utils.ArithmeticMixin, oph_utils.IntegerComparisonMixin):
     """
     A pitch is a named chroma with a specific octave.
     C is a chroma, Middle C is a pitch.
@@ -19,15 +17,63 @@ class Pitch(oph_utils.ArithmeticMixin, oph_utils.IntegerComparisonMixin):
     Middle C == C(0).
 
     Translations into or out of other systems/standards need to take this fact into account.
+
+    Pitches are interned: while a pitch is alive, building it again
+    returns the same instance.
+    Pitch(C, 0) is Pitch(C, 0)
+
+    Pitches from octave -8 to octave 7 are kept once built,
+    until Pitch.instances.clear().
     """
 
-    def __init__(self, chroma: ch.Chroma, octave: int):
-        self.chroma = chroma
-        self.octave = int(octave) # just in case
+    instances = oph_utils.InternRegistry(hold=lambda code: _held_low <= code < _held_high)
+
+    __slots__ = ("chroma", "octave", "__weakref__")
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Subclasses intern their own pitches, under the same codes.
+        cls.instances = oph_utils.InternRegistry(hold=Pitch.instances.hold)
+
+    def __new__(cls, chroma: ch.Chroma, octave: int):
+        return cls._interned(chroma, int(octave)) # just in case
+
+    @classmethod
+    def _interned(cls, chroma, octave):
+        # Pitches are registered by their packed code.
+        pitch = cls.instances.get(octave * _chroma_count + chroma.index)
+        if pitch is None:
+            pitch = cls._registered(chroma, octave)
+        return pitch
+
+    @classmethod
+    def _registered(cls, chroma, octave):
+        # Build a pitch which is not interned yet, and register it.
+        pitch = object.__new__(cls)
+        object.__setattr__(pitch, "chroma", chroma)
+        object.__setattr__(pitch, "octave", octave)
+        return cls.instances.add(octave * _chroma_count + chroma.index, pitch)
+
+    @property
+    def code(self):
+        """
+        The pitch packed into one integer:
+        octave * 35 + Chroma.index,
+        where Chroma.index is letter * 5 + modifier.
+        """
+        return self.octave * _chroma_count + self.chroma.index
+
+    @classmethod
+    def from_code(cls, code):
+        octave, index = divmod(code, _chroma_count)
+        return cls._interned(_chromae[index], octave)
 
     def __repr__(self):
         return self.chroma.__repr__() + "(" + str(self.octave) + ")"
 
+    def __reduce__(self):
+        return (self.__class__, (self.chroma, self.octave))
+
     def __str__(self):
         return self.__repr__()
 
@@ -35,38 +81,139 @@ class Pitch(oph_utils.ArithmeticMixin, oph_utils.IntegerComparisonMixin):
         """
         Return a signed integer, representing halfsteps from Middle C.
         """
-        return (self.octave * 12) + int(self.chroma)
+        return self.octave * _modulo + self.chroma.value
+
+    # Arithmetic is done on integers: the chroma index and
+    # half steps from Middle C. Tables only provide the spelling.
+
+    def __add__(self, other):
+        # The usual operands skip method_dispatch.
+        move = _moves.get(other.__class__)
+        if move is None:
+            return self.augmented(other)
+        return move(self, other, 1)
+
+    def __sub__(self, other):
+        move = _moves.get(other.__class__)
+        if move is None:
+            return self.diminished(other)
+        return move(self, other, -1)
 
     @oph_utils.method_dispatch
     def augmented(self, other):
-        if type(other) is nt.QualifiedInterval:
-            return ".."
         raise NotImplementedError
 
     @augmented.register(int)
     def _(self, other):
-        if other == 0:
-            return self
-        if other < 0:
-            return self.diminished(-other)
-        other_base, other_octave = oph_utils.octave_reduce(other)
-        chroma = self.chroma + other_base
-        octave = self.octave + other_octave
-        if int(chroma) < int(self.chroma):
-            octave = octave + 1
-        return Pitch(chroma, octave)
+        return _move_by_int(self, other, 1)
 
     @augmented.register(nt.Interval)
     def _(self, other):
-        chroma = self.chroma + other
-        octave = (self + int(other)).octave
-        return Pitch(chroma, octave)
+        return _move_by_interval(self, other, 1)
+
+    @augmented.register(nt.QualifiedInterval)
+    def _(self, other):
+        return _move_by_qualified_interval(self, other, 1)
+
+    @oph_utils.method_dispatch
+    def diminished(self, other):
+        raise NotImplementedError
 
-    @augmented.register(nt.QualifiedInterval.__wrapped__)
+    @diminished.register(int)
     def _(self, other):
-        x = self + other.interval
-        x.octave = x.octave + other.octaves
-        return x
+        return _move_by_int(self, other, -1)
+
+    @diminished.register(nt.Interval)
+    def _(self, other):
+        return _move_by_interval(self, other, -1)
+
+    @diminished.register(nt.QualifiedInterval)
+    def _(self, other):
+        return _move_by_qualified_interval(self, other, -1)
+
+
+_essential_set = ch.western_chroma_set
+_chromae = _essential_set.chromae_by_index()
+_chroma_count = len(_chromae)
+_modulo = _essential_set.modulo_base
+
+# chroma index * 12 + half steps -> chroma index,
+# spelled as Chroma.augment (with sharps) and Chroma.diminish (with flats)
+_sharp_steps = tuple(_essential_set.spelling("sharp")[(int(x) + n) % _modulo].index
+                     for x in _chromae for n in range(_modulo))
+_flat_steps = tuple(_essential_set.spelling("flat")[(int(x) - n) % _modulo].index
+                    for x in _chromae for n in range(_modulo))
+
+# (Interval.index, direction) -> chroma index by chroma index, None where no chroma spells it
+_interval_tables = {}
+
+# Codes of the pitches Pitch.instances holds for good: the usual octaves.
+_held_low = -8 * _chroma_count
+_held_high = 8 * _chroma_count
+
+
+def _interval_table(interval, direction):
+    key = (interval.index, direction)
+    try:
+        return _interval_tables[key]
+    except KeyError:
+        pass
+    indexes = []
+    for x in _chromae:
+        try:
+            if direction > 0:
+                indexes.append(x.augment(interval).index)
+            else:
+                indexes.append(x.diminish(interval).index)
+        except ValueError:
+            indexes.append(None)
+    table = _interval_tables[key] = tuple(indexes)
+    return table
+
+
+def _move_by_int(pitch, steps, direction):
+    steps *= direction
+    if steps == 0:
+        return pitch
+    chroma = pitch.chroma
+    if steps > 0:
+        index = _sharp_steps[chroma.index * _modulo + steps % _modulo]
+    else:
+        index = _flat_steps[chroma.index * _modulo + -steps % _modulo]
+    octave = (pitch.octave * _modulo + chroma.value + steps) // _modulo
+    moved = Pitch.instances.get(octave * _chroma_count + index)
+    if moved is None:
+        moved = Pitch._registered(_chromae[index], octave)
+    return moved
+
+
+def _move_by_interval(pitch, interval, direction, octaves=0):
+    try:
+        table = _interval_tables[(interval.index, direction)]
+    except KeyError:
+        table = _interval_table(interval, direction)
+    chroma = pitch.chroma
+    index = table[chroma.index]
+    if index is None:
+        raise ValueError("No chroma is that interval from " + repr(chroma) + ".")
+    half_steps = direction * (interval.half_steps + octaves * _modulo)
+    octave = (pitch.octave * _modulo + chroma.value + half_steps) // _modulo
+    moved = Pitch.instances.get(octave * _chroma_count + index)
+    if moved is None:
+        moved = Pitch._registered(_chromae[index], octave)
+    return moved
+
+
+def _move_by_qualified_interval(pitch, qualified, direction):
+    return _move_by_interval(pitch, qualified.interval, direction, qualified.octaves)
+
+
+# argument class -> function of (pitch, argument, direction) for Pitch + x and Pitch - x
+_moves = {
+    int: _move_by_int,
+    nt.Interval: _move_by_interval,
+    nt.QualifiedInterval: _move_by_qualified_interval,
+}
 
 # Calling a Chroma instance with an integer returns a Pitch.
 ch.Chroma.__call__.register(int, Pitch)
@@ -0,0 +1,238 @@
+"""Column-wise arrays of spelled pitches, backed by NumPy.
+
+A PitchArray stores a sequence of pitches as parallel arrays:
+
+    chroma_index: ``Chroma.index`` of each pitch, in the western_chroma_set.
+    octave: the octave of each pitch (Middle C is octave 0), from -128 to 127.
+    semitones: ``int(pitch)``, half steps from Middle C.
+
+Arithmetic, comparison and sorting work on whole arrays at once,
+with the same results as the equivalent loop over Pitch objects.
+
+NumPy is an optional dependency of Ophis, and is only
+needed by this module.
+"""
+
+import numpy as np
+
+from . import chroma as ch
+from . import interval as nt
+from . import pitch as pt
+from . import tuning as tn
+
+__all__ = ["PitchArray"]
+
+
+_essential_set = ch.western_chroma_set
+_chromae = _essential_set.chromae_by_index()
+_modulo = _essential_set.modulo_base
+
+chroma_values = np.array([int(x) for x in _chromae], dtype=np.int16)
+
+# [chroma index, half steps] -> chroma index
+_augment_sharp = np.array(pt._sharp_steps, dtype=np.int8).reshape(len(_chromae), _modulo)
+_diminish_flat = np.array(pt._flat_steps, dtype=np.int8).reshape(len(_chromae), _modulo)
+
+# (Interval, direction) -> chroma index by chroma index, -1 where no chroma spells it
+_interval_tables = {}
+
+_octave_limits = np.iinfo(np.int8)
+
+
+def _interval_table(magnitude, direction):
+    key = (magnitude, direction)
+    try:
+        return _interval_tables[key]
+    except KeyError:
+        pass
+    indexes = []
+    for x in _chromae:
+        try:
+            if direction > 0:
+                indexes.append(x.augment(magnitude).index)
+            else:
+                indexes.append(x.diminish(magnitude).index)
+        except ValueError:
+            indexes.append(-1)
+    table = _interval_tables[key] = np.array(indexes, dtype=np.int8)
+    return table
+
+
+def _spelling_table(modifier_preference):
+    """Return the chroma index used to spell each pitch class."""
+    return np.array([x.index for x in _essential_set.spelling(modifier_preference)], dtype=np.int8)
+
+
+def _octaves(octave):
+    """Return octave as int8, refusing octaves int8 cannot hold
+    rather than letting them wrap around."""
+    octave = np.asarray(octave)
+    if octave.dtype != np.int8 and octave.size:
+        if octave.min() < _octave_limits.min or octave.max() > _octave_limits.max:
+            raise ValueError("Octaves must lie between %d and %d." % (_octave_limits.min, _octave_limits.max))
+    return octave.astype(np.int8, copy=False)
+
+
+class PitchArray():
+    """A sequence of spelled pitches, stored column-wise.
+
+        >>> melody = PitchArray.from_pitches([C(0), E(0), G(0)])
+        >>> melody + M3
+        PitchArray([E(0), GSHARP(0), B(0)])
+
+        >>> (melody + 7).semitones
+        array([ 7, 11, 14], dtype=int16)
+
+    Adding an integer moves every pitch by that many half steps,
+    as ``Pitch + int`` does: upward motion is spelled with sharps,
+    downward motion with flats. Intervals and QualifiedIntervals
+    are spelled by letter, as ``Pitch + Interval`` is.
+    """
+
+    __hash__ = None
+
+    def __init__(self, chroma_index, octave, semitones=None):
+        self.chroma_index = np.asarray(chroma_index, dtype=np.int8)
+        self.octave = _octaves(octave)
+        if self.chroma_index.shape != self.octave.shape:
+            raise ValueError("chroma_index and octave must have the same shape.")
+        if semitones is not None:
+            semitones = np.asarray(semitones, dtype=np.int16)
+        self._semitones = semitones
+
+    @property
+    def semitones(self):
+        """Half steps from Middle C, computed on first use."""
+        if self._semitones is None:
+            self._semitones = self.octave.astype(np.int16) * _modulo + chroma_values[self.chroma_index]
+        return self._semitones
+
+    @classmethod
+    def from_pitches(cls, pitches):
+        """Build a PitchArray from an iterable of Pitch."""
+        pitches = list(pitches)
+        chroma_index = np.fromiter((x.chroma.index for x in pitches), dtype=np.int8, count=len(pitches))
+        octave = np.fromiter((x.octave for x in pitches), dtype=np.int64, count=len(pitches))
+        return cls(chroma_index, octave)
+
+    @classmethod
+    def from_semitones(cls, semitones, modifier_preference="sharp"):
+        """Build a PitchArray from half steps from Middle C,
+        spelling every pitch class the same way."""
+        semitones = np.asarray(semitones, dtype=np.int64)
+        chroma_index = _spelling_table(modifier_preference)[semitones % _modulo]
+        return cls(chroma_index, semitones // _modulo, semitones)
+
+    def to_pitches(self):
+        """Return a list of Pitch."""
+        return [pt.Pitch(_chromae[i], o) for i, o in zip(self.chroma_index.tolist(), self.octave.tolist())]
+
+    def chromae(self):
+        """Return a list of the Chroma of each pitch."""
+        return [_chromae[i] for i in self.chroma_index.tolist()]
+
+    def _moved(self, chroma_index, semitones):
+        chroma_index = np.asarray(chroma_index)
+        if (chroma_index < 0).any():
+            raise ValueError("No chroma spells this transposition for every pitch.")
+        return self.__class__(chroma_index, semitones // _modulo, semitones)
+
+    def augmented(self, other):
+        """Return a new PitchArray, moved up by other.
+
+        other can be an int, an array of ints (one per pitch),
+        an Interval or a QualifiedInterval.
+        """
+        if isinstance(other, nt.QualifiedInterval):
+            moved = self.augmented(other.interval)
+            return moved._moved(moved.chroma_index, moved.semitones.astype(np.int64) + other.octaves * _modulo)
+        if isinstance(other, nt.Interval):
+            return self._moved(_interval_table(other, 1)[self.chroma_index],
+                               self.semitones + int(other))
+        steps = np.asarray(other)
+        if steps.dtype.kind not in "iu":
+            return NotImplemented
+        steps = steps.astype(np.int64)
+        reduced = steps % _modulo
+        chroma_index = np.where(
+            steps > 0,
+            _augment_sharp[self.chroma_index, reduced],
+            np.where(steps < 0, _diminish_flat[self.chroma_index, -steps % _modulo], self.chroma_index)
+        )
+        return self._moved(chroma_index, self.semitones + steps)
+
+    def diminished(self, other):
+        """Return a new PitchArray, moved down by other."""
+        if isinstance(other, nt.QualifiedInterval):
+            moved = self.diminished(other.interval)
+            return moved._moved(moved.chroma_index, moved.semitones.astype(np.int64) - other.octaves * _modulo)
+        if isinstance(other, nt.Interval):
+            return self._moved(_interval_table(other, -1)[self.chroma_index],
+                               self.semitones - int(other))
+        steps = np.asarray(other)
+        if steps.dtype.kind not in "iu":
+            return NotImplemented
+        return self.augmented(-steps.astype(np.int64))
+
+    def __add__(self, other):
+        return self.augmented(other)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return self.diminished(other)
+
+    def _compared(self, other):
+        if isinstance(other, PitchArray):
+            return other.semitones
+        if isinstance(other, np.ndarray):
+            return other
+        return int(other)
+
+    def __eq__(self, other):
+        return self.semitones == self._compared(other)
+
+    def __ne__(self, other):
+        return self.semitones != self._compared(other)
+
+    def __lt__(self, other):
+        return self.semitones < self._compared(other)
+
+    def __le__(self, other):
+        return self.semitones <= self._compared(other)
+
+    def __gt__(self, other):
+        return self.semitones > self._compared(other)
+
+    def __ge__(self, other):
+        return self.semitones >= self._compared(other)
+
+    def frequencies(self, tuning=tn.equal_temperament):
+        """Return the frequency of each pitch in Hertz, in equal temperament unless tuning is given."""
+        return tuning.frequencies(self)
+
+    def argsort(self):
+        """Return the indexes which sort the pitches from low to high.
+
+        Enharmonic pitches keep their order.
+        """
+        return np.argsort(self.semitones, kind="stable")
+
+    def sorted(self):
+        """Return a new PitchArray, sorted from low to high."""
+        return self[self.argsort()]
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            return pt.Pitch(_chromae[self.chroma_index[key]], int(self.octave[key]))
+        semitones = None if self._semitones is None else self._semitones[key]
+        return self.__class__(self.chroma_index[key], self.octave[key], semitones)
+
+    def __len__(self):
+        return len(self.chroma_index)
+
+    def __iter__(self):
+        return iter(self.to_pitches())
+
+    def __repr__(self):
+        return "PitchArray([" + ", ".join(repr(x) for x in self.to_pitches()) + "])"
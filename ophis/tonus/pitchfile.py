@@ -0,0 +1,182 @@
+"""A compact binary file format for pitch sequences.
+
+A pitch file holds one sequence of pitches, with optional
+onset and duration columns:
+
+    header      32 bytes
+                magic         4s   b"OPHP"
+                version       u2
+                flags         u2   HAS_ONSETS | HAS_DURATIONS
+                essential set u4   essential_set_id() of the chroma set
+                count         u8   number of pitches
+                (padding)
+    records     count * 2 bytes: (Chroma.index i1, octave i1)
+    onsets      count * f8, 8-byte aligned, if HAS_ONSETS
+    durations   count * f8, 8-byte aligned, if HAS_DURATIONS
+
+All values are little-endian.
+
+PitchFile memory-maps the file read-only and exposes the columns
+as NumPy arrays over the mapping: opening a file of any size
+copies nothing, and processes reading the same file share its
+pages through the operating system's cache.
+
+    >>> write_pitch_file("melody.oph", PitchArray.from_pitches([C(0), E(0), G(0)]), onsets=[0, 1, 2])
+    >>> with PitchFile("melody.oph") as melody:
+    ...     melody.pitches + M3
+    PitchArray([E(0), GSHARP(0), B(0)])
+
+NumPy is an optional dependency of Ophis, and is needed by this module.
+"""
+
+import mmap
+import struct
+import zlib
+
+import numpy as np
+
+from . import chroma as ch
+from .pitcharray import PitchArray
+
+__all__ = ["PitchFile", "write_pitch_file", "essential_set_id"]
+
+
+MAGIC = b"OPHP"
+VERSION = 1
+
+HAS_ONSETS = 1
+HAS_DURATIONS = 2
+
+_header = struct.Struct("<4sHHIQ")
+_header_size = 32
+
+record_dtype = np.dtype([("chroma_index", "i1"), ("octave", "i1")])
+_time_dtype = np.dtype("<f8")
+
+
+def essential_set_id(chroma_set=ch.western_chroma_set):
+    """Return a 32-bit identifier of a chroma set's members and their indexes."""
+    names = [chroma_set.chroma_by_index(i).name for i in range(len(chroma_set))]
+    return zlib.crc32(",".join(names).encode("ascii"))
+
+
+def _aligned(offset, alignment=8):
+    return -(-offset // alignment) * alignment
+
+
+def _layout(count, flags):
+    """Return the offsets of (records, onsets, durations, end of file)."""
+    records = _header_size
+    offset = records + count * record_dtype.itemsize
+    onsets = durations = None
+    if flags & HAS_ONSETS:
+        onsets = offset = _aligned(offset)
+        offset = offset + count * _time_dtype.itemsize
+    if flags & HAS_DURATIONS:
+        durations = offset = _aligned(offset)
+        offset = offset + count * _time_dtype.itemsize
+    return records, onsets, durations, offset
+
+
+def _column(values, count, name):
+    values = np.ascontiguousarray(values, dtype=_time_dtype)
+    if values.shape != (count,):
+        raise ValueError(name + " must have one value per pitch.")
+    return values
+
+
+def write_pitch_file(path, pitches, onsets=None, durations=None):
+    """Write pitches (a PitchArray, or an iterable of Pitch) to path."""
+    if not isinstance(pitches, PitchArray):
+        pitches = PitchArray.from_pitches(pitches)
+    count = len(pitches)
+    flags = 0
+    if onsets is not None:
+        flags |= HAS_ONSETS
+        onsets = _column(onsets, count, "onsets")
+    if durations is not None:
+        flags |= HAS_DURATIONS
+        durations = _column(durations, count, "durations")
+
+    records = np.empty(count, dtype=record_dtype)
+    records["chroma_index"] = pitches.chroma_index
+    records["octave"] = pitches.octave
+    records_at, onsets_at, durations_at, end = _layout(count, flags)
+
+    with open(path, "wb") as f:
+        header = _header.pack(MAGIC, VERSION, flags, essential_set_id(), count)
+        f.write(header.ljust(_header_size, b"\0"))
+        f.write(records.tobytes())
+        for at, column in ((onsets_at, onsets), (durations_at, durations)):
+            if at is not None:
+                f.write(b"\0" * (at - f.tell()))
+                f.write(column.tobytes())
+
+
+class PitchFile():
+    """A pitch file, memory-mapped read-only.
+
+    Attributes:
+        pitches (PitchArray): a view of the records.
+        onsets, durations (numpy.ndarray): views of the columns,
+            or None if the file has none.
+        count (int): the number of pitches.
+        version (int): the format version of the file.
+
+    The arrays are read-only views of the mapping, and stay valid
+    after close() for as long as they are referenced.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._read()
+        except Exception:
+            self.close()
+            raise
+
+    def _read(self):
+        if len(self._map) < _header_size:
+            raise ValueError("Not a pitch file: too short.")
+        magic, version, flags, set_id, count = _header.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a pitch file.")
+        if version > VERSION:
+            raise ValueError("Unsupported pitch file version: " + str(version) + ".")
+        if set_id != essential_set_id():
+            raise ValueError("The pitch file was written for a different chroma set.")
+        records_at, onsets_at, durations_at, end = _layout(count, flags)
+        if len(self._map) < end:
+            raise ValueError("The pitch file is truncated.")
+
+        self.version = version
+        self.count = count
+        records = np.frombuffer(self._map, dtype=record_dtype, count=count, offset=records_at)
+        self.pitches = PitchArray(records["chroma_index"], records["octave"])
+        self.onsets = self.durations = None
+        if onsets_at is not None:
+            self.onsets = np.frombuffer(self._map, dtype=_time_dtype, count=count, offset=onsets_at)
+        if durations_at is not None:
+            self.durations = np.frombuffer(self._map, dtype=_time_dtype, count=count, offset=durations_at)
+
+    def close(self):
+        """Release this object's mapping.
+
+        The pages stay mapped while any array taken from the file is alive.
+        """
+        self.pitches = self.onsets = self.durations = None
+        try:
+            self._map.close()
+        except BufferError:
+            # still exported to arrays; released with the last of them
+            pass
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
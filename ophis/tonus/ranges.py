@@ -0,0 +1,163 @@
+"""Lazy ranges of pitches and intervals.
+
+PitchRange and IntervalRange behave like ``range``, over half steps:
+length, indexing, slicing, membership and ``index`` take
+constant time, and a Pitch or QualifiedInterval is only
+built when a member is accessed.
+
+    >>> violin = PitchRange(G(-1), A(3))
+    >>> len(violin)
+    50
+    >>> violin[1]
+    GSHARP(-1)
+    >>> E(2) in violin
+    True
+
+Like ``range``, the stop value is not included.
+Membership is by half steps, as ``==`` is for pitches.
+"""
+
+import collections.abc
+
+from . import chroma as ch
+from . import interval as nt
+from . import pitch as pt
+
+__all__ = ["PitchRange", "IntervalRange"]
+
+
+_essential_set = ch.western_chroma_set
+_modulo = _essential_set.modulo_base
+
+def _spelling(modifier_preference):
+    if modifier_preference not in ("sharp", "flat", "contextual"):
+        raise ValueError("spelling must be 'sharp', 'flat' or 'contextual'.")
+    return _essential_set.spelling(modifier_preference)
+
+
+class _HalfStepRange(collections.abc.Sequence):
+    """A range over half steps, whose members are built on access."""
+
+    __slots__ = ("_range",)
+
+    def __init__(self, start, stop=None, step=1):
+        if stop is None:
+            start, stop = 0, start
+        self._range = range(int(start), int(stop), int(step))
+
+    def _copy(self, half_steps):
+        new = object.__new__(self.__class__)
+        new._range = half_steps
+        return new
+
+    def _member(self, half_steps):
+        raise NotImplementedError
+
+    @property
+    def half_steps(self):
+        """The underlying range of half steps."""
+        return self._range
+
+    def __len__(self):
+        return len(self._range)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self._copy(self._range[key])
+        return self._member(self._range[key])
+
+    def __iter__(self):
+        member = self._member
+        return (member(x) for x in self._range)
+
+    def __reversed__(self):
+        member = self._member
+        return (member(x) for x in reversed(self._range))
+
+    def __contains__(self, x):
+        try:
+            return int(x) in self._range
+        except (TypeError, ValueError):
+            return False
+
+    def index(self, x):
+        return self._range.index(int(x))
+
+    def count(self, x):
+        return int(x in self)
+
+    def __bool__(self):
+        return bool(self._range)
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def _key(self):
+        return self._range
+
+
+class PitchRange(_HalfStepRange):
+    """
+    The pitches from start (included) to stop (excluded).
+
+    start and stop can be Pitches or integers (half steps from Middle C),
+    and step can be an integer or an Interval.
+    Each pitch class is always spelled the same way,
+    following ``spelling``: "sharp", "flat" or "contextual".
+
+        >>> list(PitchRange(C(0), C(1), M3, spelling="flat"))
+        [C(0), E(0), AFLAT(0)]
+    """
+
+    __slots__ = ("spelling", "_chromae")
+
+    def __init__(self, start, stop=None, step=1, spelling="sharp"):
+        super().__init__(start, stop, step)
+        self.spelling = spelling
+        self._chromae = _spelling(spelling)
+
+    def _copy(self, half_steps):
+        new = super()._copy(half_steps)
+        new.spelling = self.spelling
+        new._chromae = self._chromae
+        return new
+
+    def _member(self, half_steps):
+        octave, value = divmod(half_steps, _modulo)
+        return pt.Pitch._interned(self._chromae[value], octave)
+
+    def _key(self):
+        return (self._range, self.spelling)
+
+    def __repr__(self):
+        return "PitchRange(%r, %r, %d, spelling=%r)" % (
+            self._member(self._range.start), self._member(self._range.stop),
+            self._range.step, self.spelling)
+
+
+class IntervalRange(_HalfStepRange):
+    """
+    The intervals from start (included) to stop (excluded),
+    as QualifiedIntervals.
+
+    start and stop can be intervals or integers (half steps).
+    Each member is the usual spelling of its size within the octave
+    (``Interval.get_interval``), with the octaves above it.
+
+        >>> IntervalRange(3 * 12)[19]
+        Perfect(5)^1
+    """
+
+    __slots__ = ()
+
+    def _member(self, half_steps):
+        octaves, reduced = divmod(half_steps, _modulo)
+        return nt.QualifiedInterval(nt.Interval.get_interval(half_steps=reduced), octaves)
+
+    def __repr__(self):
+        return "IntervalRange(%d, %d, %d)" % (self._range.start, self._range.stop, self._range.step)
@@ -0,0 +1,151 @@
+"""Context-aware spelling of pitch sequences.
+
+Half steps (from MIDI, for example) carry no spelling:
+1 could be CSHARP or DFLAT. A Speller chooses a Chroma for
+every note of a sequence, so that the spellings
+
+    - stay close to the key, and
+    - form diatonic intervals with their neighbours
+      (C# - F becomes Db - F) wherever possible.
+
+Both are measured on the line of fifths (``Chroma.fifths``).
+The cheapest spelling of the whole sequence is found with one
+dynamic-programming pass, so the cost is linear in its length.
+
+    >>> spell([0, 4, 6, 7, 11], key=G)
+    [C, E, FSHARP, G, B]
+
+    >>> spell([1, 5, 8], key=C)
+    [DFLAT, F, AFLAT]
+"""
+
+import array
+
+from . import chroma as ch
+
+__all__ = ["Speller", "spell"]
+
+
+_essential_set = ch.western_chroma_set
+_modulo = _essential_set.modulo_base
+
+# Centre of each mode on the line of fifths, relative to the tonic.
+# Major keys centre between the tonic and its dominant (C major: C#, Eb, F#, Ab, Bb),
+# minor keys lean sharp so that the leading tone is spelled as such (A minor: G#, D#).
+mode_centres = {
+    "major": 1.5,
+    "minor": 0.5,
+}
+
+# (tonic index, mode) -> for each pitch class, a tuple of (chroma index, fifths, cost)
+_key_tables = {}
+
+
+def key_table(tonic, mode="major"):
+    """Return the spelling candidates of each pitch class in a key.
+
+    The table has one entry per pitch class: a tuple of
+    (chroma index, line of fifths position, cost) for each
+    Chroma with that value, cheapest first.
+    """
+    key = (tonic.index, mode)
+    try:
+        return _key_tables[key]
+    except KeyError:
+        pass
+    try:
+        centre = tonic.fifths + mode_centres[mode]
+    except KeyError:
+        raise ValueError("Unknown mode: " + repr(mode) + ".") from None
+    table = tuple(
+        tuple(sorted(
+            ((x.index, x.fifths, abs(x.fifths - centre)) for x in _essential_set.chroma_by_value(value)),
+            key=lambda candidate: (candidate[2], candidate[0])
+        ))
+        for value in range(_modulo)
+    )
+    _key_tables[key] = table
+    return table
+
+
+class Speller():
+    """Spells sequences of half steps in one key.
+
+    Args:
+        key (Chroma): the tonic. Defaults to C.
+        mode (str): ``"major"`` or ``"minor"``. Defaults to ``"major"``.
+        neighbour_weight (float): how much a non-diatonic interval between
+            neighbouring notes costs, relative to distance from the key.
+    """
+
+    def __init__(self, key=ch.C, mode="major", neighbour_weight=1.0):
+        self.key = key
+        self.mode = mode
+        self.neighbour_weight = neighbour_weight
+        self.table = key_table(key, mode)
+
+    def _transition(self, fifths, previous_fifths):
+        # Up to six fifths apart is a diatonic interval, or a tritone.
+        distance = abs(fifths - previous_fifths)
+        if distance <= 6:
+            return 0.0
+        return self.neighbour_weight * (distance - 6)
+
+    def spell_indexes(self, semitones):
+        """Return an ``array.array`` of the Chroma.index chosen for each note."""
+        table = self.table
+        transition = self._transition
+        candidates = []      # per note, the table entry used
+        backpointers = []    # per note, best previous candidate for each candidate
+        costs = ()
+        for value in semitones:
+            entry = table[int(value) % _modulo]
+            if not candidates:
+                costs = tuple(candidate[2] for candidate in entry)
+                backpointers.append(None)
+            else:
+                previous = candidates[-1]
+                new_costs = []
+                pointers = []
+                for index, fifths, cost in entry:
+                    best, best_cost = 0, None
+                    for i, (_, previous_fifths, _) in enumerate(previous):
+                        total = costs[i] + transition(fifths, previous_fifths)
+                        if best_cost is None or total < best_cost:
+                            best, best_cost = i, total
+                    new_costs.append(best_cost + cost)
+                    pointers.append(best)
+                costs = tuple(new_costs)
+                backpointers.append(pointers)
+            candidates.append(entry)
+
+        spelled = array.array("b", bytes(len(candidates)))
+        if not candidates:
+            return spelled
+        choice = min(range(len(costs)), key=lambda i: costs[i])
+        for position in range(len(candidates) - 1, -1, -1):
+            spelled[position] = candidates[position][choice][0]
+            if position:
+                choice = backpointers[position][choice]
+        return spelled
+
+    def spell(self, semitones, return_type="chroma"):
+        """Spell a sequence of half steps.
+
+        Args:
+            semitones (iterable of int): the notes, in half steps.
+                Only the pitch class of each note matters.
+            return_type (str): ``"chroma"`` (default) for a list of Chroma,
+                or ``"index"`` for an ``array.array`` of ``Chroma.index``.
+        """
+        indexes = self.spell_indexes(semitones)
+        if return_type == "index":
+            return indexes
+        if return_type == "chroma":
+            return [_essential_set.chroma_by_index(i) for i in indexes]
+        raise ValueError("return_type must be 'chroma' or 'index'.")
+
+
+def spell(semitones, key=ch.C, mode="major", return_type="chroma"):
+    """Spell a sequence of half steps in a key. See Speller."""
+    return Speller(key, mode).spell(semitones, return_type)
@@ -0,0 +1,248 @@
+"""Tuning systems: the frequency of each Pitch, in Hertz.
+
+    >>> equal_temperament.frequency(A(0))
+    440.0
+    >>> C(0).frequency()
+    261.6255653005986
+    >>> Pythagorean().frequency(E(0)) == Pythagorean().frequency(FFLAT(0))
+    False
+
+Remember that Middle C is C(0), so the A above it, A4 in scientific
+pitch notation, is A(0).
+
+Every tuning repeats at the octave. A tuning only decides how far
+above C(0) each Chroma is, in cents, at octave 0; the frequency of
+every Chroma in every octave from -128 to 127 is then computed once,
+and looked up by ``Pitch.code``. The same table is indexed by
+``frequencies``, which converts whole arrays at once with NumPy.
+"""
+
+import fractions
+import math
+
+from . import chroma as ch
+from . import interval as nt
+from . import pitch as pt
+
+__all__ = [
+    "Tuning", "EqualTemperament", "Pythagorean", "JustIntonation", "CentsTuning",
+    "equal_temperament",
+]
+
+
+_essential_set = ch.western_chroma_set
+_chromae = _essential_set.chromae_by_index()
+_chroma_count = len(_chromae)
+_modulo = _essential_set.modulo_base
+
+# octaves in the lookup table of Tuning.frequency
+_lowest_octave = -16
+_octaves = 32
+_offset = -_lowest_octave * _chroma_count
+
+# octaves in the array of Tuning.frequencies, as in a PitchArray
+_lowest_array_octave = -128
+_array_octaves = 256
+
+
+def ratio_cents(ratio):
+    """Return the size of a frequency ratio, in cents."""
+    return 1200 * math.log2(ratio)
+
+
+class Tuning():
+    """
+    A tuning system.
+
+    Subclasses define ``chroma_cents(chroma)``: the distance from
+    C(0) up to Pitch(chroma, 0), in cents.
+
+    Args:
+        reference (Pitch): the pitch whose frequency is given. Defaults to A(0).
+        frequency (float): the frequency of the reference pitch, in Hertz.
+    """
+
+    def __init__(self, reference=None, frequency=440.0):
+        if reference is None:
+            reference = pt.Pitch(ch.A, 0)
+        self.reference = reference
+        self.reference_frequency = float(frequency)
+        self._cents = tuple(float(self.chroma_cents(x)) for x in _chromae)
+        reference_cents = self.cents(reference)
+        # frequency of Pitch(chroma, 0), by chroma index
+        self._frequencies = tuple(
+            self.reference_frequency * 2.0 ** ((cents - reference_cents) / 1200)
+            for cents in self._cents
+        )
+        # by Pitch.code + _offset
+        self.table = tuple(
+            frequency * 2.0 ** octave
+            for octave in range(_lowest_octave, _lowest_octave + _octaves)
+            for frequency in self._frequencies
+        )
+        self._array = None
+
+    def chroma_cents(self, chroma):
+        raise NotImplementedError
+
+    def cents(self, pitch):
+        """Return the distance from C(0) up to pitch, in cents."""
+        return self._cents[pitch.chroma.index] + 1200 * pitch.octave
+
+    def frequency(self, pitch):
+        """Return the frequency of a Pitch, in Hertz."""
+        code = pitch.octave * _chroma_count + pitch.chroma.index + _offset
+        if 0 <= code < len(self.table):
+            return self.table[code]
+        return self._frequencies[pitch.chroma.index] * 2.0 ** pitch.octave
+
+    def frequencies(self, pitches, spelling="sharp"):
+        """Return a NumPy array of the frequencies of many pitches.
+
+        pitches can be a PitchArray, or integers (half steps from
+        Middle C), which are spelled following ``spelling``.
+        """
+        import numpy as np
+        from .pitcharray import PitchArray
+        if not isinstance(pitches, PitchArray):
+            pitches = PitchArray.from_semitones(pitches, spelling)
+        if self._array is None:
+            octaves = np.arange(_lowest_array_octave, _lowest_array_octave + _array_octaves, dtype=float)
+            self._array = (np.array(self._frequencies) * 2.0 ** octaves[:, None]).ravel()
+        codes = (pitches.octave.astype(np.intp) - _lowest_array_octave) * _chroma_count + pitches.chroma_index
+        return self._array[codes]
+
+    def __repr__(self):
+        return "%s(%r, %r)" % (self.__class__.__name__, self.reference, self.reference_frequency)
+
+
+class EqualTemperament(Tuning):
+    """
+    Twelve equal half steps to the octave.
+
+    Args:
+        a4 (float): the frequency of A(0), the A above Middle C.
+    """
+
+    def __init__(self, a4=440.0):
+        super().__init__(pt.Pitch(ch.A, 0), a4)
+
+    def chroma_cents(self, chroma):
+        return 100 * int(chroma)
+
+    def __repr__(self):
+        return "EqualTemperament(%r)" % self.reference_frequency
+
+
+class Pythagorean(Tuning):
+    """
+    Tuning by pure fifths (3:2).
+
+    Each Chroma is tuned by its position on the line of fifths
+    from C, so enharmonic chromae differ by a Pythagorean comma:
+    C# is higher than Db.
+    """
+
+    fifth = ratio_cents(1.5)
+
+    def chroma_cents(self, chroma):
+        octaves = (int(chroma) - 7 * chroma.fifths) // _modulo
+        return chroma.fifths * self.fifth + 1200 * octaves
+
+
+class JustIntonation(Tuning):
+    """
+    Tuning by whole-number ratios above a tonic.
+
+    Each Chroma is tuned by the Interval from the tonic up to it.
+    Intervals missing from ``ratios`` are equal-tempered.
+
+    Args:
+        tonic (Chroma): defaults to C.
+        ratios (dict): Interval -> frequency ratio.
+            Defaults to ``five_limit``.
+    """
+
+    five_limit = {
+        nt.P1: fractions.Fraction(1, 1),
+        nt.A1: fractions.Fraction(25, 24),
+        nt.m2: fractions.Fraction(16, 15),
+        nt.M2: fractions.Fraction(9, 8),
+        nt.A2: fractions.Fraction(75, 64),
+        nt.m3: fractions.Fraction(6, 5),
+        nt.M3: fractions.Fraction(5, 4),
+        nt.d4: fractions.Fraction(32, 25),
+        nt.P4: fractions.Fraction(4, 3),
+        nt.A4: fractions.Fraction(45, 32),
+        nt.d5: fractions.Fraction(64, 45),
+        nt.P5: fractions.Fraction(3, 2),
+        nt.A5: fractions.Fraction(25, 16),
+        nt.m6: fractions.Fraction(8, 5),
+        nt.M6: fractions.Fraction(5, 3),
+        nt.A6: fractions.Fraction(225, 128),
+        nt.d7: fractions.Fraction(128, 75),
+        nt.m7: fractions.Fraction(9, 5),
+        nt.M7: fractions.Fraction(15, 8),
+        nt.d8: fractions.Fraction(48, 25),
+    }
+
+    def __init__(self, tonic=ch.C, ratios=None, reference=None, frequency=440.0):
+        self.tonic = tonic
+        if ratios is None:
+            ratios = self.five_limit
+        # by Interval.index: intervals compare equal by size
+        self.ratios = {interval.index: ratio for interval, ratio in ratios.items()}
+        super().__init__(reference, frequency)
+
+    def chroma_cents(self, chroma):
+        interval = chroma - self.tonic
+        try:
+            cents = ratio_cents(self.ratios[interval.index])
+        except KeyError:
+            cents = 100 * int(interval)
+        octaves = (int(chroma) - int(self.tonic) - int(interval)) // _modulo
+        return 100 * int(self.tonic) + cents + 1200 * octaves
+
+    def __repr__(self):
+        return "JustIntonation(%r, reference=%r, frequency=%r)" % (
+            self.tonic, self.reference, self.reference_frequency)
+
+
+class CentsTuning(Tuning):
+    """
+    Tuning from a table of cents above C.
+
+    Args:
+        cents: a dict of Chroma or pitch class -> cents above C,
+            or a sequence of values, by pitch class.
+            A Chroma missing from a dict takes the value given for its
+            pitch class, or for another Chroma of its pitch class.
+            Pitch classes with no value are equal-tempered.
+    """
+
+    def __init__(self, cents, reference=None, frequency=440.0):
+        if not isinstance(cents, dict):
+            cents = dict(enumerate(cents))
+        self.by_chroma = {x.index: value for x, value in cents.items() if type(x) is ch.Chroma}
+        self.by_value = {int(x) % _modulo: value for x, value in cents.items() if type(x) is not ch.Chroma}
+        for x, value in cents.items():
+            if type(x) is ch.Chroma:
+                self.by_value.setdefault(int(x), value)
+        super().__init__(reference, frequency)
+
+    def chroma_cents(self, chroma):
+        try:
+            return self.by_chroma[chroma.index]
+        except KeyError:
+            return self.by_value.get(int(chroma), 100 * int(chroma))
+
+
+equal_temperament = EqualTemperament()
+
+
+def frequency(self, tuning=equal_temperament):
+    """Return the frequency of the pitch in Hertz, in equal temperament unless tuning is given."""
+    return tuning.frequency(self)
+
+# Pitches know their frequency.
+pt.Pitch.frequency = frequency
@@ -46,6 +46,9 @@ setup(
         'dev': [
             'python-boilerplate[dev]',
         ],
+        'numpy': [
+            'numpy',
+        ],
     },
 
     # Other configurations
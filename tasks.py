@@ -9,4 +9,18 @@ def configure(ctx):
     Instructions for preparing package for development.
     """
 
-    run("%s -m pip install .[dev] -r requirements.txt" % sys.executable)
\ No newline at end of file
+    run("%s -m pip install .[dev] -r requirements.txt" % sys.executable)
+
+@task
+def benchmark(ctx, save=False, threshold=None):
+    """
+    Runs the benchmark suite, and fails if a hot path regressed
+    against benchmarks/baselines.json. --save stores new baselines.
+    """
+
+    options = ""
+    if save:
+        options += " --save"
+    if threshold is not None:
+        options += " --threshold %s" % threshold
+    run("%s -m benchmarks.suite%s" % (sys.executable, options))
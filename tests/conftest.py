@@ -0,0 +1,10 @@
+import pytest
+import ophis
+
+
+@pytest.fixture
+def pitches():
+    """Every western chroma, in a low, a middle and a high octave."""
+    return [ophis.Pitch(chroma, octave)
+            for chroma in ophis.western_chroma_set
+            for octave in (-2, 0, 3)]
@@ -0,0 +1,54 @@
+import json
+
+import ophis
+from ophis.__main__ import main
+from ophis.armonica import corpus
+
+
+def write_corpus(directory):
+    (directory / "sub").mkdir()
+    (directory / "a.txt").write_text("C4 E4 G4 C5\n")
+    (directory / "sub" / "b.txt").write_text("C#4 E4 oops\nC#4")
+    (directory / "ignored.md").write_text("C4 C4 C4")
+    return [str(directory)]
+
+def test_analyze_file(tmp_path):
+    path = tmp_path / "melody.txt"
+    path.write_text("C4 E4 G4 C5 nonsense")
+    histograms = corpus.analyze_file(str(path))
+    assert (histograms.files, histograms.notes, histograms.unparsed) == (1, 4, 1)
+    assert histograms.pitches["C(4)"] == 1 and histograms.chromae["C"] == 2
+    assert histograms.intervals == {"M3": 1, "m3": 1, "P4": 1}
+
+def test_analyze_corpus_in_parallel(tmp_path):
+    paths = write_corpus(tmp_path)
+    serial = corpus.analyze_corpus(paths, workers=1)
+    parallel = corpus.analyze_corpus(paths, workers=2, chunk_size=1)
+    assert serial.as_dict() == parallel.as_dict()
+    assert (serial.files, serial.notes, serial.unparsed) == (2, 7, 1)
+    assert serial.chromae["CSHARP"] == 2
+
+def test_analyze_command(tmp_path):
+    paths = write_corpus(tmp_path)
+    output = str(tmp_path / "out.json")
+    assert main(["analyze"] + paths + ["--workers", "1", "--output", output]) == 0
+    with open(output) as f:
+        result = json.load(f)
+    assert result["notes"] == 7 and result["intervals"]["m3"] == 2
+    main(["analyze"] + paths + ["-w", "1", "-f", "csv", "-o", output])
+    with open(output) as f:
+        assert f.readline().strip() == "histogram,key,count"
+
+def test_unreadable_files_are_skipped(tmp_path, capsys):
+    paths = write_corpus(tmp_path)
+    (tmp_path / "latin1.txt").write_bytes("C4 E4 \xe9".encode("latin-1"))
+    missing = str(tmp_path / "missing.txt")
+    histograms = corpus.analyze_corpus(paths + [missing], workers=1)
+    assert (histograms.files, histograms.notes) == (2, 7)
+    assert sorted(histograms.skipped) == [str(tmp_path / "latin1.txt"), missing]
+    assert histograms.as_dict()["skipped"][missing] == "No such file or directory"
+    parallel = corpus.analyze_corpus(paths + [missing], workers=2, chunk_size=1)
+    assert parallel.as_dict() == histograms.as_dict()
+    output = str(tmp_path / "out.json")
+    assert main(["analyze", missing, "-o", output]) == 1
+    assert capsys.readouterr().err == "Ophis: skipped " + missing + ": No such file or directory\n"
@@ -0,0 +1,44 @@
+from benchmarks import suite
+
+
+def test_compare_flags_regressions():
+    baselines = {"calibration": 100.0, "fast": 50.0, "slow": 50.0, "gone": 10.0}
+    # this machine is twice as fast: timings are doubled before comparing
+    results = {"calibration": 50.0, "fast": 26.0, "slow": 40.0, "new": 1.0}
+    rows = {row[0]: row for row in suite.compare(results, baselines, threshold=0.25)}
+    assert sorted(rows) == ["fast", "slow"]
+    assert abs(rows["fast"][3] - 0.04) < 1e-9 and not rows["fast"][4]
+    assert abs(rows["slow"][3] - 0.6) < 1e-9 and rows["slow"][4]
+
+def test_import_time_is_not_calibrated():
+    baselines = {"calibration": 100.0, "import ophis": 10.0}
+    rows = suite.compare({"calibration": 50.0, "import ophis": 12.0}, baselines, threshold=0.25)
+    assert abs(rows[0][3] - 0.2) < 1e-9 and not rows[0][4]
+
+def test_confirm_keeps_the_best_measurement(monkeypatch):
+    baselines = {"calibration": 100.0, "steady": 10.0, "noisy": 10.0}
+    measured = []
+
+    def measure(only):
+        measured.append(list(only))
+        return {"calibration": 100.0, "noisy": 10.5}
+    monkeypatch.setattr(suite, "measure", measure)
+    rows = suite.compare({"calibration": 100.0, "steady": 10.0, "noisy": 20.0}, baselines)
+    rows = {row[0]: row for row in suite.confirm(rows, baselines)}
+    assert measured == [["noisy"]]
+    assert rows["noisy"][2] == 10.5 and not rows["noisy"][4]
+    assert suite.confirm([("slow", 1.0, 2.0, 1.0, True)], {}, retries=0)[0][4]
+
+def test_baselines_round_trip(tmp_path):
+    path = str(tmp_path / "baselines.json")
+    suite.save_baselines({"calibration": 1.234, "case": 5.0}, path, reference={"import ophis": 3.0})
+    assert suite.load_baselines(path) == {"calibration": 1.23, "case": 5.0}
+    # saving again keeps the reference
+    suite.save_baselines({"calibration": 1.0}, path)
+    assert suite.load_reference(path) == {"import ophis": 3.0}
+
+def test_stored_baselines_cover_every_case():
+    baselines = suite.load_baselines()
+    assert set(name for name, function, operations in suite.cases()) <= set(baselines)
+    assert "import ophis" in baselines
+    assert "import ophis" in suite.load_reference()
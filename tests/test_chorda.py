@@ -0,0 +1,93 @@
+import pickle
+
+import pytest
+
+import ophis
+from ophis.chorda import chord
+
+
+def test_identify_spelled_chords():
+    assert ophis.identify({ophis.C, ophis.E, ophis.G, ophis.B}) == ophis.Chord(ophis.C, "major seventh")
+    assert str(ophis.identify([ophis.FSHARP, ophis.A, ophis.C, ophis.E])) == "F#ø7"
+    assert str(ophis.identify([ophis.AFLAT, ophis.C, ophis.E])) == "Ab+"
+    assert str(ophis.identify([ophis.B, ophis.D, ophis.F, ophis.AFLAT])) == "B°7"
+    assert str(ophis.identify([ophis.GSHARP, ophis.B, ophis.D, ophis.F])) == "G#°7"
+    assert str(ophis.identify(ophis.ChromaSet([ophis.D, ophis.FSHARP, ophis.A, ophis.C]))) == "D7"
+    assert ophis.identify([ophis.C, ophis.D, ophis.E]) is None
+
+def test_identify_every_quality_on_every_root():
+    for quality in ophis.qualities:
+        for root in ophis.western_chroma_set:
+            members = quality.on(root)
+            if members is None:
+                continue
+            found = ophis.identify(members)
+            assert set(found) == set(members)
+            assert ophis.identify(ophis.PitchClassSet(members)).chromae == found.chromae
+
+def test_bass_and_pitch_classes():
+    assert str(ophis.identify([ophis.E(-1), ophis.G(-1), ophis.C(0)])) == "C/E"
+    assert ophis.identify([ophis.E(-1), ophis.G(-1), ophis.C(0)]).is_inverted()
+    c6 = [ophis.C(0), ophis.E(0), ophis.G(0), ophis.A(0)]
+    assert str(ophis.identify(c6)) == "C6"
+    assert str(ophis.identify([ophis.A(-1)] + c6[:3])) == "Am7"
+    assert str(ophis.identify([1, 5, 8])) == "Db"
+    assert str(ophis.identify([6, 10, 1])) == "F#"
+
+def test_chords_compare_by_spelling():
+    csharp, dflat = ophis.Chord(ophis.CSHARP, "major"), ophis.Chord(ophis.DFLAT, "major")
+    assert csharp != dflat
+    assert len({csharp, dflat, ophis.Chord(ophis.CSHARP, "major")}) == 2
+    assert ophis.Chord(ophis.C, "major", ophis.E) != ophis.Chord(ophis.C, "major", ophis.FFLAT)
+    assert len({ophis.Chord(ophis.C, "major", ophis.E), ophis.Chord(ophis.C, "major", ophis.FFLAT)}) == 2
+    over_bsharp = ophis.Chord(ophis.C, "major", ophis.BSHARP)
+    assert over_bsharp.is_inverted()
+    assert str(over_bsharp) == "C/B#"
+    assert over_bsharp != ophis.Chord(ophis.C, "major")
+    assert not ophis.Chord(ophis.C, "major", ophis.C).is_inverted()
+
+def test_identify_many():
+    chords = [[ophis.C, ophis.E, ophis.G], [0, 3, 7], [ophis.C, ophis.D]]
+    labels = [None if x is None else str(x) for x in ophis.identify_many(chords)]
+    assert labels == ["C", "Cm", None]
+
+def test_chords_are_immutable_and_pickle():
+    found = ophis.identify({ophis.C, ophis.E, ophis.G})
+    with pytest.raises(AttributeError):
+        found.root = ophis.D
+    assert pickle.loads(pickle.dumps(found)) == found
+    assert pickle.loads(pickle.dumps(found.quality)) is found.quality
+    with pytest.raises(ValueError):
+        ophis.Chord(ophis.GDUBSHARP, "major seventh")
+    assert chord.qualities[0].name == "major"
+
+def test_voice_leading():
+    from ophis.chorda import voiceleading
+    leading = ophis.voice_leading({ophis.C, ophis.E, ophis.G}, {ophis.C, ophis.F, ophis.A})
+    assert leading.distance == 3
+    assert list(leading) == [(ophis.C, ophis.C), (ophis.E, ophis.F), (ophis.G, ophis.A)]
+    assert leading.motions() == [0, 1, 2]
+    assert ophis.voice_leading_distance([0, 4, 7], [11, 2, 7]) == 3
+    # B - C is one half step, down or up
+    assert ophis.voice_leading_distance([11], [0]) == ophis.voice_leading_distance([0], [11]) == 1
+    seventh = ophis.voice_leading([ophis.C, ophis.E, ophis.G, ophis.BFLAT], [ophis.F, ophis.A, ophis.C])
+    assert seventh.distance == 4 and len(seventh) == 4
+    assert voiceleading.assignment([[4, 1, 3], [2, 0, 5], [3, 2, 2]]) == [1, 0, 2]
+
+def test_voice_leading_pitches():
+    c = [ophis.C(0), ophis.E(0), ophis.G(0)]
+    leading = ophis.voice_leading(c, [ophis.B(-1), ophis.D(0), ophis.G(0)])
+    assert leading.distance == 3 and leading.motions() == [-1, -2, 0]
+    assert ophis.voice_leading_distance(c, [ophis.C(1), ophis.E(1), ophis.G(1)]) == 36
+    with pytest.raises(TypeError):
+        ophis.voice_leading(c, [ophis.C, ophis.E])
+    with pytest.raises(ValueError):
+        ophis.voice_leading(c, [])
+
+def test_voice_leadings_against_many_targets():
+    targets = [[ophis.F, ophis.A, ophis.C], [2, 5, 9], 0b000010010001, ophis.PitchClassSet({7, 11, 2})]
+    distances = ophis.voice_leading_distances([ophis.C, ophis.E, ophis.G], targets)
+    assert distances == [3, 5, 0, 3]
+    assert [x.distance for x in ophis.voice_leadings([0, 4, 7], targets[:2])] == distances[:2]
+    # transpositions share a cache entry
+    assert ophis.voice_leading_distance([2, 6, 9], [2, 7, 11]) == 3
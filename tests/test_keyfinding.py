@@ -0,0 +1,69 @@
+import random
+
+import pytest
+import ophis
+
+np = pytest.importorskip("numpy")
+from ophis.armonica import keyfinding
+from ophis.tonus.pitcharray import PitchArray
+
+
+def melody(size=3000, seed=1):
+    """C major, then G major: size notes of each."""
+    rng = random.Random(seed)
+    scale = [0, 2, 4, 5, 7, 9, 11]
+    weights = [4, 1, 3, 1, 3, 1, 1]    # mostly the tonic triad
+    return [rng.choices(scale, weights)[0] + transposition + 12 * rng.randrange(-1, 2)
+            for transposition in (0, 7) for _ in range(size)]
+
+def test_keys_and_profiles():
+    assert len(keyfinding.keys) == 24 and len(set(keyfinding.keys)) == 24
+    assert keyfinding.keys[1] is ophis.Key(ophis.DFLAT)
+    assert keyfinding.keys[12 + 9] is ophis.Key(ophis.A, "minor")
+    matrix = keyfinding.profile_matrix(*keyfinding.profiles["krumhansl"])
+    assert np.allclose(matrix.mean(axis=1), 0) and np.allclose(np.linalg.norm(matrix, axis=1), 1)
+
+def test_find_key():
+    pitches = PitchArray.from_pitches([ophis.C(0), ophis.E(0), ophis.G(0), ophis.F(0),
+                                       ophis.D(0), ophis.B(-1), ophis.C(0)])
+    assert keyfinding.find_key(pitches) is ophis.Key(ophis.C)
+    assert keyfinding.find_key([ophis.A(0), ophis.C(1), ophis.E(1), ophis.GSHARP(0), ophis.A(0)]) is ophis.Key(ophis.A, "minor")
+    assert keyfinding.find_key(PitchArray.from_semitones([])) is None
+
+def test_key_finder_tracks_modulation():
+    notes = melody()
+    finder = keyfinding.KeyFinder(window=64)
+    estimates = list(finder.stream(notes))
+    assert estimates[2999] is ophis.Key(ophis.C)
+    assert estimates[-1] is ophis.Key(ophis.G)
+    assert finder.count == len(notes) and finder.histogram.sum() == 64
+    finder.reset()
+    assert finder.key() is None
+    finder.add(ophis.E)
+    assert finder.key() is not None
+
+def test_decay_rescales():
+    finder = keyfinding.KeyFinder(decay=0.95)
+    for note in melody(20000):
+        finder.add(note)
+    assert np.isfinite(finder.histogram).all()
+    assert finder.key() is ophis.Key(ophis.G)
+
+@pytest.mark.parametrize("arguments", [dict(), dict(window=16), dict(decay=0.9), dict(decay=0.999)])
+def test_batch_matches_stream(arguments):
+    notes = melody()
+    pitches = PitchArray.from_semitones(notes)
+    batch = keyfinding.find_keys(pitches, chunk_size=1000, **arguments)
+    assert batch == list(keyfinding.KeyFinder(**arguments).stream(pitches.to_pitches()))
+    indexes = keyfinding.find_keys(pitches, return_type="index", **arguments)
+    assert [keyfinding.keys[i] for i in indexes] == batch
+
+def test_bad_arguments():
+    with pytest.raises(ValueError):
+        keyfinding.KeyFinder(window=8, decay=0.5)
+    with pytest.raises(ValueError):
+        keyfinding.KeyFinder(decay=0)
+    with pytest.raises(ValueError):
+        keyfinding.KeyFinder(profiles="nonesuch")
+    with pytest.raises(ValueError):
+        keyfinding.find_keys([ophis.C(0)], return_type="chroma")
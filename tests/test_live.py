@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+import ophis
+from ophis.live import FakeSource, LiveProcessor
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+async def collect(processor, source):
+    return [event async for event in processor.process(source)]
+
+def test_events_are_spelled_and_labelled():
+    processor = LiveProcessor(key=ophis.Key(ophis.EFLAT), window=3)
+    events = run(collect(processor, FakeSource([63, 67, 70, 61])))
+    assert [(event.pitch.chroma.name, event.pitch.octave) for event in events] == \
+        [("EFLAT", 0), ("G", 0), ("BFLAT", 0), ("CSHARP", 0)]
+    assert [str(event.chord) for event in events] == ["None", "None", "Eb", "G°"]
+    assert events[2].chromae == ophis.ChromaSet([ophis.EFLAT, ophis.G, ophis.BFLAT])
+    assert processor.count == 4 and len(processor.latencies) == 4
+
+def test_transposition():
+    processor = LiveProcessor(transposition=ophis.M3, modifier_preference="flat")
+    events = run(collect(processor, FakeSource([60, 61, 47])))
+    assert [(event.pitch.chroma.name, event.pitch.octave) for event in events] == \
+        [("E", 0), ("F", 0), ("DSHARP", -1)]
+
+def test_backpressure():
+    async def main():
+        source = FakeSource(range(40, 90))
+        processor = LiveProcessor(queue_size=4)
+        events = processor.process(source)
+        await events.__anext__()
+        await asyncio.sleep(0.01)
+        sent = source.sent
+        await events.aclose()
+        return sent
+    # one processed, four queued, and one waiting for room
+    assert run(main()) <= 6
+
+class Closing(FakeSource):
+
+    closed = False
+
+    async def _notes(self):
+        try:
+            async for note in super()._notes():
+                yield note
+        finally:
+            self.closed = True
+
+async def left_running():
+    # let the loop finish closing what was stopped
+    for _ in range(10):
+        await asyncio.sleep(0)
+    return asyncio.all_tasks() - {asyncio.current_task()}
+
+def test_stopping_early_leaves_no_task_running():
+    async def closed():
+        source = Closing(range(40, 90))
+        processor = LiveProcessor(queue_size=4)
+        events = processor.process(source)
+        async for event in events:
+            if processor.count == 3:
+                # the reader fills the queue, and waits for room
+                await asyncio.sleep(0.01)
+                break
+        await events.aclose()
+        return source.closed, await left_running()
+
+    async def broken_off():
+        source = Closing(range(40, 90))
+        processor = LiveProcessor(queue_size=4)
+        async for event in processor.process(source):
+            if processor.count == 3:
+                await asyncio.sleep(0.01)
+                break
+        return await left_running(), source.closed
+
+    assert run(closed()) == (True, set())
+    assert run(broken_off()) == (set(), True)
+
+def test_batches_run_in_the_executor():
+    processor = LiveProcessor(batch=len, batch_size=10, max_pending_batches=1)
+    events = run(collect(processor, FakeSource(list(range(48, 84)) * 3, rate=5000)))
+    assert len(events) == 108
+    assert processor.batch_results == [10] * 10 + [8]
+
+def test_latency_percentiles():
+    processor = LiveProcessor()
+    assert processor.latency_percentiles() == {50: None, 90: None, 99: None}
+    processor.latencies.extend([0.001 * i for i in range(1, 101)])
+    assert processor.latency_percentiles((50, 99, 100)) == pytest.approx({50: 50, 99: 99, 100: 100})
+
+def test_source_errors_are_raised():
+    class Broken(FakeSource):
+        async def _notes(self):
+            yield 60
+            raise RuntimeError("device unplugged")
+    with pytest.raises(RuntimeError):
+        run(collect(LiveProcessor(), Broken([])))
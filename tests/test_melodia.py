@@ -0,0 +1,69 @@
+import pickle
+
+import pytest
+
+import ophis
+from ophis.melodia import scale
+
+
+def test_scale_members_and_degrees():
+    dorian = ophis.Scale(ophis.D, "dorian")
+    assert list(dorian) == [ophis.D, ophis.E, ophis.F, ophis.G, ophis.A, ophis.B, ophis.C]
+    assert dorian is ophis.Scale(ophis.D, "dorian")
+    harmonic = ophis.Scale(ophis.A, "harmonic minor")
+    assert harmonic.degree(ophis.GSHARP) == 7
+    assert harmonic.degree(ophis.G) is None
+    assert harmonic.chroma(8) == ophis.A
+    assert ophis.Scale(ophis.A, "aeolian") is ophis.Scale(ophis.A, "minor")
+
+def test_every_scale_is_spelled_on_seven_letters():
+    scales = ophis.Scale.all()
+    assert len(ophis.Key.all()) > 50
+    for s in scales:
+        assert sorted(x.base_num for x in s) == list(range(7))
+        assert bin(s.pc_mask).count("1") == 7
+    with pytest.raises(ValueError):
+        ophis.Scale(ophis.GDUBSHARP)
+    with pytest.raises(ValueError):
+        ophis.Key(ophis.D, "dorian")
+    with pytest.raises(ValueError):
+        ophis.Scale(ophis.C, "bebop")
+
+def test_scale_membership():
+    d_flat = ophis.Key(ophis.DFLAT)
+    assert ophis.DFLAT in d_flat
+    assert ophis.CSHARP not in d_flat
+    assert 1 in d_flat and 2 not in d_flat
+    assert ophis.F(3) in d_flat
+    assert d_flat.contains([ophis.DFLAT, ophis.F, ophis.AFLAT])
+    assert d_flat.pitch_class_set() == ophis.PitchClassSet(list(d_flat))
+
+def test_keys():
+    assert ophis.Key(ophis.A, "minor").signature == 0
+    assert ophis.Key(ophis.EFLAT).signature == -3
+    assert ophis.Key(ophis.FSHARP).signature == 6
+    assert ophis.Key(ophis.EFLAT).relative == ophis.Key(ophis.C, "minor")
+    assert ophis.Key(ophis.C, "minor").relative is ophis.Key(ophis.EFLAT)
+    assert ophis.Key(ophis.C).parallel is ophis.Key(ophis.C, "minor")
+
+def test_containing_matches_a_scan():
+    queries = [
+        [ophis.FSHARP, ophis.CSHARP],
+        [ophis.C, ophis.E, ophis.G],
+        [ophis.B, ophis.F],
+        [ophis.GSHARP, ophis.A, ophis.C],
+        [],
+    ]
+    for cls in (ophis.Key, ophis.Scale):
+        for query in queries:
+            expected = [s for s in cls.all() if all(x in s for x in query)]
+            assert list(cls.containing(query)) == expected
+            enharmonic = [s for s in cls.all() if all(int(x) in s for x in query)]
+            assert list(cls.containing(ophis.ChromaSet(query), spelled=False)) == enharmonic
+    assert ophis.Key.containing([ophis.C, ophis.CSHARP]) == ()
+    assert all(type(k) is ophis.Key for k in ophis.Key.containing([ophis.C]))
+
+def test_pickle_scales():
+    for s in (ophis.Scale(ophis.E, "phrygian"), ophis.Key(ophis.BFLAT, "minor")):
+        assert pickle.loads(pickle.dumps(s)) is s
+    assert "major" in scale.modes
@@ -1,3 +1,5 @@
+import gc
+
 import pytest
 import ophis
 
@@ -5,3 +7,80 @@ import ophis
 def test_project_defines_author_and_version():
     assert hasattr(ophis, '__author__')
     assert hasattr(ophis, '__version__')
+
+
+class _Instance():
+    pass
+
+def test_intern_registry_keeps_recent_instances():
+    registry = ophis.oph_utils.InternRegistry(maxsize=2)
+    instances = [_Instance() for _ in range(3)]
+    for i, instance in enumerate(instances):
+        assert registry.add(i, instance) is instance
+    assert registry.get(0) is instances[0]
+    assert registry.get(3) is None
+    info = registry.info()
+    assert (info.hits, info.misses, info.evictions) == (1, 1, 2)
+
+def test_intern_registry_is_weak():
+    registry = ophis.oph_utils.InternRegistry(maxsize=0)
+    instance = _Instance()
+    registry.add("key", instance)
+    assert "key" in registry
+    del instance
+    gc.collect()
+    assert "key" not in registry
+    assert registry.get("key") is None
+
+def test_octave_reduce():
+    octave_reduce = ophis.oph_utils.octave_reduce
+    assert octave_reduce(25) == (1, 2)
+    assert octave_reduce(11) == (11, 0)
+    assert octave_reduce(-1) == (11, -1)
+    assert octave_reduce(-12) == (0, -1)
+    assert octave_reduce(7, octv_size=5) == (2, 1)
+    assert octave_reduce(10**12 + 3) == (7, 83333333333)
+    for interval, reduced, octaves in [
+        (ophis.P8, ophis.P1, 1),
+        (ophis.d8, ophis.d1, 1),
+        (ophis.M3, ophis.M3, 0),
+        (ophis.QualifiedInterval(ophis.A8, 1), ophis.A1, 2),
+        (ophis.dubdim1, ophis.dubdim1, 0),
+        (ophis.QualifiedInterval(ophis.M3, -1), ophis.M3, -1),
+        (ophis.QualifiedInterval(ophis.d8, -2), ophis.d1, -1),
+    ]:
+        result = octave_reduce(interval)
+        assert result[0] is reduced and result[1] == octaves
+        assert 1 <= result[0].number <= 7
+        assert int(interval) == int(result[0]) + 12 * result[1]
+    with pytest.raises(ValueError):
+        octave_reduce(ophis.P8, octv_size=7)
+    with pytest.raises(ValueError):
+        octave_reduce(ophis.QualifiedInterval(ophis.M3, 1), octv_size=5)
+
+def test_octave_reduce_arrays():
+    np = pytest.importorskip("numpy")
+    remainders, octaves = ophis.oph_utils.octave_reduce(np.array([-13, 0, 11, 12, 40]))
+    assert remainders.tolist() == [11, 0, 11, 0, 4]
+    assert octaves.tolist() == [-2, 0, 0, 1, 3]
+
+def test_method_dispatch_caches_and_counts():
+
+    class Dispatched():
+        @ophis.oph_utils.method_dispatch
+        def describe(self, other):
+            return "object"
+
+        @describe.register(int)
+        def _(self, other):
+            return "int"
+
+    obj = Dispatched()
+    assert obj.describe(1) == "int"
+    assert obj.describe(True) == "int"
+    assert obj.describe("a") == "object"
+    Dispatched.describe.register(bool, lambda self, other: "bool")
+    assert obj.describe(True) == "bool"
+    assert obj.describe(2) == "int"
+    calls = Dispatched.describe.calls()
+    assert (calls[int], calls[bool], calls[str]) == (2, 2, 1)
@@ -0,0 +1,40 @@
+import pytest
+import ophis
+from ophis import parse
+
+
+def test_parse_chroma_spellings():
+    for chroma in ophis.western_chroma_set:
+        for text in (chroma.name, chroma.unicode, chroma.ascii, chroma.verbose, chroma.lilypond):
+            assert parse.parse_chroma(text) is chroma
+
+def test_parse_pitch():
+    assert parse.parse_pitch("C#4") is ophis.Pitch(ophis.CSHARP, 4)
+    assert parse.parse_pitch("Ebb-1") is ophis.Pitch(ophis.EDUBFLAT, -1)
+    assert parse.parse_pitch("C(0)") is ophis.Pitch(ophis.C, 0)
+    assert parse.parse_pitch(" BFLAT 2 ") is ophis.Pitch(ophis.BFLAT, 2)
+    with pytest.raises(ValueError):
+        parse.parse_pitch("H4")
+
+def test_parse_interval():
+    for interval in ophis.Interval.instances:
+        assert parse.parse_interval(interval.name) is interval
+        assert parse.parse_interval(repr(interval)) is interval
+        assert parse.parse_interval(str(interval).lower()) is interval
+    assert parse.parse_interval("M10") is ophis.QualifiedInterval(ophis.M3, 1)
+    assert parse.parse_interval("major tenth") is ophis.QualifiedInterval(ophis.M3, 1)
+    assert parse.parse_interval("P5^2") is ophis.QualifiedInterval(ophis.P5, 2)
+    assert parse.parse_interval("Perfect(5)^2") is ophis.QualifiedInterval(ophis.P5, 2)
+    with pytest.raises(ValueError):
+        parse.parse_interval("M4")
+
+def test_parse_many():
+    tokens = ["C#4", "Ebb-1", "M3", "P5^2", "major third", "d5", "CSHARP"]
+    assert list(parse.parse_many(tokens)) == [
+        ophis.Pitch(ophis.CSHARP, 4), ophis.Pitch(ophis.EDUBFLAT, -1), ophis.M3,
+        ophis.QualifiedInterval(ophis.P5, 2), ophis.M3, ophis.d5, ophis.CSHARP,
+    ]
+    assert parse.parse("A4") is ophis.Pitch(ophis.A, 4)
+    assert parse.parse("A4", kind="interval") is ophis.A4
+    with pytest.raises(ValueError):
+        list(parse.parse_many(["C4", "nonsense"]))
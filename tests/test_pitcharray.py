@@ -0,0 +1,69 @@
+import pytest
+import ophis
+
+np = pytest.importorskip("numpy")
+from ophis.tonus.pitcharray import PitchArray
+
+
+def test_pitch_array_round_trip(pitches):
+    array = PitchArray.from_pitches(pitches)
+    assert len(array) == len(pitches)
+    for x, y in zip(array.to_pitches(), pitches):
+        assert x is y
+    assert array[4] is pitches[4]
+    assert list(array.semitones) == [int(x) for x in pitches]
+
+def test_pitch_array_add_integer(pitches):
+    array = PitchArray.from_pitches(pitches)
+    for i in range(30):
+        for x, y in zip((array + i).to_pitches(), pitches):
+            assert x is y + i
+
+def test_pitch_array_add_interval(pitches):
+    array = PitchArray.from_pitches(pitches)
+    for interval in ophis.Interval.instances:
+        if int(interval) < 0:
+            continue
+        for x, y in zip((array + interval).to_pitches(), pitches):
+            assert x is y + interval
+    tenth = ophis.QualifiedInterval(ophis.M3, 1)
+    assert (PitchArray.from_pitches([ophis.C(0)]) + tenth)[0] is ophis.E(1)
+
+def test_pitch_array_subtract(pitches):
+    array = PitchArray.from_pitches(pitches)
+    for i in range(1, 30):
+        for x, y in zip((array - i).to_pitches(), pitches):
+            assert x.chroma is y.chroma.diminish(i)
+            assert int(x) == int(y) - i
+    assert (array + 5 - 5 == array).all()
+    assert (PitchArray.from_pitches([ophis.E(0)]) - ophis.M3)[0] is ophis.C(0)
+
+def test_pitch_array_compare_and_sort():
+    array = PitchArray.from_semitones([7, -3, 12, 0])
+    assert list(array < 1) == [False, True, False, True]
+    assert list(array == ophis.C(1)) == [False, False, True, False]
+    assert list(array.sorted().semitones) == [-3, 0, 7, 12]
+    flats = PitchArray.from_semitones([1, 3], "flat")
+    assert flats.chromae() == [ophis.DFLAT, ophis.EFLAT]
+
+def test_pitch_array_frequencies(pitches):
+    array = PitchArray.from_pitches(pitches)
+    for tuning in (ophis.equal_temperament, ophis.Pythagorean(), ophis.JustIntonation(ophis.D)):
+        assert list(array.frequencies(tuning)) == [x.frequency(tuning) for x in pitches]
+    assert list(ophis.equal_temperament.frequencies([-3, 9])) == [220.0, 440.0]
+
+def test_pitch_array_refuses_octaves_out_of_range():
+    highest = PitchArray.from_pitches([ophis.B(127)])
+    assert highest[0] is ophis.B(127)
+    with pytest.raises(ValueError):
+        PitchArray.from_pitches([ophis.C(128)])
+    with pytest.raises(ValueError):
+        PitchArray.from_semitones([-129 * 12])
+    with pytest.raises(ValueError):
+        highest + 1
+    with pytest.raises(ValueError):
+        highest + ophis.M3
+    with pytest.raises(ValueError):
+        PitchArray.from_pitches([ophis.C(0)]) - ophis.QualifiedInterval(ophis.P1, 200)
+    with pytest.raises(ValueError):
+        PitchArray.from_pitches([ophis.C(0)]) + 1000 * 12
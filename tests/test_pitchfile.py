@@ -0,0 +1,36 @@
+import pytest
+import ophis
+
+np = pytest.importorskip("numpy")
+from ophis.tonus.pitcharray import PitchArray
+from ophis.tonus.pitchfile import PitchFile, write_pitch_file
+
+
+def test_pitch_file_round_trip(tmp_path, pitches):
+    path = str(tmp_path / "pitches.oph")
+    onsets = np.arange(len(pitches), dtype=float) / 2
+    write_pitch_file(path, pitches, onsets=onsets)
+    with PitchFile(path) as pitch_file:
+        assert len(pitch_file) == len(pitches)
+        for x, y in zip(pitch_file.pitches.to_pitches(), pitches):
+            assert x is y
+        assert (pitch_file.onsets == onsets).all()
+        assert pitch_file.durations is None
+        assert not pitch_file.onsets.flags.writeable
+        moved = pitch_file.pitches + ophis.M3
+    assert moved[0] is pitches[0] + ophis.M3
+
+def test_pitch_file_columns_and_empty_files(tmp_path, pitches):
+    path = str(tmp_path / "empty.oph")
+    write_pitch_file(path, PitchArray.from_pitches([]), onsets=[], durations=[])
+    with PitchFile(path) as pitch_file:
+        assert len(pitch_file.pitches) == 0
+        assert len(pitch_file.durations) == 0
+    with pytest.raises(ValueError):
+        write_pitch_file(path, pitches, durations=[1.0])
+
+def test_pitch_file_rejects_other_files(tmp_path):
+    path = tmp_path / "other.oph"
+    path.write_bytes(b"not a pitch file, but long enough to have a header")
+    with pytest.raises(ValueError):
+        PitchFile(str(path))
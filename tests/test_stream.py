@@ -0,0 +1,98 @@
+import random
+
+import pytest
+
+import ophis
+from ophis import stream
+
+
+def melody(size=2000, seed=0):
+    rng = random.Random(seed)
+    chromae = [ophis.C, ophis.CSHARP, ophis.D, ophis.EFLAT, ophis.E, ophis.F, ophis.FSHARP,
+               ophis.G, ophis.AFLAT, ophis.A, ophis.BFLAT, ophis.B, ophis.ESHARP, ophis.CFLAT]
+    return [ophis.Pitch(rng.choice(chromae), rng.randrange(-3, 3)) for _ in range(size)]
+
+# double sharps and flats, which intervals can move off the line of fifths
+doubles = [ophis.DDUBSHARP(0), ophis.BDUBSHARP(-1), ophis.GDUBSHARP(2),
+           ophis.FDUBFLAT(1), ophis.CDUBFLAT(0), ophis.BDUBFLAT(-2)]
+
+def spelled(pitches):
+    # Pitch equality compares half steps only
+    return [(x.chroma.name, x.octave) for x in pitches]
+
+def results(stage, pitch):
+    try:
+        return spelled(stage([pitch]))
+    except ValueError:
+        return ValueError
+
+def expected(func, pitch):
+    try:
+        return spelled([func(pitch)])
+    except ValueError:
+        return ValueError
+
+@pytest.mark.parametrize("magnitude", [ophis.M3, ophis.m2, ophis.A4, ophis.d5, ophis.P8,
+                                       ophis.QualifiedInterval(ophis.M3, 1), 0, 5, 13])
+def test_transpose_matches_pitch_arithmetic(magnitude):
+    up, down = stream.transpose(magnitude), stream.transpose(magnitude, down=True)
+    for pitch in melody(300) + doubles:
+        assert results(up, pitch) == expected(lambda x: x + magnitude, pitch)
+        assert results(down, pitch) == expected(lambda x: x - magnitude, pitch)
+
+def test_affine_stages_fuse():
+    pipeline = stream.transpose(ophis.M3) | stream.transpose(ophis.m3) | stream.invert_around(ophis.C(0))
+    assert len(pipeline.steps) == 1 and len(pipeline.steps[0].stages) == 1
+    pitches = melody()
+    stepwise = stream.invert_around(ophis.C(0))(x + ophis.P5 for x in pitches)
+    assert spelled(pipeline(pitches)) == spelled(stepwise)
+    assert spelled(stream.invert_around(ophis.C(0))([ophis.E(0), ophis.G(0), ophis.FSHARP(0)])) == \
+        [("AFLAT", -1), ("F", -1), ("GFLAT", -1)]
+
+def test_fused_transpositions_leave_the_line_of_fifths_one_step_at_a_time():
+    assert spelled(stream.transpose(ophis.M3)([ophis.DDUBSHARP(0)])) == [("GSHARP", 0)]
+    pipeline = stream.transpose(ophis.M3) | stream.transpose(ophis.A4) | stream.transpose(ophis.m2)
+    assert len(pipeline.steps) == 1
+    for pitch in melody(300) + doubles:
+        assert results(pipeline, pitch) == expected(lambda x: x + ophis.M3 + ophis.A4 + ophis.m2, pitch)
+    with pytest.raises(ValueError):
+        list(stream.invert_around(ophis.C(0))([ophis.BDUBSHARP(0)]))
+
+def test_register_stages():
+    assert spelled(stream.fold_octaves()([ophis.C(-2), ophis.B(3), ophis.BSHARP(2)])) == \
+        [("C", 0), ("B", 0), ("BSHARP", 0)]
+    clamp = stream.clamp_register(ophis.G(-1), ophis.G(0))
+    assert list(clamp([ophis.C(-3), ophis.G(-1), ophis.A(2), ophis.G(0)])) == \
+        [ophis.C(0), ophis.G(-1), ophis.A(-1), ophis.G(0)]
+    assert list(stream.in_range(ophis.C(0), ophis.C(1))([ophis.B(-1), ophis.C(0), ophis.D(1)])) == [ophis.C(0)]
+    with pytest.raises(ValueError):
+        stream.clamp_register(ophis.C(0), ophis.G(0))
+
+def test_respell():
+    assert spelled(stream.respell("flat")([ophis.CSHARP(0), ophis.ESHARP(1)])) == [("DFLAT", 0), ("F", 1)]
+    in_a = stream.respell("flat", key=ophis.Key(ophis.A))
+    assert spelled(in_a([ophis.DFLAT(0), ophis.BFLAT(0)])) == [("CSHARP", 0), ("BFLAT", 0)]
+
+def test_pipeline_is_lazy():
+    def pitches():
+        yield ophis.C(0)
+        yield ophis.D(0)
+        raise AssertionError("read too far")
+    pipeline = stream.transpose(2) | stream.window(2)
+    results = pipeline(pitches())
+    assert next(results) == (ophis.D(0), ophis.E(0))
+    assert list(stream.window(2, step=2)(melody(5))) == [tuple(melody(5)[:2]), tuple(melody(5)[2:4])]
+
+def test_read_notes(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("C4 E4 oops\nG4\n")
+    pipeline = stream.transpose(ophis.P5) | stream.fold_octaves()
+    assert spelled(pipeline(stream.read_notes(str(path)))) == [("G", 0), ("B", 0), ("D", 0)]
+
+def test_read_pitch_files(tmp_path):
+    pytest.importorskip("numpy")
+    from ophis.tonus.pitchfile import write_pitch_file
+    pitches = melody(100)
+    path = str(tmp_path / "notes.oph")
+    write_pitch_file(path, pitches)
+    assert spelled(stream.read_notes(path, chunk_size=7)) == spelled(pitches)
@@ -1,6 +1,8 @@
 import pytest
 import ophis
 import itertools
+import pickle
+import gc
 
 # Chroma Tests
 
@@ -49,6 +51,46 @@ def test_chroma_set_enharmonic_checking():
             assert not enharmonic_set.is_enharmonic()
 
 
+def test_chroma_set_indexed_lookups():
+    wcs = ophis.western_chroma_set
+    for chroma in wcs:
+        by_value = wcs.chroma_by_value(chroma)
+        assert chroma in by_value
+        assert all(x == chroma for x in by_value)
+        assert by_value is wcs.chroma_by_value(int(chroma) + 12)
+        by_letter = wcs.chroma_by_letter(chroma.base_num)
+        assert len(by_letter) == 5
+        assert by_letter is wcs.chroma_by_letter(chroma.base)
+    with pytest.raises(TypeError):
+        wcs.chroma_by_value(0).add(ophis.CSHARP)
+
+def test_chroma_set_index_follows_changes():
+    s = ophis.ChromaSet({ophis.C, ophis.E})
+    assert len(s.chroma_by_value(1)) == 0
+    s.add(ophis.CSHARP)
+    s.add(ophis.DFLAT)
+    assert s.chroma_by_value(1) == {ophis.CSHARP, ophis.DFLAT}
+    s.discard(ophis.DFLAT)
+    assert set(s.chroma_by_value(1)) == {ophis.CSHARP}
+    s |= {ophis.DFLAT}
+    assert len(s.chroma_by_letter("D")) == 1
+
+def test_chroma_set_tables():
+    wcs = ophis.western_chroma_set
+    chromae = wcs.chromae_by_index()
+    assert chromae is wcs.chromae_by_index()
+    assert all(x.index == i for i, x in enumerate(chromae)) and len(chromae) == len(wcs)
+    assert [x.name for x in wcs.spelling("flat")[:4]] == ["C", "DFLAT", "D", "EFLAT"]
+    assert wcs.spelling("sharp")[1] is ophis.CSHARP
+    in_a = wcs.spelling("flat", key=ophis.Key(ophis.A))
+    assert in_a[1] is ophis.CSHARP and in_a[10] is ophis.BFLAT
+    s = ophis.ChromaSet({ophis.C, ophis.E})
+    assert [x.name for x in s.chromae_by_index() if x is not None] == ["C", "E"]
+    s.add(ophis.D)
+    assert s.chromae_by_index()[ophis.D.index] is ophis.D
+    s.discard(ophis.E)
+    assert not any(x is ophis.E for x in s.chromae_by_index())
+
 def test_augment_chroma():
     assert ophis.G.augment() is ophis.GSHARP
     assert ophis.B.augment() is ophis.C
@@ -57,6 +99,19 @@ def test_augment_chroma():
         for i in range(12):
             assert int(chroma.augment(i)) == (int(chroma) + i)%12
 
+def test_augment_chroma_by_interval():
+    assert ophis.C.augment(ophis.M3) is ophis.E
+    assert ophis.E.augment(ophis.A4, "flat") is ophis.ASHARP
+    assert ophis.E.diminish(ophis.M3) is ophis.C
+    for chroma in ophis.western_chroma_set:
+        for interval in ophis.Interval.instances:
+            augmented = chroma.augment(interval)
+            assert augmented in ophis.western_chroma_set
+            assert int(augmented) == (int(chroma) + int(interval)) % 12
+            letter = (chroma.base_num + interval.distance) % 7
+            if any(x.base_num == letter for x in augmented.enharmonics()):
+                assert augmented.base_num == letter
+
 def test_diminish_chroma():
     assert ophis.G.diminish() == ophis.GFLAT
     # should test IS Gflat.
@@ -100,6 +155,22 @@ def test_subtract_chroma_from_chroma():
             assert x - z == y
             assert z + y == x
 
+def test_interval_matrix():
+    wcs = ophis.western_chroma_set
+    matrix = wcs.interval_matrix()
+    assert matrix is wcs.interval_matrix()
+    assert matrix[ophis.G.index][ophis.C.index] is ophis.P5
+    for x in wcs:
+        for y in wcs:
+            assert matrix[x.index][y.index] is x - y
+
+def test_interval_sequence():
+    wcs = ophis.western_chroma_set
+    melody = [ophis.C, ophis.E, ophis.G, ophis.FSHARP, ophis.C]
+    assert wcs.interval_sequence(melody) == [ophis.M3, ophis.m3, ophis.M7, ophis.d5]
+    assert wcs.interval_sequence(melody) == [y - x for x, y in zip(melody, melody[1:])]
+    assert wcs.interval_sequence([ophis.C]) == []
+
 def test_augment_equals_addition():
     assert ophis.AFLAT.augment(5) == ophis.AFLAT + 5
     for chroma in ophis.western_chroma_set:
@@ -154,6 +225,220 @@ def test_interval_inversions():
     for interval in ophis.Interval.instances:
         assert interval.inverted().inverted() is interval
 
-def _pitch_ocatave_arithmetic():
+def test_get_interval():
+    assert ophis.Interval.get_interval(half_steps=4) is ophis.M3
+    assert ophis.Interval.get_interval(half_steps=4, number=4) is ophis.d4
+    assert ophis.Interval.get_interval(half_steps=16, number=3) is ophis.M3
+    assert ophis.Interval.get_interval(half_steps=6) is ophis.d5
+    for interval in ophis.Interval.instances:
+        assert ophis.Interval(quality=interval.quality, number=interval.number) is interval
+        assert ophis.Interval.get_interval(
+            quality=interval.quality, number=interval.number) is interval
+        assert interval in ophis.Interval.get_intervals(half_steps=interval.half_steps)
+
+def test_get_intervals():
+    thirds = ophis.Interval.get_intervals(number=3)
+    assert thirds == {x for x in ophis.Interval.instances if x.number == 3}
+    assert ophis.Interval.get_intervals(number=3, half_steps=3) == {ophis.m3}
+    assert ophis.Interval.get_intervals(quality=ophis.PERFECT, number=3) == set()
+    assert ophis.Interval.get_intervals(number=3, half_steps=99) == thirds
+
+def test_pitch_octave_arithmetic():
     assert ophis.Pitch(ophis.C, 1) - 1 == ophis.Pitch(ophis.B, 0)
     assert ophis.Pitch(ophis.B, 2) + 1 == ophis.Pitch(ophis.C, 3)
+
+def test_pitch_arithmetic_is_reversible():
+    for chroma in ophis.western_chroma_set:
+        pitch = ophis.Pitch(chroma, 0)
+        for n in range(-25, 25):
+            assert int(pitch + n) == int(pitch) + n
+            assert (pitch + n) - n == pitch
+        if "DUB" in chroma.name:
+            continue
+        for interval in (ophis.m2, ophis.M3, ophis.P5, ophis.P8):
+            assert int(pitch - interval) == int(pitch) - int(interval)
+            assert int(pitch + ophis.QualifiedInterval(interval, 1)) == int(pitch) + int(interval) + 12
+    assert ophis.Pitch(ophis.E, 0) - ophis.M3 is ophis.Pitch(ophis.C, 0)
+    assert ophis.Pitch(ophis.C, 0) - ophis.M3 is ophis.Pitch(ophis.AFLAT, -1)
+
+def test_pitch_code_round_trip():
+    for chroma in ophis.western_chroma_set:
+        for octave in (-2, 0, 5):
+            pitch = ophis.Pitch(chroma, octave)
+            assert ophis.Pitch.from_code(pitch.code) is pitch
+
+# PitchClassSet Tests
+
+def test_chroma_index_round_trip():
+    for chroma in ophis.western_chroma_set:
+        assert ophis.western_chroma_set.chroma_by_index(chroma.index) is chroma
+
+def test_pitch_class_set_round_trip():
+    for x, y in itertools.combinations(ophis.western_chroma_set, 2):
+        chroma_set = ophis.ChromaSet({x, y})
+        pcset = ophis.PitchClassSet(chroma_set)
+        assert set(pcset.to_chroma_set()) == set(chroma_set)
+        assert pcset.is_enharmonic() == chroma_set.is_enharmonic()
+        assert x in pcset and int(y) in pcset
+
+def test_pitch_class_set_operations():
+    c_major = ophis.PitchClassSet({ophis.C, ophis.E, ophis.G})
+    a_minor = ophis.PitchClassSet({ophis.A, ophis.C, ophis.E})
+    assert c_major & a_minor == ophis.PitchClassSet({ophis.C, ophis.E})
+    assert len(c_major | a_minor) == 4
+    assert c_major - a_minor == ophis.PitchClassSet({ophis.G})
+    assert ophis.PitchClassSet({ophis.C}) <= c_major
+    assert ophis.CSHARP not in ophis.PitchClassSet({ophis.DFLAT})
+    assert 1 in ophis.PitchClassSet({ophis.DFLAT})
+    sharp = ophis.PitchClassSet({ophis.CSHARP, ophis.E})
+    assert list(sharp - ophis.PitchClassSet({ophis.DFLAT})) == [4]
+
+def test_pitch_class_set_transposition():
+    c_major = ophis.PitchClassSet({ophis.C, ophis.E, ophis.G})
+    assert c_major.transpose(ophis.M3) == ophis.PitchClassSet({ophis.E, ophis.GSHARP, ophis.B})
+    for chroma in ophis.western_chroma_set:
+        pcset = ophis.PitchClassSet({chroma})
+        for i in range(12):
+            assert set(pcset.transpose(i).chromae()) == {chroma.augment(i)}
+    assert list(ophis.PitchClassSet({0, 4, 7}).transpose(5)) == [0, 5, 9]
+
+# Pitch Tests
+
+def test_pitches_are_interned():
+    pitch = ophis.Pitch(ophis.C, 0)
+    assert isinstance(pitch, ophis.Pitch)
+    assert pitch is ophis.Pitch(ophis.C, 0)
+    assert pitch is ophis.C(0)
+    assert ophis.Pitch(ophis.C, 0) is not ophis.Pitch(ophis.BSHARP, 0)
+
+def test_usual_pitches_are_held_and_counted():
+    registry = ophis.Pitch.instances
+    hits = registry.info().hits
+    pitch = ophis.Pitch(ophis.D, 3)
+    pitch_id = id(pitch)
+    del pitch
+    gc.collect()
+    assert id(ophis.Pitch(ophis.D, 3)) == pitch_id
+    assert ophis.C(0) + ophis.M3 is ophis.E(0)
+    assert registry.info().hits > hits
+    assert registry.info().held > 0
+
+    class Marked(ophis.Pitch):
+        __slots__ = ()
+
+    marked = Marked(ophis.D, 3)
+    assert type(marked) is Marked and marked is Marked(ophis.D, 3)
+    assert ophis.Pitch(ophis.D, 3) is not marked
+
+def test_qualified_intervals_are_interned():
+    tenth = ophis.QualifiedInterval(ophis.M3, 1)
+    assert isinstance(tenth, ophis.QualifiedInterval)
+    assert tenth is ophis.MAJOR(3, 1)
+    assert int(tenth) == 16
+
+def test_add_qualified_interval_to_pitch():
+    pitch = ophis.Pitch(ophis.C, 0)
+    assert ophis.Pitch(ophis.C, 0) + ophis.QualifiedInterval(ophis.M3, 1) is ophis.Pitch(ophis.E, 1)
+    assert pitch.octave == 0
+
+def test_pitch_operators_match_methods():
+    pitches = [ophis.Pitch(x, octave) for x in (ophis.C, ophis.FSHARP, ophis.CFLAT, ophis.BSHARP)
+               for octave in (-9, 0, 9)]
+    operands = [0, 7, -5, 13, ophis.M3, ophis.d5, ophis.QualifiedInterval(ophis.m2, 2)]
+    for pitch in pitches:
+        for operand in operands:
+            assert pitch + operand is pitch.augmented(operand)
+            assert pitch - operand is pitch.diminished(operand)
+
+def test_core_objects_are_compact_and_immutable():
+    pitch = ophis.Pitch(ophis.C, 0)
+    for obj in (ophis.C, ophis.MAJOR, ophis.M3, pitch, ophis.QualifiedInterval(ophis.M3, 1)):
+        assert not hasattr(obj, "__dict__")
+    with pytest.raises(AttributeError):
+        ophis.C.value = 3
+    with pytest.raises(AttributeError):
+        pitch.octave = 4
+    with pytest.raises(AttributeError):
+        ophis.M3.half_steps = 3
+    assert pitch.octave == 0 and int(ophis.M3) == 4
+
+def test_contextual_enharmonic_reduce():
+    chroma_set = ophis.western_chroma_set
+    assert chroma_set.chroma_by_value(1).enharmonic_reduce("contextual") is ophis.CSHARP
+    assert chroma_set.chroma_by_value(3).enharmonic_reduce("contextual") is ophis.EFLAT
+    assert chroma_set.chroma_by_value(5).enharmonic_reduce("contextual", ophis.FSHARP) is ophis.ESHARP
+    assert chroma_set.chroma_by_value(8).enharmonic_reduce("sharp") is ophis.GSHARP
+
+def test_spell_sequences():
+    def names(chromae):
+        return [x.name for x in chromae]
+    assert names(ophis.spell([0, 1, 2])) == ["C", "CSHARP", "D"]
+    assert names(ophis.spell([1, 5, 8])) == ["DFLAT", "F", "AFLAT"]
+    assert ophis.spell([6, 8, 10, 11, 1, 3, 5], key=ophis.FSHARP)[-1] is ophis.ESHARP
+    assert names(ophis.spell([9, 5, 8, 9], key=ophis.A, mode="minor")) == ["A", "F", "GSHARP", "A"]
+    assert ophis.spell([]) == []
+    indexes = ophis.spell([12, 13, 14], return_type="index")
+    assert list(indexes) == [ophis.C.index, ophis.CSHARP.index, ophis.D.index]
+    with pytest.raises(ValueError):
+        ophis.spell([0], mode="lydian")
+
+# Range Tests
+
+def test_pitch_range_behaves_like_range():
+    pitches = ophis.PitchRange(ophis.G(-1), ophis.A(3))
+    half_steps = range(int(ophis.G(-1)), int(ophis.A(3)))
+    assert len(pitches) == len(half_steps)
+    assert [int(x) for x in pitches] == list(half_steps)
+    assert pitches[1] is ophis.GSHARP(-1)
+    assert pitches[-1] is ophis.GSHARP(3)
+    assert ophis.E(2) in pitches and ophis.A(3) not in pitches
+    assert pitches.index(ophis.E(2)) == half_steps.index(int(ophis.E(2)))
+    assert [int(x) for x in pitches[2:10:3]] == list(half_steps[2:10:3])
+    assert list(ophis.PitchRange(ophis.C(0), ophis.C(1), ophis.M3, spelling="flat")) == [
+        ophis.C(0), ophis.E(0), ophis.AFLAT(0)]
+    with pytest.raises(IndexError):
+        pitches[len(pitches)]
+
+def test_interval_range():
+    intervals = ophis.IntervalRange(3 * 12)
+    assert len(intervals) == 36
+    assert intervals[19] is ophis.QualifiedInterval(ophis.P5, 1)
+    assert [int(x) for x in intervals] == list(range(36))
+    assert ophis.QualifiedInterval(ophis.M3, 2) in intervals
+    assert intervals.index(ophis.M3) == 4
+
+def test_pickling_returns_canonical_instances():
+    objects = [ophis.CSHARP, ophis.DOUBLE_AUGMENTED, ophis.d5, ophis.Pitch(ophis.EFLAT, -1),
+               ophis.QualifiedInterval(ophis.M3, 2), ophis.western_chroma_set]
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        for obj in objects:
+            assert pickle.loads(pickle.dumps(obj, protocol)) is obj
+    chroma_set = ophis.ChromaSet({ophis.C, ophis.E})
+    assert set(pickle.loads(pickle.dumps(chroma_set))) == set(chroma_set)
+    pcset = ophis.PitchClassSet({ophis.C, 4})
+    assert pickle.loads(pickle.dumps(pcset)) == pcset
+
+# Tuning Tests
+
+def test_equal_temperament():
+    assert ophis.A(0).frequency() == 440.0
+    assert ophis.A(-1).frequency() == 220.0
+    assert ophis.CSHARP(0).frequency() == ophis.DFLAT(0).frequency()
+    assert ophis.EqualTemperament(432).frequency(ophis.A(1)) == 864.0
+    assert ophis.Pitch(ophis.A, 300).frequency() == 440.0 * 2.0 ** 300
+
+def test_pythagorean_and_just_tunings():
+    pythagorean = ophis.Pythagorean()
+    assert pythagorean.frequency(ophis.E(0)) == pytest.approx(330.0)
+    assert pythagorean.frequency(ophis.CSHARP(0)) > pythagorean.frequency(ophis.DFLAT(0))
+    just = ophis.JustIntonation(ophis.C)
+    c = just.frequency(ophis.C(0))
+    assert just.frequency(ophis.E(0)) / c == pytest.approx(5 / 4)
+    assert just.frequency(ophis.G(-1)) / c == pytest.approx(3 / 4)
+    assert ophis.A(0).frequency(just) == 440.0
+
+def test_cents_tuning():
+    cents = ophis.CentsTuning({ophis.C: 0, ophis.A: 900, ophis.E: 386.3})
+    assert cents.frequency(ophis.A(0)) == 440.0
+    assert cents.frequency(ophis.FFLAT(0)) == cents.frequency(ophis.E(0))
+    assert cents.frequency(ophis.G(0)) == ophis.G(0).frequency()